@@ -69,6 +69,19 @@ export DJANGO_SOAP_NS_OVERRIDE_ANY_STRING="ns0=tem"
 export SOAP_TIMEOUT=180
 export SOAP_MAX_ATTEMPTS=5
 
+# Response cache
+# The shared cache tier; a comma separated list of memcached servers (optional)
+# If not set, a file based cache in CACHE_DIRECTORY is used instead
+export MEMCACHED_LOCATION='127.0.0.1:11211'
+export CACHE_DIRECTORY='/tmp/talentmap_cache'
+
+# Performance metrics
+# The bearer token a Prometheus scraper must present to read /metrics (optional)
+export METRICS_TOKEN=''
+# When serving with several worker processes, an empty directory the workers share their metrics in,
+# cleared before each start (see gunicorn_config.py); leave unset for a single process
+# export prometheus_multiproc_dir='/tmp/talentmap_metrics'
+
 # SAML2 Configuration
 export ENABLE_SAML2=False
 # SAML2 debug setting, 1 or 0
@@ -38,6 +38,8 @@ export FSBID_API_URL='http://dev.talentmap.fsbid.metaphasedev.com'
 pip install -r requirements.txt
 
 python manage.py migrate
+python manage.py refresh_bidcycle_statistics
+python manage.py update_similar_positions
 
 # Stop the server
 pkill -f runserver
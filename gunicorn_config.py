@@ -0,0 +1,12 @@
+'''
+gunicorn settings, e.g. gunicorn -c gunicorn_config.py talentmap_api.wsgi
+
+With several workers, set prometheus_multiproc_dir so that /metrics aggregates the metrics of
+all workers (see talentmap_api.common.metrics).
+'''
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live metrics, such as gauges, from the aggregate
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,30 +1,235 @@
+import random
+
 from locust import HttpLocust, TaskSet, task
 
 '''
-To run interavtively: locust --host=http://whatever
+Load test workloads, modelling the sessions of each kind of TalentMAP user. Run against the
+synthetic dataset (manage.py generate_synthetic_data), which creates the bench users used here.
+
+To run interactively: locust --host=http://whatever
 To run headless: locust --host=http://whatever --no-web -c CLIENTS -r HATCHRATE -n num_requests
+
+Requests are named by route, with identifiers replaced by placeholders, so that statistics are
+grouped per route rather than per URL.
 '''
 
+# The password of all bench users
+PASSWORD = "password"
 
-class TalentMAPResearchTasks(TaskSet):
-    @task(10)
-    def list_all_positions(self):
-        self.client.get("/api/v1/position/")
+# Synthetic reference data codes; mid-level grades and the most common skills
+GRADES = ["SYN02", "SYN03", "SYN04", "SYN05", "SYN06"]
+SKILLS = ["SYN000", "SYN001", "SYN002", "SYN003", "SYN004", "SYN005"]
+SEARCH_TERMS = ["officer", "political", "economic", "consular", "management", "security"]
+
+# The bureau the bench AO is an AO for
+AO_BUREAU = "SYNB00"
+
+
+class TalentMAPTaskSet(TaskSet):
+    '''
+    The base of all user sessions; logs in as the session's bench user and obtains a token
+    '''
+    username = None
+
+    def on_start(self):
+        response = self.client.post("/api/v1/accounts/token/", {"username": self.username, "password": PASSWORD}, name="/api/v1/accounts/token/")
+        self.client.headers["Authorization"] = f"Token {response.json()['token']}"
+
+    def get_results(self, url, name):
+        '''
+        Returns the results of a list endpoint, or an empty list if the request failed
+        '''
+        response = self.client.get(url, name=name)
+        if response.status_code != 200:
+            return []
+        return response.json().get("results", [])
+
+    def action(self, method, url, name, expected=(204,)):
+        '''
+        Requests an action, treating the expected business rule rejections as successes
+        '''
+        with getattr(self.client, method)(url, name=name, catch_response=True) as response:
+            if response.status_code in expected:
+                response.success()
+        return response
+
+    @staticmethod
+    def choose(results):
+        return random.choice(results) if results else None
+
+
+class BidderTasks(TalentMAPTaskSet):
+    username = "bench_bidder"
+
+    def on_start(self):
+        super().on_start()
+        self.cycle_positions = []
 
     @task(10)
-    def search_position_grades(self):
-        self.client.get("/api/v1/position/?grade__code__in=05,06", name="/api/v1/position/?grade__code__in=code,code")
+    def search_positions(self):
+        self.client.get(f"/api/v1/position/?grade__code__in={random.choice(GRADES)},{random.choice(GRADES)}&skill__code__in={random.choice(SKILLS)}",
+                        name="/api/v1/position/?grade__code__in=code,code&skill__code__in=code")
+
+    @task(5)
+    def search_cycle_positions(self):
+        self.cycle_positions = self.get_results(f"/api/v1/cycleposition/?position__grade__code={random.choice(GRADES)}&ordering=-posted_date",
+                                                name="/api/v1/cycleposition/?position__grade__code=code&ordering=-posted_date") or self.cycle_positions
+
+    @task(3)
+    def search_free_text(self):
+        self.client.get(f"/api/v1/position/?q={random.choice(SEARCH_TERMS)}", name="/api/v1/position/?q=fts")
+
+    @task(5)
+    def view_cycle_position(self):
+        cycle_position = self.choose(self.cycle_positions)
+        if cycle_position:
+            self.client.get(f"/api/v1/cycleposition/{cycle_position['id']}/", name="/api/v1/cycleposition/[id]/")
+
+    @task(2)
+    def favorite(self):
+        cycle_position = self.choose(self.cycle_positions)
+        if cycle_position:
+            self.action("put", f"/api/v1/cycleposition/{cycle_position['id']}/favorite/", name="/api/v1/cycleposition/[id]/favorite/")
+            self.client.get("/api/v1/cycleposition/favorites/", name="/api/v1/cycleposition/favorites/")
+
+    @task(2)
+    def add_to_bidlist(self):
+        cycle_position = self.choose(self.cycle_positions)
+        if cycle_position:
+            # Positions with a handshake, or during which the bidder retires, can't be bid upon
+            self.action("put", f"/api/v1/bidlist/position/{cycle_position['id']}/", name="/api/v1/bidlist/position/[id]/", expected=(204, 400))
+
+    @task(4)
+    def view_bidlist(self):
+        self.client.get("/api/v1/bidlist/", name="/api/v1/bidlist/")
+
+    @task(1)
+    def submit_bid(self):
+        bid = self.choose(self.get_results("/api/v1/bidlist/?status=draft&limit=25", name="/api/v1/bidlist/?status=draft"))
+        if bid:
+            # The submitted bid limit may have been reached
+            self.action("get", f"/api/v1/bid/{bid['id']}/submit/", name="/api/v1/bid/[id]/submit/", expected=(204, 400, 404))
+
+    @task(3)
+    def view_notifications(self):
+        self.client.get("/api/v1/notification/?is_read=false", name="/api/v1/notification/?is_read=false")
+
+
+class CDOTasks(TalentMAPTaskSet):
+    username = "bench_cdo"
+
+    def on_start(self):
+        super().on_start()
+        self.clients = self.get_results("/api/v1/client/?limit=50", name="/api/v1/client/?limit=n")
+
+    @task(5)
+    def page_clients(self):
+        self.client.get(f"/api/v1/client/?limit=10&page={random.randint(1, 5)}", name="/api/v1/client/?limit=n&page=n")
+
+    @task(3)
+    def view_statistics(self):
+        self.client.get("/api/v1/client/statistics/", name="/api/v1/client/statistics/")
+
+    @task(4)
+    def view_client(self):
+        client = self.choose(self.clients)
+        if client:
+            self.client.get(f"/api/v1/client/{client['id']}/", name="/api/v1/client/[id]/")
+
+    @task(4)
+    def view_prepanel(self):
+        client = self.choose(self.clients)
+        if not client:
+            return
+        bid = self.choose(self.get_results(f"/api/v1/client/{client['id']}/bids/", name="/api/v1/client/[id]/bids/"))
+        if bid:
+            self.client.get(f"/api/v1/client/{client['id']}/bids/{bid['id']}/prepanel/", name="/api/v1/client/[id]/bids/[id]/prepanel/")
+
+
+class AOTasks(TalentMAPTaskSet):
+    username = "bench_ao"
+
+    def on_start(self):
+        super().on_start()
+        self.positions = self.get_results(f"/api/v1/position/?bureau__code={AO_BUREAU}&limit=50", name="/api/v1/position/?bureau__code=code")
+
+    def get_bids(self):
+        position = self.choose(self.positions)
+        if not position:
+            return []
+        return self.get_results(f"/api/v1/cycleposition/{position['id']}/bids/", name="/api/v1/cycleposition/[id]/bids/")
 
     @task(10)
-    def search_position_skills(self):
-        self.client.get("/api/v1/position/?skill__code__in=05,06", name="/api/v1/position/?skill__code__in=code,code")
+    def list_bids(self):
+        self.get_bids()
+
+    @task(2)
+    def offer_handshake(self):
+        bid = self.choose([x for x in self.get_bids() if x["status"] == "submitted"])
+        if bid:
+            # Another session may have acted upon the bid first
+            self.action("get", f"/api/v1/bid/{bid['id']}/offer_handshake/", name="/api/v1/bid/[id]/offer_handshake/", expected=(204, 404))
 
     @task(1)
-    def search_free_text(self):
-        self.client.get("/api/v1/position/?q=german", name="/api/v1/position/?q=fts")
+    def approve(self):
+        bid = self.choose([x for x in self.get_bids() if x["status"] == "in_panel"])
+        if bid:
+            self.action("get", f"/api/v1/bid/{bid['id']}/approve/", name="/api/v1/bid/[id]/approve/", expected=(204, 404))
+
+
+class AdminTasks(TalentMAPTaskSet):
+    username = "bench_admin"
+
+    def on_start(self):
+        super().on_start()
+        self.bidcycles = self.get_results("/api/v1/bidcycle/?ordering=-cycle_start_date", name="/api/v1/bidcycle/")
+        response = self.client.post("/api/v1/searches/", json={
+            "name": "Load test batch",
+            "endpoint": "/api/v1/cycleposition/",
+            "filters": {"position__grade__code": [random.choice(GRADES)], "position__skill__code": [random.choice(SKILLS)]},
+        }, name="/api/v1/searches/")
+        self.saved_search = response.json()["id"] if response.status_code == 201 else None
+
+    @task(5)
+    def view_statistics(self):
+        self.client.get("/api/v1/bidcycle/statistics/", name="/api/v1/bidcycle/statistics/")
 
+    @task(3)
+    def view_bidcycle_positions(self):
+        bidcycle = self.choose(self.bidcycles)
+        if bidcycle:
+            self.client.get(f"/api/v1/bidcycle/{bidcycle['id']}/positions/", name="/api/v1/bidcycle/[id]/positions/")
 
-class TalentMAPLocust(HttpLocust):
-    task_set = TalentMAPResearchTasks
+    @task(1)
+    def batch_add_positions(self):
+        bidcycle = self.choose(self.bidcycles)
+        if bidcycle and self.saved_search:
+            self.action("put", f"/api/v1/bidcycle/{bidcycle['id']}/position/batch/{self.saved_search}/", name="/api/v1/bidcycle/[id]/position/batch/[id]/")
+
+
+class Bidder(HttpLocust):
+    task_set = BidderTasks
+    weight = 70
+    min_wait = 5000
+    max_wait = 15000
+
+
+class CDO(HttpLocust):
+    task_set = CDOTasks
+    weight = 15
     min_wait = 5000
     max_wait = 15000
+
+
+class AO(HttpLocust):
+    task_set = AOTasks
+    weight = 10
+    min_wait = 5000
+    max_wait = 15000
+
+
+class Admin(HttpLocust):
+    task_set = AdminTasks
+    weight = 5
+    min_wait = 10000
+    max_wait = 30000
@@ -113,7 +113,8 @@ class CyclePositionFilter(filters.FilterSet):
             "position__post__location__state",
             "position__description__content",
             "position__position_number"
-        ]
+        ],
+        document="position__search"
     ))
     is_available_in_current_bidcycle = filters.Filter(name="no_handshake", method="filter_no_handshake")
     is_available_in_bidcycle = filters.Filter(name="bid_cycles", method="filter_available_in_bidcycle")
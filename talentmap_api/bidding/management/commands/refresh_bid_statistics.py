@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+import logging
+
+from talentmap_api.bidding.models import Bid, UserBidStatistics
+from talentmap_api.common.cache.generations import bump_model_generation
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the bid statistics of every user in every bidcycle, such as after bulk imports or at cycle close'
+    logger = logging.getLogger(__name__)
+
+    def handle(self, *args, **options):
+        statuses = [status_code for status_code, _ in Bid.Status.choices]
+        columns = ", ".join(statuses)
+        counts = ", ".join("COUNT(*) FILTER (WHERE status = %s)" for _ in statuses)
+        updates = ", ".join(f"{x} = EXCLUDED.{x}" for x in statuses)
+        zeroes = ", ".join(f"{x} = 0" for x in statuses)
+        nonzero = " OR ".join(f"{x} <> 0" for x in statuses)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Insert or update the statistics of each user and bidcycle with bids
+            cursor.execute(f'''
+                INSERT INTO {UserBidStatistics._meta.db_table} (user_id, bidcycle_id, {columns})
+                SELECT user_id, bidcycle_id, {counts}
+                FROM {Bid._meta.db_table}
+                GROUP BY user_id, bidcycle_id
+                ON CONFLICT (bidcycle_id, user_id) DO UPDATE SET {updates}
+            ''', statuses)
+            updated = cursor.rowcount
+
+            # Clear the statistics of users with no remaining bids in the bidcycle, skipping those already cleared
+            cursor.execute(f'''
+                UPDATE {UserBidStatistics._meta.db_table} AS s SET {zeroes}
+                WHERE ({nonzero})
+                AND NOT EXISTS (SELECT 1 FROM {Bid._meta.db_table} AS b WHERE b.user_id = s.user_id AND b.bidcycle_id = s.bidcycle_id)
+            ''')
+            cleared = cursor.rowcount
+
+        bump_model_generation(UserBidStatistics)
+        self.logger.info(f"Refreshed the bid statistics of {updated} users and bidcycles, and cleared {cleared}")
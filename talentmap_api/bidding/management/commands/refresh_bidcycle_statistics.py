@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+import logging
+
+from talentmap_api.bidding.models import BidCycle, update_bidcycle_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the statistics of every bidcycle, such as after deploying or bulk imports'
+    logger = logging.getLogger(__name__)
+
+    def handle(self, *args, **options):
+        bidcycle_ids = list(BidCycle.objects.values_list("id", flat=True))
+        with transaction.atomic():
+            update_bidcycle_statistics(bidcycle_ids)
+
+        self.logger.info(f"Refreshed the statistics of {len(bidcycle_ids)} bidcycles")
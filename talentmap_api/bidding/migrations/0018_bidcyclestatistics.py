@@ -0,0 +1,35 @@
+# Generated by Django 2.0.4 on 2019-06-18 10:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bidding', '0017_auto_20190611_1912'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BidCycleStatistics',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_positions', models.IntegerField(default=0)),
+                ('available_positions', models.IntegerField(default=0)),
+                ('available_domestic_positions', models.IntegerField(default=0)),
+                ('available_international_positions', models.IntegerField(default=0)),
+                ('total_bids', models.IntegerField(default=0)),
+                ('total_bidders', models.IntegerField(default=0)),
+                ('in_panel_bidders', models.IntegerField(default=0)),
+                ('approved_bidders', models.IntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=False, help_text="Whether the bidcycle's positions or bids have changed since the statistics were computed")),
+                ('update_date', models.DateTimeField(help_text='The date the statistics were computed')),
+                ('bidcycle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='bidding.BidCycle')),
+            ],
+            options={
+                'ordering': ['bidcycle__cycle_start_date'],
+                'managed': True,
+            },
+        ),
+    ]
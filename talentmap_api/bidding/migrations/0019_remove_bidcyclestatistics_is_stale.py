@@ -0,0 +1,17 @@
+# Generated by Django 2.0.4 on 2019-06-25 14:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bidding', '0018_bidcyclestatistics'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='bidcyclestatistics',
+            name='is_stale',
+        ),
+    ]
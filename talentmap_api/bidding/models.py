@@ -1,8 +1,8 @@
 import logging
 
 from django.utils import timezone
-from django.db.models import Q, Value, Case, When, BooleanField
-from django.db import models
+from django.db.models import Count, Q, Value, Case, When, BooleanField
+from django.db import connection, models, transaction
 from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.postgres.fields import ArrayField
@@ -11,8 +11,9 @@ from simple_history.models import HistoricalRecords
 from djchoices import DjangoChoices, ChoiceItem
 
 import talentmap_api.position.models
+from talentmap_api.common.cache.generations import bump_model_generation
+from talentmap_api.common.deferred import DeferredUpdate
 from talentmap_api.common.models import StaticRepresentationModel
-from talentmap_api.common.common_helpers import safe_navigation
 from talentmap_api.messaging.models import Notification
 from talentmap_api.user_profile.models import UserProfile
 
@@ -35,25 +36,10 @@ class CyclePosition(StaticRepresentationModel):
     @property
     def similar_positions(self):
         '''
-        Returns a query set of similar positions, using the base criteria.
-        If there are not at least 3 results, the criteria is loosened.
+        Returns a query set of the cycle positions of similar positions, most similar first, as
+        precomputed by talentmap_api.position.models.update_similar_positions
         '''
-        base_criteria = {
-            "position__post__location__country__id": safe_navigation(self, "position.post.location.country.id"),
-            "position__skill__code": safe_navigation(self, "position.skill.code"),
-            "position__grade__code": safe_navigation(self, "position.grade.code"),
-        }
-
-        q_obj = models.Q(**base_criteria)
-        position_ids = CyclePosition.objects.filter(status_code__in=["HS", "OP"]).values_list("position_id", flat=True)
-        all_pos_queryset = CyclePosition.objects.filter(position_id__in=position_ids)
-        queryset = all_pos_queryset.filter(q_obj).exclude(id=self.id)
-
-        while queryset.count() < 3:
-            del base_criteria[list(base_criteria.keys())[0]]
-            q_obj = models.Q(**base_criteria)
-            queryset = all_pos_queryset.filter(q_obj).exclude(id=self.id)
-        return queryset
+        return CyclePosition.objects.filter(position__similar_to_entries__position_id=self.position_id).order_by("position__similar_to_entries__rank", "id")
 
     class Meta:
         managed = True
@@ -87,7 +73,7 @@ class BidCycle(StaticRepresentationModel):
         '''
         Returns a queryset of all positions, annotated with whether it is accepting bids or not
         '''
-        bids = self.bids.filter(Bid.get_unavailable_status_filter()).values_list('position_id', flat=True)
+        bids = self.bids.filter(Bid.get_unavailable_status_filter()).values_list('position__position_id', flat=True)
         case = Case(When(id__in=bids,
                          then=Value(False)),
                     default=Value(True),
@@ -138,8 +124,13 @@ class UserBidStatistics(StaticRepresentationModel):
     closed = models.IntegerField(default=0)
 
     def update_statistics(self):
+        '''
+        Recomputes the number of the user's bids in each status, in a single grouped query
+        '''
+        bids = Bid.objects.filter(user=self.user_id, bidcycle=self.bidcycle_id).order_by()
+        counts = dict(bids.values_list("status").annotate(models.Count("id")))
         for status_code, _ in Bid.Status.choices:
-            setattr(self, status_code, Bid.objects.filter(user=self.user, bidcycle=self.bidcycle, status=status_code).count())
+            setattr(self, status_code, counts.get(status_code, 0))
 
         self.save()
 
@@ -149,6 +140,92 @@ class UserBidStatistics(StaticRepresentationModel):
         unique_together = (("bidcycle", "user",),)
 
 
+class BidCycleStatistics(models.Model):
+    '''
+    A snapshot of a bidcycle's statistics, recomputed when its positions or bids change, see
+    update_bidcycle_statistics, or by the refresh_bidcycle_statistics command
+    '''
+    bidcycle = models.OneToOneField('bidding.BidCycle', on_delete=models.CASCADE, related_name='statistics')
+
+    total_positions = models.IntegerField(default=0)
+    available_positions = models.IntegerField(default=0)
+    available_domestic_positions = models.IntegerField(default=0)
+    available_international_positions = models.IntegerField(default=0)
+    total_bids = models.IntegerField(default=0)
+    total_bidders = models.IntegerField(default=0)
+    in_panel_bidders = models.IntegerField(default=0)
+    approved_bidders = models.IntegerField(default=0)
+
+    update_date = models.DateTimeField(help_text="The date the statistics were computed")
+
+    class Meta:
+        managed = True
+        ordering = ["bidcycle__cycle_start_date"]
+
+
+def update_bidcycle_statistics(bidcycle_ids):
+    '''
+    Recomputes and stores the statistics of bidcycles, in a single set-based upsert for all of them
+
+    Args:
+        - bidcycle_ids (iterable) - The bidcycles to recompute
+    '''
+    bidcycle_ids = list(bidcycle_ids)
+    if not bidcycle_ids:
+        return
+
+    positions = BidCycle.objects.filter(id__in=bidcycle_ids).order_by().values("id").annotate(
+        total_positions=Count("positions"),
+        domestic_positions=Count("positions", filter=Q(positions__post__location__country__code="USA")),
+    )
+
+    # Positions with a bid at or past a handshake aren't available
+    unavailable = Bid.get_unavailable_status_filter()
+    bids = Bid.objects.filter(bidcycle_id__in=bidcycle_ids).order_by().values("bidcycle_id").annotate(
+        total_bids=Count("id"),
+        total_bidders=Count("user", distinct=True),
+        in_panel_bidders=Count("user", distinct=True, filter=Q(status=Bid.Status.in_panel)),
+        approved_bidders=Count("user", distinct=True, filter=Q(status=Bid.Status.approved)),
+        unavailable_positions=Count("position__position", distinct=True, filter=unavailable),
+        unavailable_domestic_positions=Count("position__position", distinct=True, filter=unavailable & Q(position__position__post__location__country__code="USA")),
+    )
+
+    positions_sql, positions_params = positions.query.sql_with_params()
+    bids_sql, bids_params = bids.query.sql_with_params()
+
+    # Upsert in place, so concurrent readers never see a bidcycle's snapshot missing
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            INSERT INTO {BidCycleStatistics._meta.db_table} (bidcycle_id, total_positions, available_positions, available_domestic_positions,
+                                                          available_international_positions, total_bids, total_bidders, in_panel_bidders,
+                                                          approved_bidders, update_date)
+            SELECT p.id, p.total_positions, p.total_positions - COALESCE(b.unavailable_positions, 0),
+                   p.domestic_positions - COALESCE(b.unavailable_domestic_positions, 0),
+                   (p.total_positions - COALESCE(b.unavailable_positions, 0)) - (p.domestic_positions - COALESCE(b.unavailable_domestic_positions, 0)),
+                   COALESCE(b.total_bids, 0), COALESCE(b.total_bidders, 0), COALESCE(b.in_panel_bidders, 0),
+                   COALESCE(b.approved_bidders, 0), %s
+            FROM ({positions_sql}) AS p
+            LEFT JOIN ({bids_sql}) AS b ON b.bidcycle_id = p.id
+            ON CONFLICT (bidcycle_id) DO UPDATE SET
+                total_positions = EXCLUDED.total_positions,
+                available_positions = EXCLUDED.available_positions,
+                available_domestic_positions = EXCLUDED.available_domestic_positions,
+                available_international_positions = EXCLUDED.available_international_positions,
+                total_bids = EXCLUDED.total_bids,
+                total_bidders = EXCLUDED.total_bidders,
+                in_panel_bidders = EXCLUDED.in_panel_bidders,
+                approved_bidders = EXCLUDED.approved_bidders,
+                update_date = EXCLUDED.update_date
+        ''', [timezone.now(), *positions_params, *bids_params])
+
+    bump_model_generation(BidCycleStatistics)
+
+
+# Bidcycles whose positions or bids changed. Recomputed once the changing transaction commits, so a
+# burst of changes recomputes each bidcycle's statistics once.
+bidcycle_statistics_updates = DeferredUpdate(update_bidcycle_statistics, on_commit=True)
+
+
 class Bid(StaticRepresentationModel):
     '''
     The bid object represents an individual bid, the position, user, and process status
@@ -194,6 +271,15 @@ class Bid(StaticRepresentationModel):
     def __str__(self):
         return f"{self.id} {self.user}#{self.position.position.position_number} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        # The position's stored availability is updated by the post_save listeners, in the same transaction
+        with transaction.atomic():
+            super(Bid, self).save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super(Bid, self).delete(*args, **kwargs)
+
     @property
     def is_paneling_today(self):
         return timezone.now().date() == self.scheduled_panel_date.date()
@@ -305,22 +391,21 @@ class Waiver(StaticRepresentationModel):
 def bidcycle_positions_update(sender, instance, action, reverse, model, pk_set, **kwargs):
     if action == "pre_add":
         # Create a new statistics item when a position is placed in the bid cycle
-        for position_id in pk_set:
-            cp = CyclePosition.objects.create(bidcycle=instance, position_id=position_id)
-            talentmap_api.position.models.PositionBidStatistics.objects.create(position=cp)
+        with talentmap_api.position.models.similar_position_updates.deferred():
+            for position_id in pk_set:
+                cp = CyclePosition.objects.create(bidcycle=instance, position_id=position_id)
+                talentmap_api.position.models.PositionBidStatistics.objects.create(position=cp)
     elif action == "pre_remove":
-        # Delete statistics items when removed from the bidcycle
-        talentmap_api.position.models.PositionBidStatistics.objects.filter(position__bidcycle=instance, position_id__in=pk_set).delete()
-        CyclePosition.objects.filter(bidcycle=instance, position_id__in=pk_set).delete()
+        # Delete statistics items when removed from the bidcycle; deleting the cycle positions deletes
+        # their bids, whose statistics updates are then skipped
+        with talentmap_api.position.models.similar_position_updates.deferred(), talentmap_api.position.models.bid_statistics_updates.deferred():
+            talentmap_api.position.models.PositionBidStatistics.objects.filter(position__bidcycle=instance, position_id__in=pk_set).delete()
+            CyclePosition.objects.filter(bidcycle=instance, position_id__in=pk_set).delete()
 
     if action in ["post_add", "post_remove"]:
-        for position_id in pk_set:
-            pos = talentmap_api.position.models.Position.objects.get(pk=position_id)
-            if pos.bid_cycles.filter(active=True).count() > 0:
-                pos.latest_bidcycle = pos.bid_cycles.filter(active=True).latest('cycle_start_date')
-            else:
-                pos.latest_bidcycle = None
-            pos.save()
+        positions = talentmap_api.position.models.Position.objects.filter(id__in=pk_set)
+        talentmap_api.position.models.update_latest_bidcycles(positions)
+        talentmap_api.position.models.update_availability(positions)
 
 @receiver(post_save, sender=BidCycle, dispatch_uid="bidcycle_active_changed")
 def bidcycle_active_changed(sender, instance, **kwargs):
@@ -328,12 +413,30 @@ def bidcycle_active_changed(sender, instance, **kwargs):
     Update positions latest_active_bidcycle field to latest acive bidcycle
     '''
     positions = talentmap_api.position.models.Position.objects.filter(id__in=instance.positions.values_list('id', flat=True))
-    for pos in positions:
-        if pos.bid_cycles.filter(active=True).count() > 0:
-            pos.latest_bidcycle = pos.bid_cycles.filter(active=True).latest('cycle_start_date')
+    talentmap_api.position.models.update_latest_bidcycles(positions)
+    talentmap_api.position.models.update_availability(positions)
+
+@receiver(post_save, sender=BidCycle, dispatch_uid="bidcycle_created_statistics")
+def bidcycle_created_statistics(sender, instance, created, **kwargs):
+    '''
+    Computes the statistics of new bidcycles, so every bidcycle has a snapshot
+    '''
+    if created:
+        bidcycle_statistics_updates.request(instance.id)
+
+
+@receiver(m2m_changed, sender=BidCycle.positions.through, dispatch_uid="bidcycle_positions_changed_statistics")
+def bidcycle_positions_changed_statistics(sender, instance, action, reverse, pk_set, **kwargs):
+    '''
+    Updates the statistics of bidcycles when their positions change
+    '''
+    if action.startswith("post_"):
+        if not reverse:
+            bidcycle_statistics_updates.request(instance.id)
         else:
-            pos.latest_bidcycle = None
-        pos.save()
+            # The positions' bidcycles, which are unknown when cleared
+            bidcycle_statistics_updates.request(*(pk_set if pk_set is not None else BidCycle.objects.values_list("id", flat=True)))
+
 
 @receiver(pre_save, sender=Bid, dispatch_uid="bid_status_changed")
 def bid_status_changed(sender, instance, **kwargs):
@@ -343,6 +446,7 @@ def bid_status_changed(sender, instance, **kwargs):
     if instance.id:
         # Get our bid as it exists in the database
         old_bid = Bid.objects.get(id=instance.id)
+        instance._previous_status = old_bid.status
 
         # Set the bid's priority flag
         instance.is_priority = instance.status in instance.get_priority_statuses()
@@ -384,14 +488,29 @@ def bid_panel_date_changed(sender, instance, **kwargs):
 @receiver(post_save, sender=Bid, dispatch_uid="save_update_bid_statistics")
 @receiver(post_delete, sender=Bid, dispatch_uid="delete_update_bid_statistics")
 def delete_update_bid_statistics(sender, instance, **kwargs):
-    # Get the position associated with this bid and update the statistics
-    statistics, _ = talentmap_api.position.models.PositionBidStatistics.objects.get_or_create(position=instance.position)
-    statistics.update_statistics()
+    # Update the statistics of the position associated with this bid
+    talentmap_api.position.models.bid_statistics_updates.request(instance.position_id)
 
     # Update the user's bid statistics
     statistics, _ = UserBidStatistics.objects.get_or_create(user=instance.user, bidcycle=instance.bidcycle)
     statistics.update_statistics()
 
+    # And the bidcycle's statistics
+    bidcycle_statistics_updates.request(instance.bidcycle_id)
+
+
+@receiver(post_save, sender=Bid, dispatch_uid="save_update_position_availability")
+@receiver(post_delete, sender=Bid, dispatch_uid="delete_update_position_availability")
+def update_position_availability(sender, instance, **kwargs):
+    '''
+    Updates the stored availability of the bid's position when the bid enters or leaves a status
+    which makes the position unavailable
+    '''
+    unavailable_statuses = Bid.get_priority_statuses()
+    if instance.status in unavailable_statuses or getattr(instance, "_previous_status", None) in unavailable_statuses:
+        positions = talentmap_api.position.models.Position.objects.filter(cycle_position_position__id=instance.position_id)
+        talentmap_api.position.models.update_availability(positions)
+
 
 @receiver(pre_save, sender=Waiver, dispatch_uid="waiver_status_changed")
 def waiver_status_changed(sender, instance, **kwargs):
@@ -46,40 +46,21 @@ class BidCycleSerializer(PrefetchedSerializer):
 
 
 class BidCycleStatisticsSerializer(PrefetchedSerializer):
-    total_positions = serializers.SerializerMethodField()
-    available_positions = serializers.SerializerMethodField()
-    available_domestic_positions = serializers.SerializerMethodField()
-    available_international_positions = serializers.SerializerMethodField()
-    total_bids = serializers.SerializerMethodField()
-    total_bidders = serializers.SerializerMethodField()
-    approved_bidders = serializers.SerializerMethodField()
-    in_panel_bidders = serializers.SerializerMethodField()
+    '''
+    Serializes a bidcycle's statistics from its stored snapshot, see
+    talentmap_api.bidding.models.update_bidcycle_statistics
+    '''
+    total_positions = serializers.IntegerField(source="statistics.total_positions", read_only=True)
+    available_positions = serializers.IntegerField(source="statistics.available_positions", read_only=True)
+    available_domestic_positions = serializers.IntegerField(source="statistics.available_domestic_positions", read_only=True)
+    available_international_positions = serializers.IntegerField(source="statistics.available_international_positions", read_only=True)
+    total_bids = serializers.IntegerField(source="statistics.total_bids", read_only=True)
+    total_bidders = serializers.IntegerField(source="statistics.total_bidders", read_only=True)
+    approved_bidders = serializers.IntegerField(source="statistics.approved_bidders", read_only=True)
+    in_panel_bidders = serializers.IntegerField(source="statistics.in_panel_bidders", read_only=True)
+    statistics_date = serializers.DateTimeField(source="statistics.update_date", read_only=True)
     bidding_days_remaining = serializers.SerializerMethodField()
 
-    def get_total_positions(self, obj):
-        return obj.positions.count()
-
-    def get_available_positions(self, obj):
-        return obj.annotated_positions.filter(accepting_bids=True).count()
-
-    def get_available_domestic_positions(self, obj):
-        return obj.annotated_positions.filter(accepting_bids=True, post__location__country__code="USA").count()
-
-    def get_available_international_positions(self, obj):
-        return obj.annotated_positions.filter(accepting_bids=True).exclude(post__location__country__code="USA").count()
-
-    def get_total_bids(self, obj):
-        return obj.bids.count()
-
-    def get_total_bidders(self, obj):
-        return obj.bids.values('user').distinct().count()
-
-    def get_in_panel_bidders(self, obj):
-        return obj.bids.filter(status=Bid.Status.in_panel).values('user').distinct().count()
-
-    def get_approved_bidders(self, obj):
-        return obj.bids.filter(status=Bid.Status.approved).values('user').distinct().count()
-
     def get_bidding_days_remaining(self, obj):
         return (obj.cycle_deadline_date.date() - datetime.now().date()).days
 
@@ -87,18 +68,27 @@ class BidCycleStatisticsSerializer(PrefetchedSerializer):
         model = BidCycle
         fields = ("id", "name", "cycle_start_date", "cycle_deadline_date", "cycle_end_date",
                   "total_positions", "available_positions", "available_domestic_positions", "available_international_positions",
-                  "total_bids", "total_bidders", "in_panel_bidders", "approved_bidders", "bidding_days_remaining",)
+                  "total_bids", "total_bidders", "in_panel_bidders", "approved_bidders", "statistics_date", "bidding_days_remaining",)
+        field_dependencies = {
+            "bidding_days_remaining": ["cycle_deadline_date"],
+        }
 
 
 class SurveySerializer(PrefetchedSerializer):
     calculated_values = serializers.SerializerMethodField()
 
     def get_calculated_values(self, obj):
-        calculated_values = {}
-        calculated_values['is_fairshare'] = obj.user.is_fairshare
-        calculated_values['is_six_eight'] = obj.user.is_six_eight
+        # The values are the user's, shared by all of their surveys, so calculate them once per user
+        if not hasattr(self, "_calculated_values"):
+            self._calculated_values = {}
 
-        return calculated_values
+        if obj.user_id not in self._calculated_values:
+            calculated_values = {}
+            calculated_values['is_fairshare'] = obj.user.is_fairshare
+            calculated_values['is_six_eight'] = obj.user.is_six_eight
+            self._calculated_values[obj.user_id] = calculated_values
+
+        return self._calculated_values[obj.user_id]
 
     class Meta:
         model = StatusSurvey
@@ -275,6 +265,15 @@ class CyclePositionListSerializer(PrefetchedSerializer):
     class Meta:
         model = CyclePosition
         fields = ["id", "status", "status_code", "ted", "posted_date"]
+        field_presets = {
+            "card": {
+                "override_fields": ["id", "status", "status_code", "ted", "posted_date", "bidcycle",
+                                    "position__id", "position__position_number", "position__title", "position__grade",
+                                    "position__skill", "position__bureau", "position__post", "position__languages",
+                                    "position__current_assignment", "position__availability"]
+            },
+            "detail": {},
+        }
         nested = {
             "position": {
                 "class": "talentmap_api.position.serializers.PositionSerializer",
@@ -6,8 +6,9 @@ from model_mommy import mommy
 from rest_framework import status
 from dateutil import relativedelta
 
+from django.core.management import call_command
 from django.utils import timezone
-from talentmap_api.bidding.models import BidCycle, Bid
+from talentmap_api.bidding.models import BidCycle, Bid, UserBidStatistics
 
 
 @pytest.fixture
@@ -276,3 +277,32 @@ def test_bidlist_max_submissions(authorized_client, authorized_user):
     response = authorized_client.get(f'/api/v1/bid/{bid.id}/submit/')
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_bidlist_fixture")
+def test_refresh_bid_statistics():
+    bidcycle = BidCycle.objects.get(id=1)
+    cycle_positions = list(bidcycle.cycle_position_cycle.order_by("id"))
+    user = mommy.make('auth.User').profile
+    other_user = mommy.make('auth.User').profile
+
+    for cycle_position in cycle_positions[:3]:
+        mommy.make(Bid, user=user, bidcycle=bidcycle, position=cycle_position, status=Bid.Status.submitted)
+    mommy.make(Bid, user=user, bidcycle=bidcycle, position=cycle_positions[3], status=Bid.Status.closed)
+    other_bid = mommy.make(Bid, user=other_user, bidcycle=bidcycle, position=cycle_positions[0])
+
+    statistics = UserBidStatistics.objects.get(user=user, bidcycle=bidcycle)
+    assert (statistics.submitted, statistics.closed, statistics.draft) == (3, 1, 0)
+
+    # Statistics are recomputed from scratch, such as after bulk loads which bypass the signals
+    UserBidStatistics.objects.all().delete()
+    mommy.make(UserBidStatistics, user=other_user, bidcycle=bidcycle, draft=5)
+    Bid.objects.filter(id=other_bid.id).update(status=Bid.Status.declined)
+
+    call_command("refresh_bid_statistics")
+
+    statistics = UserBidStatistics.objects.get(user=user, bidcycle=bidcycle)
+    assert (statistics.submitted, statistics.closed, statistics.draft) == (3, 1, 0)
+    statistics = UserBidStatistics.objects.get(user=other_user, bidcycle=bidcycle)
+    assert (statistics.draft, statistics.declined) == (0, 1)
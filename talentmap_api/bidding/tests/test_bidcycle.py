@@ -3,12 +3,15 @@ from unittest import skip
 import pytest
 import json
 
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_mommy.recipe import seq
 from model_mommy import mommy
 from rest_framework import status
 
-from talentmap_api.bidding.models import BidCycle, Bid
-from talentmap_api.position.models import PositionBidStatistics
+from talentmap_api.bidding.models import BidCycle, BidCycleStatistics, Bid, CyclePosition, update_bidcycle_statistics
+from talentmap_api.position.models import Position, PositionBidStatistics
 from talentmap_api.user_profile.models import SavedSearch
 
 
@@ -279,3 +282,85 @@ def test_bidcycle_cycle_available_filter(authorized_client, authorized_user):
 
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data["results"]) == 5
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_bidcycle_fixture")
+def test_bidcycle_statistics(client):
+    bidcycle = BidCycle.objects.get(id=1)
+    cycle_positions = list(CyclePosition.objects.filter(bidcycle=bidcycle).order_by("id"))
+    domestic_post = mommy.make('organization.Post', location=mommy.make('organization.Location', country=mommy.make('organization.Country', code="USA")))
+    Position.objects.filter(id=cycle_positions[0].position_id).update(post=domestic_post)
+    # Bulk updates bypass the change paths, so are refreshed by the command
+    call_command("refresh_bidcycle_statistics")
+
+    response = client.get('/api/v1/bidcycle/1/statistics/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total_positions"] == 5
+    assert response.data["available_positions"] == 5
+    assert response.data["available_domestic_positions"] == 1
+    assert response.data["total_bids"] == 0
+    computed = response.data["statistics_date"]
+
+    # Reads are served from the snapshot, without recomputing it
+    response = client.get('/api/v1/bidcycle/1/statistics/')
+    assert response.data["statistics_date"] == computed
+
+    # Bids recompute the snapshot once they're committed
+    users = [mommy.make('auth.User').profile for i in range(2)]
+    mommy.make(Bid, user=users[0], bidcycle=bidcycle, position=cycle_positions[0], status=Bid.Status.in_panel)
+    mommy.make(Bid, user=users[0], bidcycle=bidcycle, position=cycle_positions[1], status=Bid.Status.submitted)
+    mommy.make(Bid, user=users[1], bidcycle=bidcycle, position=cycle_positions[1], status=Bid.Status.approved)
+
+    response = client.get('/api/v1/bidcycle/statistics/')
+    assert response.status_code == status.HTTP_200_OK
+    statistics = response.data["results"][0]
+    assert statistics["total_bids"] == 3
+    assert statistics["total_bidders"] == 2
+    assert statistics["in_panel_bidders"] == 1
+    assert statistics["approved_bidders"] == 1
+    assert statistics["available_positions"] == 3
+    assert statistics["available_domestic_positions"] == 0
+    assert statistics["available_international_positions"] == 3
+    assert statistics["statistics_date"] != computed
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bidcycle_statistics_single_upsert():
+    bidcycles = mommy.make(BidCycle, _quantity=3)
+    for bidcycle in bidcycles:
+        bidcycle.positions.add(*mommy.make('position.Position', _quantity=2))
+
+    with CaptureQueriesContext(connection) as context:
+        update_bidcycle_statistics([x.id for x in bidcycles])
+
+    upserts = [x for x in context.captured_queries if "INSERT INTO" in x["sql"]]
+    assert len(upserts) == 1
+    assert list(BidCycleStatistics.objects.filter(bidcycle__in=bidcycles).values_list("total_positions", flat=True)) == [2, 2, 2]
+
+    # New bidcycles have a snapshot once committed
+    assert BidCycleStatistics.objects.filter(bidcycle=mommy.make(BidCycle)).exists()
+
+@pytest.mark.django_db(transaction=True)
+def test_bidcycle_latest_bidcycle():
+    positions = mommy.make('position.Position', _quantity=3)
+    earlier = mommy.make(BidCycle, active=True, cycle_start_date="2017-01-01T00:00:00Z")
+    later = mommy.make(BidCycle, active=False, cycle_start_date="2018-01-01T00:00:00Z")
+    earlier.positions.add(*positions[:2])
+    later.positions.add(*positions[1:])
+
+    assert [x.latest_bidcycle_id for x in Position.objects.filter(id__in=[x.id for x in positions]).order_by("id")] == [earlier.id, earlier.id, None]
+
+    # Activating a bidcycle updates all of its positions
+    later.active = True
+    later.save()
+    assert [x.latest_bidcycle_id for x in Position.objects.filter(id__in=[x.id for x in positions]).order_by("id")] == [earlier.id, later.id, later.id]
+
+    # As does removing positions
+    later.positions.remove(positions[2])
+    positions[2].refresh_from_db()
+    assert positions[2].latest_bidcycle is None
+
+    earlier.active = False
+    earlier.save()
+    assert [x.latest_bidcycle_id for x in Position.objects.filter(id__in=[x.id for x in positions]).order_by("id")] == [None, later.id, None]
@@ -9,7 +9,7 @@ from django.shortcuts import get_object_or_404
 from talentmap_api.common.common_helpers import in_group_or_403
 from talentmap_api.common.permissions import isDjangoGroupMemberOrReadOnly
 from talentmap_api.common.history_helpers import generate_historical_view
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 from talentmap_api.position.serializers import PositionSerializer
 from talentmap_api.position.filters import PositionFilter
 
@@ -26,7 +26,7 @@ logger = logging.getLogger(__name__)
 HistoricalBidCycleView = generate_historical_view(BidCycle, BidCycleSerializer, BidCycleFilter)
 
 
-class BidCycleListPositionView(mixins.ListModelMixin,
+class BidCycleListPositionView(StreamingListModelMixin,
                                GenericViewSet):
     '''
     list:
@@ -94,7 +94,7 @@ class BidCycleBatchPositionActionView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class BidCycleView(mixins.ListModelMixin,
+class BidCycleView(StreamingListModelMixin,
                    mixins.RetrieveModelMixin,
                    mixins.CreateModelMixin,
                    mixins.UpdateModelMixin,
@@ -125,7 +125,7 @@ class BidCycleView(mixins.ListModelMixin,
         return queryset
 
 
-class BidCycleStatisticsView(mixins.ListModelMixin,
+class BidCycleStatisticsView(StreamingListModelMixin,
                              mixins.RetrieveModelMixin,
                              FieldLimitableSerializerMixin,
                              GenericViewSet):
@@ -143,6 +143,7 @@ class BidCycleStatisticsView(mixins.ListModelMixin,
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def get_queryset(self):
-        queryset = BidCycle.objects.all()
+        # Statistics are served from snapshots, recomputed when their bidcycle's positions or bids change
+        queryset = BidCycle.objects.select_related("statistics")
         queryset = self.serializer_class.prefetch_model(BidCycle, queryset)
         return queryset
@@ -4,7 +4,6 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
 
-from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
@@ -17,13 +16,14 @@ from talentmap_api.bidding.models import Bid, BidCycle, CyclePosition
 from talentmap_api.bidding.filters import BidFilter
 from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.messaging.models import Notification
+from talentmap_api.common.mixins import StreamingListModelMixin
 from talentmap_api.common.permissions import isDjangoGroupMember
 
 import logging
 logger = logging.getLogger(__name__)
 
 
-class BidListView(mixins.ListModelMixin,
+class BidListView(StreamingListModelMixin,
                   GenericViewSet):
     '''
     list:
@@ -5,12 +5,11 @@ from rest_framework.viewsets import ReadOnlyModelViewSet, GenericViewSet
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework import mixins
 
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 
 from talentmap_api.common.cache.views import CachedViewSet
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin, StreamingListModelMixin
 from talentmap_api.common.common_helpers import has_permission_or_403, in_group_or_403
 from talentmap_api.common.permissions import isDjangoGroupMember
 
@@ -49,7 +48,7 @@ class CyclePositionListView(FieldLimitableSerializerMixin,
 
 
 class CyclePositionBidListView(FieldLimitableSerializerMixin,
-                          mixins.ListModelMixin,
+                          StreamingListModelMixin,
                           GenericViewSet):
     """
     list:
@@ -67,12 +66,12 @@ class CyclePositionBidListView(FieldLimitableSerializerMixin,
         in_group_or_403(self.request.user, f"bureau_ao:{position.bureau.code}")
         # Get the position's bids
         queryset = cp.bids
-        self.serializer_class.prefetch_model(Bid, queryset)
+        queryset = self.serializer_class.prefetch_model(Bid, queryset)
         return queryset
 
 
 class CyclePositionSimilarView(FieldLimitableSerializerMixin,
-                          mixins.ListModelMixin,
+                          StreamingListModelMixin,
                           GenericViewSet):
     """
     list:
@@ -88,7 +87,7 @@ class CyclePositionSimilarView(FieldLimitableSerializerMixin,
         position = get_object_or_404(CyclePosition, pk=self.request.parser_context.get("kwargs").get("pk"))
         # Get the position's similar positions
         queryset = position.similar_positions
-        self.serializer_class.prefetch_model(CyclePosition, queryset)
+        queryset = self.serializer_class.prefetch_model(CyclePosition, queryset)
         return queryset
 
 class CyclePositionHighlightListView(FieldLimitableSerializerMixin,
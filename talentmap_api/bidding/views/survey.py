@@ -2,13 +2,14 @@ from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
+from talentmap_api.common.mixins import StreamingListModelMixin
 from talentmap_api.bidding.serializers.serializers import SurveySerializer
 from talentmap_api.bidding.filters import StatusSurveyFilter
 from talentmap_api.bidding.models import StatusSurvey
 from talentmap_api.user_profile.models import UserProfile
 
 
-class StatusSurveyView(mixins.ListModelMixin,
+class StatusSurveyView(StreamingListModelMixin,
                        mixins.RetrieveModelMixin,
                        mixins.UpdateModelMixin,
                        mixins.CreateModelMixin,
@@ -2,7 +2,7 @@ from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
-from talentmap_api.common.mixins import ActionDependentSerializerMixin
+from talentmap_api.common.mixins import ActionDependentSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.bidding.serializers.serializers import WaiverSerializer, WaiverClientSerializer
 from talentmap_api.bidding.filters import WaiverFilter
@@ -13,7 +13,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class WaiverClientView(mixins.ListModelMixin,
+class WaiverClientView(StreamingListModelMixin,
                        mixins.RetrieveModelMixin,
                        mixins.UpdateModelMixin,
                        mixins.CreateModelMixin,
@@ -0,0 +1,141 @@
+import pickle
+import threading
+import time
+
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+from talentmap_api.common.metrics import record_cache_lookup
+
+# The local tiers, shared by all threads of the process
+_local_caches = {}
+_local_locks = {}
+
+
+class TieredCache(BaseCache):
+    '''
+    A two tier cache, consisting of a per-process LRU in front of a shared cache backend.
+
+    Reads are served from the local tier when possible, and otherwise from the shared tier,
+    populating the local tier. Writes go to both tiers. Local entries live for at most
+    LOCAL_TIMEOUT seconds, as the local tiers of other processes are not notified of writes;
+    keys which include generations (see talentmap_api.common.cache.generations) are never
+    stale, as a bumped generation changes the key.
+
+    OPTIONS:
+        SHARED_CACHE - The alias of the shared cache backend, e.g. memcached
+        LOCAL_MAX_ENTRIES - The maximum number of entries in the local tier
+        LOCAL_TIMEOUT - The maximum lifetime, in seconds, of entries in the local tier
+    '''
+
+    def __init__(self, name, params):
+        super(TieredCache, self).__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options.get("SHARED_CACHE", "shared")
+        self.local_max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self.local_timeout = int(options.get("LOCAL_TIMEOUT", 60))
+
+        self._local = _local_caches.setdefault(name, OrderedDict())
+        self._lock = _local_locks.setdefault(name, threading.Lock())
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get_local_expiry(self, timeout=DEFAULT_TIMEOUT):
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            timeout = self.local_timeout
+        return time.time() + min(timeout, self.local_timeout)
+
+    def get_local(self, key):
+        '''
+        Returns a tuple of whether the key was found in the local tier, and its value
+        '''
+        with self._lock:
+            entry = self._local.get(key, None)
+            if entry is None:
+                return False, None
+            expiry, pickled = entry
+            if expiry <= time.time():
+                del self._local[key]
+                return False, None
+            self._local.move_to_end(key)
+        return True, pickle.loads(pickled)
+
+    def set_local(self, key, value, timeout=DEFAULT_TIMEOUT):
+        if timeout is not None and timeout != DEFAULT_TIMEOUT and timeout <= 0:
+            self.delete_local(key)
+            return
+
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (self.get_local_expiry(timeout), pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def delete_local(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+
+        found, value = self.get_local(local_key)
+        if found:
+            record_cache_lookup(True)
+            return value
+
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=version)
+        record_cache_lookup(value is not sentinel)
+        if value is sentinel:
+            return default
+
+        self.set_local(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self.set_local(local_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+
+        added = self.shared.add(key, value, timeout=timeout, version=version)
+        if added:
+            self.set_local(local_key, value, timeout)
+        return added
+
+    def delete(self, key, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+
+        self.shared.delete(key, version=version)
+        self.delete_local(local_key)
+
+    def incr(self, key, delta=1, version=None):
+        # Counters are always served by the shared tier
+        self.delete_local(self.make_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def has_key(self, key, version=None):
+        sentinel = object()
+        return self.get(key, sentinel, version=version) is not sentinel
+
+    def clear(self):
+        self.shared.clear()
+        with self._lock:
+            self._local.clear()
@@ -0,0 +1,189 @@
+'''
+Per-table generation counters, used to invalidate cached data derived from a table whenever
+that table changes. Any cache key which includes the generations of the tables it was derived
+from is implicitly invalidated by a bump of any of those generations.
+'''
+import re
+import threading
+import time
+
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.db import transaction
+
+GENERATION_KEY_PREFIX = "generation"
+GENERATION_TIMEOUT = None  # Generations never expire
+
+TABLE_REGEX = re.compile(r'"([a-z0-9_]+)"')
+
+
+def get_cache():
+    '''
+    Returns the cache holding the generations. This must be shared across processes, and not
+    a per-process tier, so that all processes observe a bump immediately.
+    '''
+    return caches[getattr(settings, "GENERATION_CACHE_ALIAS", "default")]
+
+
+def generations_available():
+    '''
+    Returns whether generations are tracked, i.e. the generation cache actually caches
+    '''
+    return not isinstance(get_cache(), DummyCache)
+
+
+def get_generation_key(table):
+    return f"{GENERATION_KEY_PREFIX}:{table}"
+
+
+def get_model_tables(*models):
+    '''
+    Returns the database tables of the specified models
+    '''
+    return [model._meta.db_table for model in models]
+
+
+@lru_cache(maxsize=None)
+def get_project_tables():
+    '''
+    Returns the database tables of all TalentMAP models, including automatically created
+    many-to-many tables
+    '''
+    return frozenset(model._meta.db_table for model in apps.get_models(include_auto_created=True) if model.__module__.startswith("talentmap_api"))
+
+
+def get_query_tables(sql):
+    '''
+    Returns the TalentMAP tables referenced by the specified SQL
+
+    Args:
+        - sql (str) - The SQL, as generated by the Django ORM
+
+    Returns:
+        - list - The sorted list of referenced tables
+    '''
+    return sorted(set(TABLE_REGEX.findall(sql)) & get_project_tables())
+
+
+def get_generations(tables):
+    '''
+    Returns the current generation of each of the specified tables
+
+    Args:
+        - tables (list) - The list of database tables
+
+    Returns:
+        - dict - The generation of each table, tables which have never been bumped are generation 0
+    '''
+    tables = list(tables)
+    generations = get_cache().get_many([get_generation_key(x) for x in tables])
+    return {table: generations.get(get_generation_key(table), 0) for table in tables}
+
+
+def increment_generations(tables):
+    '''
+    Increments the generation of each of the specified tables immediately
+
+    Args:
+        - tables (list) - The database tables which have changed
+    '''
+    cache = get_cache()
+    for table in tables:
+        key = get_generation_key(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The counter doesn't exist or was evicted; start from the current time so that a
+            # restarted counter never repeats a generation which may already be in use
+            cache.set(key, int(time.time() * 1000), GENERATION_TIMEOUT)
+
+
+def bump_generation(*tables):
+    '''
+    Increments the generation of each of the specified tables, once the current transaction (if any)
+    commits. Bumping before the commit would let a concurrent request cache data read from before
+    the change under the new generation, where it would never be invalidated.
+
+    Args:
+        - tables (str) - The database tables which have changed
+    '''
+    transaction.on_commit(lambda: increment_generations(tables))
+
+
+def get_column_tables(model, *fields):
+    '''
+    Returns the generation names of columns of a model which are tracked separately from its table,
+    as listed in the model's column_generation_fields. Values derived from only those columns of the
+    table depend upon these, rather than the table, so they survive changes to its other columns.
+
+    Args:
+        - model (Model) - The model
+        - fields (str) - The names of the fields
+
+    Returns:
+        - list - The generation names, e.g. "position_position.grade_id"
+    '''
+    tracked = getattr(model, "column_generation_fields", [])
+    untracked = [x for x in fields if x not in tracked]
+    if untracked:
+        raise ValueError(f"{model.__name__} doesn't track the generations of {untracked}, see column_generation_fields")
+    return [f"{model._meta.db_table}.{model._meta.get_field(x).column}" for x in fields]
+
+
+def bump_model_generation(*models, fields=None):
+    '''
+    Increments the generation of the tables of each of the specified models, and of their tracked columns
+
+    Args:
+        - models (Model) - The models which have changed
+        - fields (list) - The names of the fields which have changed, if known; otherwise every tracked
+                          column is bumped
+    '''
+    tables = get_model_tables(*models)
+    for model in models:
+        tracked = getattr(model, "column_generation_fields", [])
+        tables += get_column_tables(model, *[x for x in tracked if fields is None or x in fields])
+    bump_generation(*tables)
+
+
+class GenerationalValue(object):
+    '''
+    A value held in memory by each process, such as an index, which is rebuilt when the generation
+    of any table it is derived from changes. Checking the generations reads the shared cache, but
+    never the database.
+
+    When generations aren't tracked, changes can't be detected, so the value is rebuilt on each access.
+    '''
+
+    def __init__(self, build, models, tables=()):
+        '''
+        Args:
+            - build (callable) - Builds the value
+            - models (list) - The models the value is derived from
+            - tables (list) - Any further generations the value is derived from, such as those of columns
+        '''
+        self.build = build
+        self.models = models
+        self.tables = list(tables)
+        self.value = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        version = None
+        if generations_available():
+            version = sorted(get_generations(get_model_tables(*self.models) + self.tables).items())
+
+        if version is not None and self.value is not None and self.version == version:
+            return self.value
+
+        with self.lock:
+            # Another thread may have rebuilt the value while this one waited
+            if version is None or self.value is None or self.version != version:
+                self.value = self.build()
+                self.version = version
+            return self.value
@@ -1,10 +1,15 @@
 import hashlib
 import json
 
+from functools import lru_cache
+
+from django.db.models.constants import LOOKUP_SEP
+
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
 from talentmap_api.common.common_helpers import order_dict
+from talentmap_api.common.cache.generations import get_generations, get_model_tables, get_query_tables
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -16,12 +21,87 @@ class PathKeyBit(bits.QueryParamsKeyBit):
         return {"path": request.path}
 
 
+@lru_cache(maxsize=256)
+def get_serializer_tables(serializer_class, model):
+    '''
+    Returns the tables read by the prefetch plan of the serializer, which are queried separately
+    from the view's queryset
+    '''
+    tables = set(get_model_tables(model))
+    if hasattr(serializer_class, "get_prefetch_plan"):
+        for _, lookup in serializer_class.get_prefetch_plan(model):
+            related_model = model
+            for name in lookup.split(LOOKUP_SEP):
+                field = related_model._meta.get_field(name)
+                if field.many_to_many:
+                    through = field.remote_field.through if field.concrete else field.through
+                    tables.add(through._meta.db_table)
+                related_model = field.related_model
+                tables.add(related_model._meta.db_table)
+    return tuple(sorted(tables))
+
+
+def get_view_tables(view_instance):
+    '''
+    Returns the tables a view's response is derived from; those referenced by the view's filtered
+    queryset, those read by the serializer's prefetching, and the models in the view's
+    cache_dependencies attribute
+
+    Returns:
+        - list - The sorted list of tables
+    '''
+    tables = set(get_model_tables(*getattr(view_instance, "cache_dependencies", [])))
+
+    if hasattr(view_instance, "get_filtered_queryset"):
+        queryset = view_instance.get_filtered_queryset()
+    else:
+        queryset = view_instance.filter_queryset(view_instance.get_queryset())
+    sql, _ = queryset.query.sql_with_params()
+    tables.update(get_query_tables(sql))
+    tables.update(get_serializer_tables(view_instance.get_serializer_class(), queryset.model))
+
+    return sorted(tables)
+
+
+class UserKeyBit(bits.UserKeyBit):
+    """
+    Adds the requesting user's id as a key bit; the drf-extensions version calls is_authenticated
+    as a method, which it no longer is
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        user = getattr(request, "user", None)
+        if user and user.is_authenticated:
+            return str(self._get_id_from_user(user))
+        return "anonymous"
+
+
+class GenerationKeyBit(bits.KeyBitBase):
+    """
+    Adds the generations of the tables the response is derived from as a key bit, so that any
+    change to those tables invalidates the cached response
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        try:
+            # Views which compute their tables once per request, see ConditionalGetMixin
+            tables = view_instance.get_view_tables() if hasattr(view_instance, "get_view_tables") else get_view_tables(view_instance)
+        except Exception:
+            # The view will raise the appropriate error itself; such responses aren't cached
+            return None
+
+        return get_generations(tables)
+
+
 class TalentMAPKeyConstructor(DefaultKeyConstructor):
     """
-    Construct the cache key, include query params as a bit
+    Construct the cache key, include query params as a bit, the requesting user (as responses
+    can be user dependent), and the generations of the underlying tables
     """
     path_bit = PathKeyBit()
     request_params = bits.QueryParamsKeyBit()
+    user = UserKeyBit()
+    generations = GenerationKeyBit()
 
     def prepare_key(self, key_dict):  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
         key_dict = order_dict(key_dict)  # We order the dict to ensure something like ?q=german&code=1 == ?code=1&q=german
@@ -1,20 +1,160 @@
+import calendar
+import hashlib
+import json
 import logging
+
+from django.db.models import Count, Max
+from django.db.models.query import QuerySet
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
 from rest_framework.viewsets import GenericViewSet
+from rest_framework.response import Response
 from rest_framework import mixins
+from rest_framework import status
 
 from rest_framework_extensions.cache.decorators import CacheResponse as cache_response
 
+from talentmap_api.common.mixins import StreamingListModelMixin
+from talentmap_api.common.cache.generations import generations_available, get_generations
+from talentmap_api.common.cache.key_constructor import get_view_tables
+
 logger = logging.getLogger(__name__)
 
 
-class CachedViewSet(mixins.ListModelMixin,
+class ConditionalGetMixin(object):
+    '''
+    Supports conditional GET requests, responding 304 Not Modified without serializing when the
+    client's copy is current.
+
+    When generations are tracked, the weak ETag is derived from the generations of every table the
+    response depends upon, including those the serializer reads. Otherwise, a weak ETag and
+    Last-Modified are derived from the row count and latest update of the filtered queryset, using
+    the first of last_modified_fields on the model.
+
+    The filtered queryset and the retrieved object are computed once per request, and shared by the
+    validators, the cache key and the view method.
+    '''
+
+    last_modified_fields = ["update_date", "date_updated", "updated", "history_date"]
+
+    def conditional_response(self, request, view_method, *args, **kwargs):
+        '''
+        Evaluates the request's validators, and calls the view method if the client's copy is stale
+
+        Args:
+            - request (Request) - The request
+            - view_method (callable) - The view method which builds the full response
+
+        Returns:
+            - Response - The full response, or a 304 response
+        '''
+        try:
+            etag, last_modified = self.get_validators(request)
+        except Exception:
+            # Let the view method raise the appropriate error itself
+            etag, last_modified = None, None
+
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = view_method(request, *args, **kwargs)
+
+        if response.status_code in [status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED]:
+            if etag:
+                response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+
+        # Responses differ by user
+        patch_vary_headers(response, ["Authorization", "Cookie"])
+        return response
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", None)
+        if if_none_match is not None:
+            return etag is not None and (etag in parse_etags(if_none_match) or "*" in parse_etags(if_none_match))
+
+        if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+        return last_modified is not None and if_modified_since is not None and last_modified <= if_modified_since
+
+    def get_validators(self, request):
+        '''
+        Returns the ETag and last modified timestamp of the response to the request
+        '''
+        instance = None
+        if self.action == "retrieve":
+            # Ensure the object exists and its permissions are checked before revealing anything
+            instance = self.get_object()
+
+        if generations_available():
+            # The ETag reflects the data, not the exact bytes of the representation, so it is weak
+            return f"W/{self.make_etag(request, get_generations(self.get_view_tables()))}", None
+
+        queryset = self.get_filtered_queryset()
+        if instance is not None:
+            queryset = queryset.filter(pk=instance.pk)
+
+        field = self.get_last_modified_field(queryset.model)
+        if not field:
+            return None, None
+
+        aggregate = queryset.order_by().aggregate(last_modified=Max(field), count=Count("pk"))
+        last_modified = aggregate["last_modified"]
+        if last_modified is not None:
+            last_modified = calendar.timegm(last_modified.utctimetuple())
+
+        # Changes to related models aren't reflected, so this ETag is weak
+        return f"W/{self.make_etag(request, [last_modified, aggregate['count']])}", last_modified
+
+    def get_filtered_queryset(self):
+        if not hasattr(self, "_filtered_queryset"):
+            self._filtered_queryset = self.filter_queryset(self.get_queryset())
+        # A clone, so that evaluating it never caches results in the shared queryset
+        return self._filtered_queryset.all() if isinstance(self._filtered_queryset, QuerySet) else self._filtered_queryset
+
+    def get_object(self):
+        if not hasattr(self, "_object"):
+            self._object = super().get_object()
+        return self._object
+
+    def get_view_tables(self):
+        if not hasattr(self, "_view_tables"):
+            self._view_tables = get_view_tables(self)
+        return self._view_tables
+
+    def get_last_modified_field(self, model):
+        field_names = [x.name for x in model._meta.concrete_fields]
+        return next((x for x in self.last_modified_fields if x in field_names), None)
+
+    def make_etag(self, request, state):
+        '''
+        Returns an ETag for the request, given the state of the data it depends upon
+        '''
+        user = request.user.id if request.user and request.user.is_authenticated else None
+        accepted_format = getattr(request, "accepted_renderer", None) and request.accepted_renderer.format
+        etag_data = json.dumps([request.path, sorted(request.query_params.lists()), user, accepted_format, state], default=str)
+        return quote_etag(hashlib.md5(etag_data.encode('utf-8')).hexdigest())  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
+
+
+class CachedViewSet(ConditionalGetMixin,
+                    StreamingListModelMixin,
                     mixins.RetrieveModelMixin,
                     GenericViewSet):
 
-    @cache_response()
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Streamed responses and exports are not cached
+        if self.is_streaming_request(request) or self.is_export_request(request):
+            return super().list(request, *args, **kwargs)
+        return self.conditional_response(request, self.cached_list, *args, **kwargs)
 
     @cache_response()
+    def cached_list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.cached_retrieve, *args, **kwargs)
+
+    @cache_response()
+    def cached_retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
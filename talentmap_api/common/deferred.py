@@ -0,0 +1,111 @@
+'''
+Deferred, coalesced updates of derived data.
+
+Derived data, such as a denormalized field, is updated by signal listeners as the data it is derived
+from changes. Bulk operations, such as a synchronization, change many instances at once, so updating
+on each change repeats much of the same work. While deferred, the instances requiring an update are
+collected instead, and updated together once, when leaving the outermost deferral.
+'''
+import threading
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class DeferredUpdate(object):
+    '''
+    An update of derived data, requested for a set of keys (such as instance ids), which may be deferred
+
+    Usage:
+        position_updates = DeferredUpdate(update_positions)
+
+        # In a signal listener; updates immediately, unless deferred
+        position_updates.request(instance.position_id)
+
+        # Around a bulk operation; updates all requested positions at once on exit
+        with position_updates.deferred():
+            ...
+    '''
+
+    def __init__(self, update, on_commit=False):
+        '''
+        Args:
+            - update (callable) - Performs the update; accepts the set of keys to update
+            - on_commit (bool) - Whether to perform the update once the current transaction commits,
+                                 so that it sees the transaction's changes in full. The keys requested
+                                 during a transaction are then updated together, once.
+        '''
+        self.update = update
+        self.on_commit = on_commit
+        self.local = threading.local()
+
+    def perform(self, keys):
+        '''
+        Performs the update of the keys, or registers it to run on commit
+        '''
+        if self.on_commit:
+            # Every request registers a callback, as those registered in a rolled back savepoint are
+            # discarded, but the first to run updates all of the keys
+            self.committing.update(keys)
+            transaction.on_commit(self.perform_committing)
+        else:
+            self.update(keys)
+
+    @property
+    def committing(self):
+        '''
+        The keys to update once the current transaction commits
+        '''
+        if getattr(self.local, "committing", None) is None:
+            self.local.committing = set()
+        return self.local.committing
+
+    def perform_committing(self):
+        keys, self.local.committing = self.committing, set()
+        if keys:
+            self.update(keys)
+
+    @property
+    def pending(self):
+        '''
+        The keys requested during the current deferral, or None if not deferred
+        '''
+        return getattr(self.local, "pending", None)
+
+    def request(self, *keys):
+        '''
+        Requests an update of the keys, which is performed immediately unless deferred
+        '''
+        if self.pending is None:
+            self.perform(set(keys))
+        else:
+            self.pending.update(keys)
+
+    def clear(self):
+        '''
+        Discards the updates requested during the current deferral, such as when all keys are updated anyway
+        '''
+        if self.pending is not None:
+            self.pending.clear()
+
+    @contextmanager
+    def deferred(self):
+        '''
+        Defers all requested updates until the outermost deferral exits. Nothing is updated if the
+        deferral exits with an exception.
+        '''
+        if self.pending is not None:
+            # Already deferred; the outermost deferral performs the update
+            yield
+            return
+
+        self.local.pending = set()
+        try:
+            yield
+            pending = self.local.pending
+        finally:
+            self.local.pending = None
+
+        if pending:
+            self.perform(pending)
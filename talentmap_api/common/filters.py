@@ -1,6 +1,6 @@
-from django.db.models import Q
+from django.db.models import F, Q
 from django.db.models.constants import LOOKUP_SEP
-from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 
 from rest_framework_filters.backends import DjangoFilterBackend
 
@@ -57,6 +57,13 @@ class RelatedOrderingFilter(filters.OrderingFilter):
         return [term for term in fields
                 if self.is_valid_field(queryset.model, term.lstrip('-'))]
 
+    def get_ordering(self, request, queryset, view):
+        ordering = super(RelatedOrderingFilter, self).get_ordering(request, queryset, view)
+        # Full text search results are ranked, unless the client requests an ordering
+        if not ordering and self.ordering_param not in request.query_params and "search_rank" in queryset.query.annotations:
+            return ["-search_rank", "pk"]
+        return ordering
+
 
 class NumberInFilter(drff_filters.BaseInFilter, drff_filters.NumberFilter):
     '''
@@ -109,17 +116,32 @@ def multi_field_filter(fields, lookup_expr='exact', exclude=False):
     return filter_method
 
 
-def full_text_search(fields):
+def full_text_search(fields, document=None):
     '''
     Curries a function suitable for use as a filter's method to perform FTS.
     (This function should be expanded as FTS functionality needs additional complexity)
 
+    When the model maintains a stored search document (see talentmap_api.common.search), the
+    search uses its indexes, and results are annotated with their search_rank, by which
+    RelatedOrderingFilter orders them when the client requests no ordering.
+
     Args:
         fields (list) - List of fields for search vectors which will be combined for the search
+        document (str) - The lookup path of a stored search document, e.g. "search" or "position__search"
 
     Returns:
         callable: A function suitable for use as a filter's method override
     '''
+    if document:
+        vector = f"{document}_vector"
+
+        def document_filter_method(queryset, name, value):
+            # Substring matches, which the tsquery doesn't handle, use the trigram index of the document text
+            query = SearchQuery(value)
+            queryset = queryset.filter(Q(**{vector: query}) | Q(**{f"{document}_text__icontains": value}))
+            return queryset.annotate(search_rank=SearchRank(F(vector), query))
+        return document_filter_method
+
     # Create our vectors
     vectors = [SearchVector(x) for x in fields]
     final_vector = vectors[0]
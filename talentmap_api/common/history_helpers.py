@@ -1,4 +1,7 @@
+from collections import OrderedDict
+
 import rest_framework_filters as filters
+from django.db.models.constants import LOOKUP_SEP
 from django.shortcuts import get_object_or_404
 
 from rest_framework.viewsets import ReadOnlyModelViewSet
@@ -33,10 +36,31 @@ def generate_historical_view(model_class, serializer, filter):
     class HistoricalSerializer(serializer):
         history_user = StaticRepresentationField(read_only=True)
 
+        def get_representation(self, obj):
+            # Represented as the historical record represents itself, but from the representation
+            # recorded with it, rather than by rebuilding the instance and its relations
+            return f"{obj._string_representation} as of {obj.history_date}"
+
         class Meta(serializer.Meta):
             model = model_class.history.model
             fields = "__all__"
             nested = {}  # No nesting serializers here - the FK traversal doesn't cascade (yet)
+            field_dependencies = {
+                **getattr(serializer.Meta, "field_dependencies", {}),
+                "representation": ["_string_representation", "history_date"],
+            }
+
+    # Many-to-many and reverse relationships, and excluded fields, aren't recorded in the history, so drop the
+    # serializer's fields reading them, as declared by their field dependencies, or their source
+    untracked = {x.name for x in model_class._meta.get_fields()} - {x.name for x in model_class.history.model._meta.get_fields()}
+    dependencies = getattr(serializer.Meta, "field_dependencies", {})
+
+    def is_tracked(name, field):
+        lookups = dependencies.get(name, [field.source or name])
+        return not any(x.split(LOOKUP_SEP)[0] in untracked for x in lookups)
+
+    HistoricalSerializer._declared_fields = OrderedDict((name, field) for name, field in HistoricalSerializer._declared_fields.items()
+                                                        if is_tracked(name, field))
 
     class HistoricalView(FieldLimitableSerializerMixin,
                          ReadOnlyModelViewSet):
@@ -52,9 +76,11 @@ def generate_historical_view(model_class, serializer, filter):
         filter_class = HistoricalFilter
         lookup_field = "history_id"
         lookup_value_regex = "[0-9]+"
+        # The cursor seeks on a unique key; history dates may be shared
+        cursor_ordering = "-history_id"
 
         def get_queryset(self):
             instance = get_object_or_404(model_class, pk=self.request.parser_context.get("kwargs").get("instance_id"))
-            return self.serializer_class.prefetch_model(model_class, instance.history)
+            return self.serializer_class.prefetch_model(model_class.history.model, instance.history)
 
     return HistoricalView
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+
+import logging
+import timeit
+
+from talentmap_api.common.serializers import PrefetchedSerializer
+from talentmap_api.position.models import Position
+from talentmap_api.position.serializers import PositionListSerializer
+from talentmap_api.bidding.models import CyclePosition
+from talentmap_api.bidding.serializers.serializers import CyclePositionListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the per-request serializer setup time of the position list endpoints, with and without compiled field plans'
+    logger = logging.getLogger(__name__)
+
+    # endpoint, model, list serializer, include parameter
+    ENDPOINTS = [
+        ("/api/v1/position/", Position, PositionListSerializer, []),
+        ("/api/v1/position/?include=id,title,grade", Position, PositionListSerializer, ["id", "title", "grade"]),
+        ("/api/v1/cycleposition/", CyclePosition, CyclePositionListSerializer, []),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, dest='iterations', default=200, help='The number of simulated requests per endpoint')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        for endpoint, model, serializer_class, include in self.ENDPOINTS:
+            uncached = self.time_setup(model, serializer_class, include, iterations, clear_cache=True)
+            cached = self.time_setup(model, serializer_class, include, iterations, clear_cache=False)
+            reduction = (1 - cached / uncached) * 100 if uncached else 0
+
+            self.logger.info(f"{endpoint}\n\tUncached setup: {uncached * 1000:.3f} ms/request\n\tCached setup: {cached * 1000:.3f} ms/request\n\tReduction: {reduction:.1f}%")
+
+    def time_setup(self, model, serializer_class, include, iterations, clear_cache):
+        '''
+        Times the serializer setup performed by a single list request; building the queryset
+        prefetches and instantiating the (many) serializer with its full field tree
+
+        Returns:
+            - float - The mean setup time in seconds per request
+        '''
+        # Warm the caches so the cached timing excludes the one-off compilation
+        PrefetchedSerializer.clear_field_plan_cache()
+        self.setup_request(model, serializer_class, include)
+
+        def run():
+            if clear_cache:
+                PrefetchedSerializer.clear_field_plan_cache()
+            self.setup_request(model, serializer_class, include)
+
+        return timeit.timeit(run, number=iterations) / iterations
+
+    def setup_request(self, model, serializer_class, include):
+        serializer_class.prefetch_model(model, model.objects.all(), include)
+
+        context = {}
+        if include:
+            context["override_fields"] = list(include)
+
+        serializer = serializer_class([], many=True, context=context)
+        self.build_fields(serializer.child)
+
+    def build_fields(self, serializer):
+        '''
+        Recursively instantiates the field tree, as rendering the first row of a page would
+        '''
+        for field in serializer.fields.values():
+            field = getattr(field, "child", field)
+            if hasattr(field, "fields"):
+                self.build_fields(field)
@@ -10,6 +10,7 @@ from dateutils import relativedelta
 
 from django.contrib.auth.models import User
 
+from talentmap_api.common.cache.generations import bump_model_generation
 from talentmap_api.bidding.models import BidCycle, Bid, Waiver, StatusSurvey
 from talentmap_api.position.models import Position, Assignment
 from talentmap_api.glossary.models import GlossaryEntry
@@ -247,6 +248,7 @@ class Command(BaseCommand):
 
         self.logger.info(f"Setting all position posted dates, and statuses")
         Position.objects.all().update(posted_date="2006-05-20T15:00:00Z")
+        bump_model_generation(Position)
 
         # Give all positions without a current assignment an assignment from John Doe
         profile = UserProfile.objects.get(user__username="doej")
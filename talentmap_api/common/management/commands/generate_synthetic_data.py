@@ -0,0 +1,381 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.utils import timezone
+
+import logging
+import random
+
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from talentmap_api.common.cache.generations import bump_model_generation
+from talentmap_api.common.search import update_search_documents
+from talentmap_api.bidding.models import BidCycle, CyclePosition, Bid
+from talentmap_api.messaging.models import Notification
+from talentmap_api.organization.models import Country, Location, Post, Organization, TourOfDuty
+from talentmap_api.position.models import Position, Grade, Skill, Assignment, update_availability, update_similar_positions
+from talentmap_api.user_profile.models import UserProfile
+
+
+@contextmanager
+def suspended_signals(*signals):
+    '''
+    Disconnects all receivers of the specified signals for the duration of the context
+    '''
+    saved = [(signal, signal.receivers) for signal in signals]
+    for signal in signals:
+        signal.receivers = []
+        signal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for signal, receivers in saved:
+            signal.receivers = receivers
+            signal.sender_receivers_cache.clear()
+
+
+class Command(BaseCommand):
+    help = 'Generates a synthetic, production scale dataset for load testing and benchmarking'
+    logger = logging.getLogger(__name__)
+
+    # Row counts at a scale of 1
+    SCALE_COUNTS = {
+        "positions": 50000,
+        "cycle_positions": 100000,
+        "users": 30000,
+        "bids": 500000,
+        "notifications": 1000000,
+        "history": 200000,
+    }
+
+    # Marks generated data, so that it can be flushed
+    PREFIX = "SYN"
+    USERNAME_PREFIX = "synthetic_"
+    PASSWORD = "password"
+
+    # Named users for benchmarks and load tests, with the password PASSWORD; username, groups
+    BENCH_USERS = [
+        ("bench_bidder", ["bidder"]),
+        ("bench_cdo", ["cdo"]),
+        ("bench_ao", ["bureau_ao"]),
+        ("bench_admin", ["superuser", "bidcycle_admin", "feedback_editors", "glossary_editors"]),
+    ]
+
+    # Grades and their relative frequency; mid-level grades are the most common
+    GRADES = [("00", 2), ("01", 6), ("02", 10), ("03", 14), ("04", 16), ("05", 14), ("06", 10),
+              ("07", 6), ("08", 4), ("OM", 3), ("OC", 2), ("MC", 1), ("CM", 0.5), ("CA", 0.1)]
+
+    # Bid statuses and their relative frequency
+    BID_STATUSES = [(Bid.Status.draft, 30), (Bid.Status.submitted, 35), (Bid.Status.handshake_offered, 5),
+                    (Bid.Status.handshake_accepted, 4), (Bid.Status.handshake_declined, 2), (Bid.Status.in_panel, 3),
+                    (Bid.Status.approved, 5), (Bid.Status.declined, 10), (Bid.Status.closed, 6)]
+
+    TITLES = ["POLITICAL OFFICER", "ECONOMIC OFFICER", "CONSULAR OFFICER", "MANAGEMENT OFFICER",
+              "PUBLIC DIPLOMACY OFFICER", "INFORMATION MANAGEMENT SPECIALIST", "REGIONAL SECURITY OFFICER",
+              "GENERAL SERVICES OFFICER", "FINANCIAL MANAGEMENT OFFICER", "HUMAN RESOURCES OFFICER",
+              "FACILITY MANAGER", "MEDICAL OFFICER", "DEPUTY CHIEF OF MISSION", "OFFICE MANAGEMENT SPECIALIST"]
+
+    NOTIFICATION_TAGS = [["bidding"], ["bidding", "submitted"], ["bidding", "handshake_offered"],
+                         ["waiver", "requested"], ["saved_search"], ["share"]]
+
+    COUNTRIES = 150
+    LOCATIONS_PER_COUNTRY = 4
+    BUREAUS = 12
+    ORGANIZATIONS = 200
+    SKILLS = 120
+    BID_CYCLES = 4
+
+    # The models written, whose generations must be bumped as signals are suspended
+    GENERATED_MODELS = [Country, Location, Post, Organization, TourOfDuty, Grade, Skill, User, UserProfile,
+                        BidCycle, BidCycle.positions.through, Position, Position.history.model, CyclePosition,
+                        Assignment, Bid, Notification]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, dest='scale', default=1.0, help='The dataset size, relative to production scale')
+        parser.add_argument('--seed', type=int, dest='seed', default=1, help='The random seed; the same seed and scale generates the same dataset')
+        parser.add_argument('--batch-size', type=int, dest='batch_size', default=5000, help='The number of rows per insert')
+        parser.add_argument('--flush', action='store_true', dest='flush', help='Remove previously generated synthetic data first')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.counts = {k: max(1, int(v * options['scale'])) for k, v in self.SCALE_COUNTS.items()}
+        # Dates are relative to the start of today, so repeated runs on a day are identical
+        self.today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if User.objects.filter(username__startswith=self.USERNAME_PREFIX).exists():
+            if not options['flush']:
+                raise CommandError("Synthetic data already exists; use --flush to replace it")
+            self.flush()
+
+        self.logger.info(f"Generating synthetic data (seed {options['seed']}): {self.counts}")
+        with transaction.atomic(), suspended_signals(pre_save, post_save, pre_delete, post_delete, m2m_changed):
+            self.generate()
+
+        bump_model_generation(*self.GENERATED_MODELS)
+        self.logger.info("Done")
+
+    def generate(self):
+        self.generate_reference_data()
+        self.generate_users()
+        self.generate_positions()
+        self.generate_assignments()
+        self.generate_bids()
+        self.generate_notifications()
+        self.generate_history()
+
+        # Search documents, availability and similar positions are maintained by signals, so compute them for all positions at once
+        update_search_documents(Position.objects.filter(_create_id=self.PREFIX))
+        update_availability(Position.objects.filter(_create_id=self.PREFIX))
+        update_similar_positions()
+
+    def flush(self):
+        self.logger.info("Removing previously generated synthetic data")
+        with transaction.atomic(), suspended_signals(pre_save, post_save, pre_delete, post_delete, m2m_changed):
+            usernames = Q(username__startswith=self.USERNAME_PREFIX) | Q(username__in=[x[0] for x in self.BENCH_USERS])
+            profiles = UserProfile.objects.filter(user__in=User.objects.filter(usernames))
+            Notification.objects.filter(owner__in=profiles).delete()
+            Bid.objects.filter(user__in=profiles).delete()
+            Position.history.filter(_create_id=self.PREFIX).delete()
+            positions = Position.objects.filter(_create_id=self.PREFIX)
+            positions.update(current_assignment=None)
+            Assignment.objects.filter(position__in=positions).delete()
+            positions.delete()
+            BidCycle.objects.filter(name__startswith=self.PREFIX).delete()
+            UserProfile.objects.filter(cdo__in=profiles).update(cdo=None)
+            User.objects.filter(usernames).delete()
+            Organization.objects.filter(code__startswith=self.PREFIX).update(bureau_organization=None, parent_organization=None)
+            for model in [Organization, Post, Location, Country, TourOfDuty, Grade, Skill]:
+                model.objects.filter(**{self.get_code_field(model): self.PREFIX}).delete()
+        bump_model_generation(*self.GENERATED_MODELS)
+
+    def get_code_field(self, model):
+        return "location__code__startswith" if model is Post else "code__startswith"
+
+    def weighted(self, population, weights, k):
+        '''
+        Returns k random choices from the population, using the specified relative weights
+        '''
+        return self.random.choices(population, cum_weights=list(accumulate(weights)), k=k)
+
+    def zipf(self, population, k):
+        '''
+        Returns k random choices from the population, where the n-th item is 1/n as likely as
+        the first, like the long tail of real world popularity
+        '''
+        return self.weighted(population, [1 / (i + 1) for i in range(len(population))], k)
+
+    def date_between(self, start, end):
+        return start + timedelta(seconds=self.random.randint(0, int((end - start).total_seconds())))
+
+    def bulk_create(self, model, objects, keep=True):
+        '''
+        Inserts the objects in batches, setting their string representations
+
+        Args:
+            - model (class) - The model
+            - objects (iterable) - The unsaved instances, which may be a generator, with related
+                                   instances (rather than ids) set, so their representations don't query
+            - keep (bool) - Whether to return the created instances; large tables should not
+
+        Returns:
+            - list - The created instances, with their primary keys, if kept
+        '''
+        created = []
+        total = 0
+        objects = iter(objects)
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            for instance in batch:
+                # Historical records copy the representation of their instance
+                if getattr(instance, "_string_representation", False) is None:
+                    instance._string_representation = str(instance)
+            batch = model.objects.bulk_create(batch)
+            total += len(batch)
+            if keep:
+                created.extend(batch)
+        self.logger.info(f"Created {total} {model._meta.verbose_name_plural}")
+        return created
+
+    def generate_reference_data(self):
+        self.countries = self.bulk_create(Country, (
+            Country(code=f"{self.PREFIX}{i:03}", short_code=f"{i:02}", location_prefix=f"{i:02}", name=f"Country {i}", short_name=f"Country {i}")
+            for i in range(self.COUNTRIES)
+        ))
+
+        # Larger countries have more locations
+        location_countries = self.zipf(self.countries, self.COUNTRIES * self.LOCATIONS_PER_COUNTRY)
+        self.locations = self.bulk_create(Location, (
+            Location(code=f"{self.PREFIX}{i:05}", city=f"City {i}", country=country)
+            for i, country in enumerate(location_countries)
+        ))
+
+        self.tours_of_duty = self.bulk_create(TourOfDuty, (
+            TourOfDuty(code=f"{self.PREFIX}{months}", long_description=f"{months} MONTHS", short_description=f"{months}MO", months=months)
+            for months in [12, 24, 36, 48]
+        ))
+
+        self.posts = self.bulk_create(Post, (
+            Post(location=location, tour_of_duty=self.random.choice(self.tours_of_duty), danger_pay=self.random.choice([0, 0, 0, 15, 25, 35]),
+                 differential_rate=self.random.choice([0, 0, 5, 10, 15, 20, 25]), cost_of_living_adjustment=self.random.choice([0, 0, 10, 20]))
+            for location in self.locations
+        ))
+
+        self.bureaus = self.bulk_create(Organization, (
+            Organization(code=f"{self.PREFIX}B{i:02}", short_description=f"B{i:02}", long_description=f"Bureau {i}", is_bureau=True)
+            for i in range(self.BUREAUS)
+        ))
+        organization_bureaus = self.zipf(self.bureaus, self.ORGANIZATIONS)
+        self.organizations = self.bulk_create(Organization, (
+            Organization(code=f"{self.PREFIX}O{i:03}", short_description=f"O{i:03}", long_description=f"Organization {i}",
+                         bureau_organization=bureau, parent_organization=bureau)
+            for i, bureau in enumerate(organization_bureaus)
+        ))
+
+        self.grades = self.bulk_create(Grade, (Grade(code=f"{self.PREFIX}{code}", rank=rank) for rank, (code, _) in enumerate(self.GRADES)))
+        self.grade_weights = [weight for _, weight in self.GRADES]
+        self.skills = self.bulk_create(Skill, (Skill(code=f"{self.PREFIX}{i:03}", description=f"Skill {i}") for i in range(self.SKILLS)))
+
+        for bureau in self.bureaus:
+            Group.objects.get_or_create(name=f"bureau_ao:{bureau.code}")
+
+    def generate_users(self):
+        password = make_password(self.PASSWORD)
+        usernames = [x[0] for x in self.BENCH_USERS] + [f"{self.USERNAME_PREFIX}{i}" for i in range(self.counts["users"])]
+        users = self.bulk_create(User, (
+            User(username=username, email=f"{username}@state.gov", password=password, first_name=f"First{i}", last_name=f"Last{i}")
+            for i, username in enumerate(usernames)
+        ))
+
+        grades = self.weighted(self.grades, self.grade_weights, len(users))
+        nationalities = self.zipf(self.countries, len(users))
+        self.profiles = self.bulk_create(UserProfile, (
+            UserProfile(user=user, grade=grade, primary_nationality=country, emp_id=f"{self.PREFIX}{user.username}",
+                        date_of_birth=self.date_between(self.today - timedelta(days=365 * 60), self.today - timedelta(days=365 * 25)))
+            for user, grade, country in zip(users, grades, nationalities)
+        ))
+
+        # Bench users are first, in order
+        self.bench_profiles = dict(zip([x[0] for x in self.BENCH_USERS], self.profiles))
+        for (username, groups), profile in zip(self.BENCH_USERS, self.profiles):
+            for group in groups:
+                Group.objects.get_or_create(name=group)[0].user_set.add(profile.user)
+        Group.objects.get(name=f"bureau_ao:{self.bureaus[0].code}").user_set.add(self.bench_profiles["bench_ao"].user)
+
+        # One CDO per ~50 clients, including the bench CDO
+        cdo_count = max(1, len(self.profiles) // 50)
+        cdos = [self.bench_profiles["bench_cdo"]] + self.profiles[len(self.BENCH_USERS):len(self.BENCH_USERS) + cdo_count - 1]
+        cdo_ids = {x.id for x in cdos}
+        for cdo in cdos:
+            clients = [x.id for x in self.random.sample(self.profiles, min(50, len(self.profiles))) if x.id not in cdo_ids]
+            UserProfile.objects.filter(id__in=clients).update(cdo=cdo)
+        self.logger.info(f"Assigned clients to {len(cdos)} CDOs")
+
+    def generate_positions(self):
+        cycles = []
+        for i in range(self.BID_CYCLES):
+            start = self.today - timedelta(days=180 * (self.BID_CYCLES - i - 1) + 90)
+            cycles.append(BidCycle(name=f"{self.PREFIX} Bid Cycle {i}", active=i >= self.BID_CYCLES - 2, cycle_start_date=start,
+                                   cycle_deadline_date=start + timedelta(days=120), cycle_end_date=start + timedelta(days=180)))
+        self.bidcycles = self.bulk_create(BidCycle, cycles)
+
+        count = self.counts["positions"]
+        # Each position is in cycles_per_position consecutive cycles, ending with its latest
+        cycles_per_position = max(1, min(self.BID_CYCLES, round(self.counts["cycle_positions"] / count)))
+        latest_cycles = self.weighted(range(cycles_per_position - 1, self.BID_CYCLES), range(1, self.BID_CYCLES - cycles_per_position + 2), count)
+
+        grades = self.weighted(self.grades, self.grade_weights, count)
+        skills = self.zipf(self.skills, count)
+        posts = self.zipf(self.posts, count)
+        organizations = self.zipf(self.organizations, count)
+        self.positions = self.bulk_create(Position, (
+            Position(position_number=f"{self.PREFIX}{i:07}", title=self.random.choice(self.TITLES), grade=grade, skill=skill, post=post,
+                     organization=organization, bureau=organization.bureau_organization, _bureau_code=organization.bureau_organization.code,
+                     latest_bidcycle=self.bidcycles[latest], is_overseas=post.location.country_id != self.countries[0].id,
+                     posted_date=self.bidcycles[latest].cycle_start_date, create_date=self.today - timedelta(days=730),
+                     update_date=self.date_between(self.today - timedelta(days=365), self.today), _create_id=self.PREFIX)
+            for i, (grade, skill, post, organization, latest) in enumerate(zip(grades, skills, posts, organizations, latest_cycles))
+        ))
+
+        def cycle_positions():
+            for position, latest in zip(self.positions, latest_cycles):
+                for index in range(latest - cycles_per_position + 1, latest + 1):
+                    status_code, status = self.weighted([("OP", "Open"), ("HS", "Handshake"), ("FP", "Filled")], [80, 12, 8], 1)[0]
+                    yield CyclePosition(position=position, bidcycle=self.bidcycles[index], status_code=status_code, status=status,
+                                        posted_date=self.bidcycles[index].cycle_start_date, created=self.bidcycles[index].cycle_start_date,
+                                        updated=self.today, ted=self.bidcycles[index].cycle_end_date + timedelta(days=365))
+        self.cycle_positions = self.bulk_create(CyclePosition, cycle_positions())
+
+        self.bulk_create(BidCycle.positions.through, (
+            BidCycle.positions.through(bidcycle_id=x.bidcycle_id, position_id=x.position_id) for x in self.cycle_positions
+        ), keep=False)
+
+    def generate_assignments(self):
+        # Most positions have an incumbent
+        assigned = self.random.sample(self.positions, int(len(self.positions) * 0.7))
+        users = self.random.choices(self.profiles, k=len(assigned))
+        self.bulk_create(Assignment, (
+            Assignment(position=position, user=user, tour_of_duty=position.post.tour_of_duty, status=Assignment.Status.active,
+                       start_date=self.date_between(self.today - timedelta(days=730), self.today))
+            for position, user in zip(assigned, users)
+        ), keep=False)
+
+        # Each position has at most one assignment, so link it as the current assignment in one statement
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                UPDATE {Position._meta.db_table} AS p SET current_assignment_id = a.id
+                FROM {Assignment._meta.db_table} AS a
+                WHERE a.position_id = p.id AND p._create_id = %s
+            ''', [self.PREFIX])
+
+    def generate_bids(self):
+        count = self.counts["bids"]
+        # Bidders bid on popular positions, in the active cycles
+        active_cycle_positions = [x for x in self.cycle_positions if self.bidcycles[-1].id == x.bidcycle_id or self.bidcycles[-2].id == x.bidcycle_id]
+        self.random.shuffle(active_cycle_positions)
+        cycle_positions = self.zipf(active_cycle_positions, count)
+        users = self.zipf(self.profiles, count)
+        statuses = self.weighted([x[0] for x in self.BID_STATUSES], [x[1] for x in self.BID_STATUSES], count)
+
+        def bids():
+            for cycle_position, user, status in zip(cycle_positions, users, statuses):
+                bid = Bid(position=cycle_position, bidcycle_id=cycle_position.bidcycle_id, user=user, status=status)
+                if status != Bid.Status.draft:
+                    bid.submitted_date = self.date_between(self.today - timedelta(days=90), self.today)
+                    if status != Bid.Status.submitted:
+                        setattr(bid, f"{status}_date", bid.submitted_date + timedelta(days=self.random.randint(1, 30)))
+                yield bid
+        self.bulk_create(Bid, bids(), keep=False)
+
+    def generate_notifications(self):
+        count = self.counts["notifications"]
+        owners = self.zipf(self.profiles, count)
+        tags = self.weighted(self.NOTIFICATION_TAGS, [40, 20, 10, 10, 15, 5], count)
+        self.bulk_create(Notification, (
+            Notification(owner=owner, message=f"Notification {i}", tags=tag, is_read=self.random.random() < 0.7)
+            for i, (owner, tag) in enumerate(zip(owners, tags))
+        ), keep=False)
+
+    def generate_history(self):
+        '''
+        Generates historical records of positions, as if each had been edited since its creation
+        '''
+        model = Position.history.model
+        historical_fields = {x.attname for x in model._meta.concrete_fields}
+        fields = [x.attname for x in Position._meta.concrete_fields if x.attname in historical_fields]
+        positions = self.zipf(self.positions, self.counts["history"])
+
+        def records():
+            for position in positions:
+                record = model(**{x: getattr(position, x) for x in fields})
+                record.history_type = "~"
+                record.history_date = self.date_between(position.create_date, self.today)
+                yield record
+        self.bulk_create(model, records(), keep=False)
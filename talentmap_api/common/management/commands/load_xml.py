@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 import logging
 import re
 
+from talentmap_api.common.cache.generations import bump_model_generation
 from talentmap_api.common.xml_helpers import XMLloader, strip_extra_spaces, parse_boolean, parse_date, get_nested_tag
 from talentmap_api.language.models import Language, Proficiency
 from talentmap_api.position.models import Grade, Skill, Position, CapsuleDescription, SkillCone
@@ -266,6 +267,7 @@ def mode_location():
         # Connect new locations to applicable posts
         for loc in Location.objects.filter(id__in=new_ids + updated_ids):
             Post.objects.filter(_location_code=loc.code).update(location=loc)
+        bump_model_generation(Post)
 
     return (model, instance_tag, tag_map, collision_field, post_load_function)
 
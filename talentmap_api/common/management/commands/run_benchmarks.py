@@ -0,0 +1,304 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+import json
+import logging
+import math
+import os
+import time
+
+from rest_framework.test import APIClient
+
+from talentmap_api.common.cache.generations import bump_generation, get_project_tables
+from talentmap_api.bidding.models import Bid, CyclePosition
+from talentmap_api.integrations.models import SynchronizationJob
+from talentmap_api.messaging.models import Notification
+from talentmap_api.position.models import Position, Grade, Skill
+from talentmap_api.user_profile.models import UserProfile, SavedSearch
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'talentmap_api', 'data', 'benchmarks', 'baseline.json')
+
+
+class Rollback(Exception):
+    '''
+    Raised to roll back the changes made by a benchmark iteration
+    '''
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the API end-to-end, in process, against the synthetic dataset (see generate_synthetic_data)'
+    logger = logging.getLogger(__name__)
+
+    # Endpoint benchmarks; name, bench user, path. Paths are formatted with the values of get_context
+    ENDPOINTS = [
+        ("position_list", "bench_bidder", "/api/v1/position/"),
+        ("position_filter_grade_skill", "bench_bidder", "/api/v1/position/?grade__code__in={grades}&skill__code__in={skills}"),
+        ("position_filter_overseas", "bench_bidder", "/api/v1/position/?is_domestic=false&grade__code={grade}&ordering=-posted_date"),
+        ("position_search", "bench_bidder", "/api/v1/position/?q=officer"),
+        ("position_search_filtered", "bench_bidder", "/api/v1/position/?q=political&grade__code__in={grades}"),
+        ("position_ordering_related", "bench_bidder", "/api/v1/position/?ordering=post__location__city"),
+        ("position_retrieve", "bench_bidder", "/api/v1/position/{position}/"),
+        ("cycleposition_list", "bench_bidder", "/api/v1/cycleposition/"),
+        ("cycleposition_filter", "bench_bidder", "/api/v1/cycleposition/?position__grade__code__in={grades}&ordering=-posted_date"),
+        ("cycleposition_retrieve", "bench_bidder", "/api/v1/cycleposition/{cycle_position}/"),
+        ("bidlist", "bench_bidder", "/api/v1/bidlist/"),
+        ("notification_list", "bench_bidder", "/api/v1/notification/"),
+        ("notification_unread", "bench_bidder", "/api/v1/notification/?is_read=false"),
+        ("client_list", "bench_cdo", "/api/v1/client/"),
+        ("client_statistics", "bench_cdo", "/api/v1/client/statistics/"),
+        ("client_retrieve", "bench_cdo", "/api/v1/client/{client}/"),
+        ("client_bids", "bench_cdo", "/api/v1/client/{client}/bids/"),
+        ("client_prepanel", "bench_cdo", "/api/v1/client/{client}/bids/{client_bid}/prepanel/"),
+    ]
+
+    # Saved searches recounted by the saved search benchmark; endpoint, filters
+    SAVED_SEARCHES = [
+        ("/api/v1/position/", {"grade__code__in": ["{grades}"]}),
+        ("/api/v1/position/", {"skill__code__in": ["{skills}"]}),
+        ("/api/v1/position/", {"q": ["officer"]}),
+        ("/api/v1/position/", {"is_domestic": ["false"], "grade__code": ["{grade}"]}),
+        ("/api/v1/cycleposition/", {"position__grade__code__in": ["{grades}"]}),
+        ("/api/v1/cycleposition/", {"position__skill__code__in": ["{skills}"]}),
+    ] * 5
+
+    # Models synchronized by the synchronization loader benchmarks, using the test SOAP data
+    SYNCHRONIZATION_MODELS = [
+        "position.Skill",
+        "position.Grade",
+        "organization.Country",
+        "organization.Post",
+        "position.Position",
+        "bidding.BidCycle",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, dest='iterations', default=10, help='The number of timed iterations per benchmark')
+        parser.add_argument('--warm', dest='warm', action='store_true', help='Time requests with warm caches; by default, caches are invalidated before each request')
+        parser.add_argument('--only', nargs='+', dest='only', help='Only run the named benchmarks')
+        parser.add_argument('--output', nargs='?', dest='output', help='The file to write the JSON results to')
+        parser.add_argument('--compare', nargs='?', dest='compare', const=DEFAULT_BASELINE, help='Compares the results to a baseline JSON file (by default, the committed baseline)')
+        parser.add_argument('--threshold', type=float, dest='threshold', default=0.2, help='The fractional median slowdown which is a regression')
+        parser.add_argument('--min-delta', type=float, dest='min_delta', default=5.0, help='The smallest median slowdown, in ms, which is a regression')
+
+    def handle(self, *args, **options):
+        self.iterations = max(1, options['iterations'])
+        self.warm = options['warm']
+
+        baseline = None
+        if options['compare']:
+            baseline = self.load_results(options['compare'])
+
+        if not User.objects.filter(username="bench_bidder").exists():
+            raise CommandError("No synthetic dataset found; run generate_synthetic_data first")
+
+        self.context = self.get_context()
+        benchmarks = self.get_benchmarks()
+        if options['only']:
+            unknown = set(options['only']) - set(benchmarks)
+            if unknown:
+                raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+            benchmarks = {name: benchmarks[name] for name in options['only']}
+
+        results = {}
+        # The test client's host must be allowed
+        with override_settings(ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + ["testserver"]):
+            for name, (setup, run) in benchmarks.items():
+                results[name] = self.run_benchmark(setup, run)
+                self.logger.info(f"{name}: {self.format_result(results[name])}")
+
+        report = {
+            "date": timezone.now().isoformat(),
+            "iterations": self.iterations,
+            "warm": self.warm,
+            "dataset": self.get_dataset_size(),
+            "results": results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, sort_keys=True)
+            self.logger.info(f"Wrote results to {options['output']}")
+
+        if baseline is not None:
+            regressions = self.compare(report, baseline, options['threshold'], options['min_delta'])
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+
+    def load_results(self, path):
+        try:
+            with open(path) as baseline:
+                results = json.load(baseline)
+        except (IOError, ValueError) as e:
+            raise CommandError(f"Could not load the baseline {path}: {e}")
+
+        # An empty baseline would pass every comparison
+        if not results.get("results"):
+            raise CommandError(f"The baseline {path} has no results; record one with generate_synthetic_data --scale 1 --seed 1 "
+                               f"followed by run_benchmarks --output {path}")
+        return results
+
+    def get_context(self):
+        '''
+        Returns the identifiers of the synthetic data substituted into the benchmarked paths
+        '''
+        cdo = UserProfile.objects.get(user__username="bench_cdo")
+        client_bid = Bid.objects.filter(user__cdo=cdo).exclude(status=Bid.Status.draft).order_by("id").first()
+        if client_bid is None:
+            raise CommandError("The bench CDO has no clients with bids; regenerate the synthetic dataset at a larger scale")
+
+        # The most common synthetic grades and skills
+        grades = list(Grade.objects.filter(code__in=["SYN03", "SYN04", "SYN05"]).values_list("code", flat=True))
+        skills = list(Skill.objects.filter(code__startswith="SYN").order_by("id").values_list("code", flat=True)[:3])
+
+        return {
+            "grades": ",".join(grades),
+            "grade": grades[0],
+            "skills": ",".join(skills),
+            "position": Position.objects.filter(_create_id="SYN").order_by("id").values_list("id", flat=True).first(),
+            "cycle_position": CyclePosition.objects.filter(bidcycle__active=True).order_by("id").values_list("id", flat=True).first(),
+            "client": client_bid.user_id,
+            "client_bid": client_bid.id,
+        }
+
+    def get_dataset_size(self):
+        return {
+            "positions": Position.objects.count(),
+            "cycle_positions": CyclePosition.objects.count(),
+            "users": UserProfile.objects.count(),
+            "bids": Bid.objects.count(),
+            "notifications": Notification.objects.count(),
+        }
+
+    def get_benchmarks(self):
+        '''
+        Returns the benchmarks, by name, as a (setup, run) pair. The setup returns the argument
+        of run, and is not timed.
+        '''
+        benchmarks = {}
+        for name, username, path in self.ENDPOINTS:
+            benchmarks[name] = (self.endpoint_setup(username), self.endpoint_run(path.format(**self.context)))
+
+        benchmarks["saved_search_recount"] = (self.saved_search_setup, lambda _: SavedSearch.update_counts_for_endpoint())
+
+        for model in self.SYNCHRONIZATION_MODELS:
+            name = f"synchronize_{model.split('.')[1].lower()}"
+            benchmarks[name] = (self.synchronization_setup(model), lambda job: job.synchronize(test=True))
+
+        return benchmarks
+
+    def endpoint_setup(self, username):
+        def setup():
+            client = APIClient()
+            client.force_authenticate(User.objects.get(username=username))
+            return client
+        return setup
+
+    def endpoint_run(self, path):
+        def run(client):
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f"{path} responded {response.status_code}")
+            return len(response.content)
+        return run
+
+    def saved_search_setup(self):
+        owner = UserProfile.objects.get(user__username="bench_bidder")
+        SavedSearch.objects.bulk_create([
+            SavedSearch(owner=owner, name=f"Benchmark {i}", endpoint=endpoint,
+                        filters={key: [x.format(**self.context) for x in value] for key, value in filters.items()})
+            for i, (endpoint, filters) in enumerate(self.SAVED_SEARCHES)
+        ])
+
+    def synchronization_setup(self, model):
+        def setup():
+            return SynchronizationJob.objects.update_or_create(talentmap_model=model, defaults={"use_last_date_updated": False, "running": False})[0]
+        return setup
+
+    def run_benchmark(self, setup, run):
+        '''
+        Runs a benchmark once untimed, to warm up, then for the configured number of timed iterations.
+        Each iteration is run in a transaction which is rolled back, so that iterations are alike.
+
+        Returns:
+            - dict - The timings in milliseconds, and the queries and response size of the last iteration
+        '''
+        durations = []
+        state = {}
+        for i in range(self.iterations + 1):
+            if not self.warm:
+                bump_generation(*get_project_tables())
+
+            try:
+                with transaction.atomic():
+                    argument = setup()
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        size = run(argument)
+                        duration = time.perf_counter() - start
+                    state = {"queries": len(queries), "size": size}
+                    raise Rollback()
+            except Rollback:
+                pass
+
+            if i > 0:
+                durations.append(duration * 1000)
+
+        durations.sort()
+        result = {
+            "min_ms": durations[0],
+            "median_ms": self.percentile(durations, 50),
+            "p95_ms": self.percentile(durations, 95),
+            "mean_ms": sum(durations) / len(durations),
+            "queries": state["queries"],
+        }
+        if isinstance(state["size"], int):
+            result["size"] = state["size"]
+        return result
+
+    @staticmethod
+    def percentile(values, percent):
+        '''
+        Returns the nearest-rank percentile of the sorted values
+        '''
+        return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+    def format_result(self, result):
+        return f"median {result['median_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, {result['queries']} queries"
+
+    def compare(self, report, baseline, threshold, min_delta):
+        '''
+        Compares results to the baseline. A benchmark regresses when its median is slower than the
+        baseline's by both the threshold fraction and the minimum delta, or it makes more queries.
+
+        Returns:
+            - list - The names of the regressed benchmarks
+        '''
+        baseline_results = baseline.get("results", {})
+        if baseline.get("dataset") and baseline["dataset"] != report["dataset"]:
+            self.logger.warning(f"The dataset differs from the baseline's, timings may not be comparable: {baseline.get('dataset')}")
+
+        regressions = []
+        for name, result in sorted(report["results"].items()):
+            previous = baseline_results.get(name, None)
+            if previous is None:
+                self.logger.info(f"{name}: no baseline")
+                continue
+
+            delta = result["median_ms"] - previous["median_ms"]
+            ratio = result["median_ms"] / previous["median_ms"] if previous["median_ms"] else math.inf
+            slower = delta > min_delta and ratio > 1 + threshold
+            more_queries = result["queries"] > previous["queries"]
+
+            summary = f"{name}: {previous['median_ms']:.1f} -> {result['median_ms']:.1f} ms ({ratio - 1:+.0%}), {previous['queries']} -> {result['queries']} queries"
+            if slower or more_queries:
+                regressions.append(name)
+                self.logger.error(f"REGRESSION {summary}")
+            else:
+                self.logger.info(summary)
+
+        return regressions
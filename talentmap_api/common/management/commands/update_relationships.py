@@ -3,8 +3,9 @@ from django.core.management.base import BaseCommand
 import logging
 
 from talentmap_api.bidding.models import BidCycle
-from talentmap_api.position.models import Position, Grade, SkillCone
+from talentmap_api.position.models import Position, Grade, SkillCone, similar_position_updates, update_similar_positions
 from talentmap_api.organization.models import Organization, OrganizationGroup, Post, Location
+from talentmap_api.common.search import get_search_document_models, update_search_documents
 
 
 class Command(BaseCommand):
@@ -26,9 +27,20 @@ class Command(BaseCommand):
         ]
 
     def handle(self, *args, **options):
-        for model in self.models:
-            self.logger.info(f"Updating model: {model.__name__}")
-            for instance in model.objects.all():
-                instance.update_relationships()
+        with similar_position_updates.deferred():
+            for model in self.models:
+                self.logger.info(f"Updating model: {model.__name__}")
+                for instance in model.objects.all():
+                    instance.update_relationships()
+
+            # Relationships make up search documents, so refresh all documents once they are set
+            for model in get_search_document_models():
+                self.logger.info(f"Updating search documents: {model.__name__}")
+                update_search_documents(model.objects.all())
+
+            # Likewise similar positions; all are recomputed, so those requested along the way needn't be
+            self.logger.info("Updating similar positions")
+            similar_position_updates.clear()
+            update_similar_positions()
 
         self.logger.info("Updated relationships")
@@ -0,0 +1,165 @@
+'''
+Per-endpoint performance metrics, recorded with prometheus_client and exposed at /metrics.
+
+When served by several worker processes (e.g. gunicorn), set the prometheus_multiproc_dir
+environment variable to an empty directory writable by the workers; each worker then writes its
+metrics there, and /metrics aggregates those of all workers (see gunicorn_config.py). Otherwise,
+metrics are held in memory by each process. All labels are bounded; the route (the view class and
+action, never the path), the request method and the status code.
+'''
+import os
+import threading
+import time
+
+from functools import wraps
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Queries per request
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_LABELS = ("route", "method", "status")
+
+# The environment variable naming the directory shared by the worker processes
+MULTIPROCESS_DIRECTORY_VARIABLE = "prometheus_multiproc_dir"
+
+# The metrics of the request being handled by the current thread
+_state = threading.local()
+
+registry = CollectorRegistry()
+
+REQUEST_DURATION = Histogram(
+    "talentmap_request_duration_seconds", "Request latency", REQUEST_LABELS, buckets=LATENCY_BUCKETS, registry=registry)
+REQUEST_SQL_QUERIES = Histogram(
+    "talentmap_request_sql_queries", "SQL queries executed per request", REQUEST_LABELS, buckets=QUERY_BUCKETS, registry=registry)
+REQUEST_DB_DURATION = Histogram(
+    "talentmap_request_db_duration_seconds", "Time spent executing SQL per request", REQUEST_LABELS, buckets=LATENCY_BUCKETS, registry=registry)
+REQUEST_SERIALIZER_DURATION = Histogram(
+    "talentmap_request_serializer_duration_seconds", "Time spent serializing per request", REQUEST_LABELS, buckets=LATENCY_BUCKETS, registry=registry)
+RESPONSE_SIZE = Histogram(
+    "talentmap_response_size_bytes", "Response body size, excluding streamed responses", REQUEST_LABELS, buckets=SIZE_BUCKETS, registry=registry)
+CACHE_LOOKUPS = Counter(
+    "talentmap_cache_lookups_total", "Cache lookups by result (hit or miss); the hit ratio is hits over all lookups",
+    ("route", "method", "result"), registry=registry)
+
+
+def get_registry():
+    '''
+    Returns the registry to expose; the metrics of all worker processes in multiprocess mode,
+    otherwise those of this process
+    '''
+    if os.environ.get(MULTIPROCESS_DIRECTORY_VARIABLE):
+        multiprocess_registry = CollectorRegistry()
+        MultiProcessCollector(multiprocess_registry)
+        return multiprocess_registry
+    return registry
+
+
+class RequestMetrics(object):
+    '''
+    The metrics gathered while handling a single request
+    '''
+
+    def __init__(self):
+        self.sql_queries = 0
+        self.db_duration = 0.0
+        self.serializer_duration = 0.0
+        self.serializing = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def get_request_metrics():
+    '''
+    Returns the metrics of the request being handled by the current thread, if any
+    '''
+    return getattr(_state, "current", None)
+
+
+def start_request():
+    _state.current = RequestMetrics()
+    return _state.current
+
+
+def finish_request():
+    current = get_request_metrics()
+    _state.current = None
+    return current
+
+
+def record_request(current, route, method, status, duration, size=None):
+    '''
+    Records the metrics of a handled request
+
+    Args:
+        - current (RequestMetrics) - The metrics gathered while handling the request
+        - route (str) - The route name, i.e. the view and action
+        - method (str) - The request method
+        - status (int) - The response status code
+        - duration (float) - The request latency, in seconds
+        - size (int) - The response body size in bytes, if known
+    '''
+    labels = {"route": route, "method": method, "status": status}
+    REQUEST_DURATION.labels(**labels).observe(duration)
+    REQUEST_SQL_QUERIES.labels(**labels).observe(current.sql_queries)
+    REQUEST_DB_DURATION.labels(**labels).observe(current.db_duration)
+    REQUEST_SERIALIZER_DURATION.labels(**labels).observe(current.serializer_duration)
+    if size is not None:
+        RESPONSE_SIZE.labels(**labels).observe(size)
+    if current.cache_hits:
+        CACHE_LOOKUPS.labels(route=route, method=method, result="hit").inc(current.cache_hits)
+    if current.cache_misses:
+        CACHE_LOOKUPS.labels(route=route, method=method, result="miss").inc(current.cache_misses)
+
+
+def record_cache_lookup(hit):
+    current = get_request_metrics()
+    if current is None:
+        return
+    if hit:
+        current.cache_hits += 1
+    else:
+        current.cache_misses += 1
+
+
+def sql_execute_wrapper(execute, sql, params, many, context):
+    '''
+    A database execute wrapper (see connection.execute_wrapper) counting and timing queries
+    '''
+    current = get_request_metrics()
+    if current is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        current.sql_queries += 1
+        current.db_duration += time.perf_counter() - start
+
+
+def timed_serialization(to_representation):
+    '''
+    Decorates a serializer's to_representation, recording the time spent in the outermost call;
+    nested serializers are part of their parent's time
+    '''
+    @wraps(to_representation)
+    def wrapper(self, instance):
+        current = get_request_metrics()
+        if current is None or current.serializing:
+            return to_representation(self, instance)
+
+        current.serializing = True
+        start = time.perf_counter()
+        try:
+            return to_representation(self, instance)
+        finally:
+            current.serializing = False
+            current.serializer_duration += time.perf_counter() - start
+
+    return wrapper
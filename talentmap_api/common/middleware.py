@@ -1,8 +1,19 @@
+import time
+
+from contextlib import ExitStack
+
+from django.db import connections
+
+from talentmap_api.common import metrics
+
 
 class IE11Middleware:
     '''
     Informs the  browser not to use browser-side caching for API responses.
     This resolves an issue where the front end was unable to retrieve fresh data.
+
+    Responses with validators (ETag or Last-Modified) may be stored, but are always
+    revalidated, so that conditional requests can be answered with 304 Not Modified.
     '''
 
     def __init__(self, get_response):
@@ -10,5 +21,56 @@ class IE11Middleware:
 
     def __call__(self, request):
         response = self.get_response(request)
-        response['Cache-Control'] = "no-cache,no-store"
+        if response.has_header('ETag') or response.has_header('Last-Modified'):
+            # The browser may store the response, but must revalidate it on every use
+            response['Cache-Control'] = "no-cache"
+        else:
+            response['Cache-Control'] = "no-cache,no-store"
+        return response
+
+
+class MetricsMiddleware:
+    '''
+    Records per-endpoint performance metrics (see talentmap_api.common.metrics); latency, SQL
+    query count and time, serialization time, response size and cache lookups.
+
+    Requests are labelled by route, the name of the resolved view and action (e.g. PositionListView.list),
+    rather than the path, so that the number of label values stays bounded. This should be the
+    first middleware, so that the latency includes all other middleware.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.metrics_route = "unresolved"
+        current = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.sql_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            metrics.finish_request()
+
+        # Streamed responses are measured up to their first byte
+        size = None if response.streaming else len(response.content)
+        metrics.record_request(current, request.metrics_route, request.method, response.status_code,
+                               time.perf_counter() - start, size)
         return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_route = self.get_route(request, view_func)
+
+    def get_route(self, request, view_func):
+        '''
+        Returns the route name of the view, in the form ViewClass.action
+        '''
+        view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+        if view_class is None:
+            return getattr(view_func, "__name__", "unknown")
+
+        actions = getattr(view_func, "actions", None) or {}
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f"{view_class.__name__}.{action}"
@@ -1,3 +1,36 @@
+from itertools import islice
+
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+
+from rest_framework import mixins
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from talentmap_api.common.renderers import StreamingJSONRenderer, StreamingCSVRenderer
+
+
+def get_related_lookups(queryset):
+    '''
+    Returns the select_related and prefetch_related lookups of a queryset
+
+    Args:
+        - queryset (QuerySet) - The queryset
+
+    Returns:
+        - tuple - The list of select_related lookups, and the list of prefetch_related lookups
+    '''
+    def flatten(related, prefix=""):
+        lookups = []
+        for name, children in related.items():
+            lookups += flatten(children, f"{prefix}{name}{LOOKUP_SEP}") or [f"{prefix}{name}"]
+        return lookups
+
+    select_related = queryset.query.select_related
+    return flatten(select_related) if isinstance(select_related, dict) else [], list(queryset._prefetch_related_lookups)
+
+
 class ActionDependentSerializerMixin(object):
     '''
     Supports differentiating serializers across actions
@@ -12,19 +45,192 @@ class FieldLimitableSerializerMixin(object):
     Supports limiting the return fields via the specified include and exclude
     query parameters from a request by passing the data into the serializer via
     the serializer context. Only works with PrefetchedSerializer descendants
+
+    Named field presets of the serializer may be selected via the fields query parameter,
+    e.g. ?fields=card
+
+    The queryset's prefetching is also limited to the relationships of the effective
+    field set, so that slim requests issue slim SQL. For read requests, unneeded
+    columns are deferred.
     '''
 
-    def get_serializer_context(self):
-        context = super(FieldLimitableSerializerMixin, self).get_serializer_context()
+    include_param_name = "include"
+    exclude_param_name = "exclude"
+    preset_param_name = "fields"
+
+    def get_field_overrides(self):
+        '''
+        Returns the included and excluded fields specified by the request's query params
 
-        include_param_name = "include"
-        exclude_param_name = "exclude"
+        Returns:
+            - tuple - The list of included fields, and the list of excluded fields
+        '''
+        override_fields = []
+        override_exclude = []
 
+        # Check query params for "fields", which is a named preset of the serializer
+        if self.preset_param_name in self.request.query_params:
+            serializer_class = self.get_serializer_class()
+            if hasattr(serializer_class, "get_field_preset"):
+                override_fields, override_exclude = serializer_class.get_field_preset(self.request.query_params.get(self.preset_param_name))
         # Check query params for "include", which are included fields
-        if include_param_name in self.request.query_params:
-            context = {**context, "override_fields": self.request.query_params.get(include_param_name).split(',')}
+        if self.include_param_name in self.request.query_params:
+            override_fields = override_fields + self.request.query_params.get(self.include_param_name).split(',')
         # Check query params for "exclude", which are excluded fields
-        if exclude_param_name in self.request.query_params:
-            context = {**context, "override_exclude": self.request.query_params.get(exclude_param_name).split(',')}
+        if self.exclude_param_name in self.request.query_params:
+            override_exclude = override_exclude + self.request.query_params.get(self.exclude_param_name).split(',')
+
+        return override_fields, override_exclude
+
+    def get_serializer_context(self):
+        context = super(FieldLimitableSerializerMixin, self).get_serializer_context()
+
+        override_fields, override_exclude = self.get_field_overrides()
+
+        if override_fields:
+            context = {**context, "override_fields": override_fields}
+        if override_exclude:
+            context = {**context, "override_exclude": override_exclude}
 
         return context
+
+    def filter_queryset(self, queryset):
+        queryset = super(FieldLimitableSerializerMixin, self).filter_queryset(queryset)
+
+        # Replace the serializer's prefetching with the prefetch plan of the effective field set,
+        # keeping the relations the view joins or prefetches itself
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "prefetch_model") and hasattr(queryset, "select_related"):
+            override_fields, override_exclude = self.get_field_overrides()
+            planned = {lookup for _, lookup in serializer_class.get_prefetch_plan(queryset.model)}
+            select_related, prefetch_related = get_related_lookups(queryset)
+
+            queryset = queryset.select_related(None).prefetch_related(None)
+            queryset = serializer_class.prefetch_model(queryset.model, queryset, override_fields, override_exclude)
+
+            select_related = [x for x in select_related if x not in planned]
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            prefetch_related = [x for x in prefetch_related if getattr(x, "prefetch_to", x) not in planned]
+            if prefetch_related:
+                queryset = queryset.prefetch_related(*prefetch_related)
+
+            # Only project read requests, so that writes always operate upon complete instances
+            if self.request.method in SAFE_METHODS:
+                queryset = queryset.defer(*serializer_class.get_deferred_fields(queryset.model, override_fields, override_exclude))
+
+        return queryset
+
+
+class StreamingListModelMixin(mixins.ListModelMixin):
+    '''
+    Supports streaming list responses via the stream query parameter, e.g. ?stream=true
+
+    The page is fetched and serialized in chunks, and written incrementally as JSON, so
+    memory does not grow with the page size. The page envelope is unchanged.
+
+    Also supports exporting the entire filtered list as CSV via ?format=csv&export=all,
+    which streams every row in chunks, regardless of pagination.
+    '''
+
+    stream_param_name = "stream"
+    export_param_name = "export"
+    stream_chunk_size = 100
+
+    def list(self, request, *args, **kwargs):
+        if self.is_export_request(request):
+            return self.export_list(request, *args, **kwargs)
+        if self.is_streaming_request(request):
+            return self.stream_list(request, *args, **kwargs)
+
+        return self.list_page(self.get_filtered_queryset())
+
+    def get_filtered_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def list_page(self, queryset):
+        '''
+        Returns the standard list response for the filtered queryset, as ListModelMixin.list does
+        '''
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def is_streaming_request(self, request):
+        return request.query_params.get(self.stream_param_name, "").lower() in ["true", "1"]
+
+    def is_export_request(self, request):
+        return request.query_params.get(self.export_param_name, "") == "all" and getattr(request.accepted_renderer, "format", None) == "csv"
+
+    def stream_list(self, request, *args, **kwargs):
+        queryset = self.get_filtered_queryset()
+
+        envelope = None
+        rows = queryset
+        if self.paginator is not None:
+            if not hasattr(self.paginator, "get_page"):
+                # We can't paginate lazily, so fall back to the standard list response
+                return self.list_page(queryset)
+
+            page = self.paginator.get_page(queryset, request, view=self)
+            if page is not None:
+                rows = page
+                envelope = self.paginator.get_page_envelope()
+
+        if isinstance(rows, QuerySet):
+            rows = rows.values_list("pk", flat=True)
+        else:
+            # The rows have already been evaluated, so serialize them directly
+            queryset = rows
+
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(renderer.render_stream(self.serialize_in_chunks(queryset, rows), envelope),
+                                     content_type=renderer.media_type)
+
+    def export_list(self, request, *args, **kwargs):
+        queryset = self.get_filtered_queryset()
+
+        rows = queryset
+        if isinstance(queryset, QuerySet):
+            # Walk the primary keys with a server side cursor, so we never hold the entire list
+            rows = queryset.values_list("pk", flat=True).iterator()
+            filename = queryset.model._meta.model_name
+        else:
+            filename = "export"
+
+        renderer = StreamingCSVRenderer()
+        header = renderer.get_header(self.get_serializer())
+
+        response = StreamingHttpResponse(renderer.render_stream(self.serialize_in_chunks(queryset, rows), header),
+                                         content_type=f"{renderer.media_type}; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+        return response
+
+    def serialize_in_chunks(self, queryset, rows):
+        '''
+        Serializes the rows chunk by chunk. For querysets, the rows are primary keys, and each
+        chunk is fetched from the full queryset, so that every chunk benefits from the queryset's
+        prefetching (which QuerySet.iterator() would ignore)
+
+        Args:
+            - queryset (QuerySet) - The filtered and prefetched queryset
+            - rows (iterable) - The primary keys to serialize, or the objects when the queryset is not a QuerySet
+
+        Returns:
+            - generator - The serialized rows
+        '''
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                break
+
+            if isinstance(queryset, QuerySet):
+                instances = {x.pk: x for x in queryset.filter(pk__in=chunk)}
+                chunk = [instances[pk] for pk in chunk if pk in instances]
+
+            yield from self.get_serializer(chunk, many=True).data
@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from talentmap_api.common.cache.generations import bump_model_generation
 
 
 class StaticRepresentationModel(models.Model):
@@ -8,9 +12,93 @@ class StaticRepresentationModel(models.Model):
     '''
     _string_representation = models.TextField(null=True, blank=True, help_text="The string representation of this object")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(StaticRepresentationModel, cls).from_db(db, field_names, values)
+        # Note the values as loaded, so signal listeners can tell what a save changes without a query
+        instance._saved_values = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         self._string_representation = str(self)
         super(StaticRepresentationModel, self).save(*args, **kwargs)
+        self.note_saved_values(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super(StaticRepresentationModel, self).refresh_from_db(using, fields)
+        self.note_saved_values(fields)
+
+    def note_saved_values(self, fields=None):
+        '''
+        Notes the current values of the specified fields, or all loaded fields, as those in the database
+        '''
+        fields = [self._meta.get_field(x) for x in fields] if fields is not None else self._meta.concrete_fields
+        saved_values = getattr(self, "_saved_values", {})
+        # Deferred fields which were never loaded are left out
+        saved_values.update({x.attname: self.__dict__[x.attname] for x in fields if x.attname in self.__dict__})
+        self._saved_values = saved_values
+
+    def get_saved_values(self, *fields):
+        '''
+        Returns the values of the specified fields as they are in the database, before the pending save
+
+        Args:
+            - fields (str) - The attribute names of the fields, e.g. "skill_id"
+
+        Returns:
+            - tuple - The values of the fields, or None if the instance isn't in the database
+        '''
+        saved_values = getattr(self, "_saved_values", {})
+        if all(x in saved_values for x in fields):
+            return tuple(saved_values[x] for x in fields)
+        if self.pk is None:
+            return None
+        # The instance wasn't loaded from the database, or some of the fields were deferred
+        return type(self).objects.filter(pk=self.pk).values_list(*fields).first()
 
     class Meta:
         abstract = True
+
+
+@receiver(post_save, dispatch_uid="bump_generation_on_save")
+def bump_generation_on_save(sender, instance, created, update_fields=None, **kwargs):
+    '''
+    Invalidates cached data derived from a TalentMAP model's table when an instance is saved, and
+    from those of its tracked columns which the save changed
+    '''
+    if sender.__module__.startswith("talentmap_api"):
+        bump_model_generation(sender, fields=None if created else get_changed_fields(instance, update_fields))
+
+
+@receiver(post_delete, dispatch_uid="bump_generation_on_delete")
+def bump_generation_on_delete(sender, **kwargs):
+    '''
+    Invalidates cached data derived from a TalentMAP model's table when an instance is deleted
+    '''
+    if sender.__module__.startswith("talentmap_api"):
+        bump_model_generation(sender)
+
+
+def get_changed_fields(instance, update_fields=None):
+    '''
+    Returns the tracked fields (see column_generation_fields) which an instance's pending save changes.
+    Fields whose saved values weren't loaded are presumed changed.
+    '''
+    saved_values = getattr(instance, "_saved_values", {})
+    changed = []
+    for name in getattr(type(instance), "column_generation_fields", []):
+        attname = instance._meta.get_field(name).attname
+        if update_fields is not None and name not in update_fields and attname not in update_fields:
+            continue
+        if attname not in saved_values or saved_values[attname] != getattr(instance, attname):
+            changed.append(name)
+    return changed
+
+
+@receiver(m2m_changed, dispatch_uid="bump_generation_on_m2m_changed")
+def bump_generation_on_m2m_changed(sender, instance, action, model, **kwargs):
+    '''
+    Invalidates cached data derived from a TalentMAP many-to-many relationship when it changes
+    '''
+    if action.startswith("post_") and sender.__module__.startswith("talentmap_api"):
+        bump_model_generation(sender, type(instance), model)
@@ -1,7 +1,116 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+
+from talentmap_api.common.cache.generations import generations_available, get_generations, get_query_tables
+
+
+class CountCachingPaginator(Paginator):
+    '''
+    A paginator which caches the count of the queryset, keyed by its SQL and the current
+    generations of the tables it references, so that any change to those tables invalidates it.
+
+    When estimating, the query planner's row estimate is used in place of the exact count
+    if it is at least the estimate threshold, and count_is_estimate is set.
+
+    Counts are only cached while generations are tracked, as they'd otherwise never be invalidated.
+    '''
+
+    count_cache_prefix = "count"
+    count_cache_timeout = 86400  # 1 day
+    estimate_threshold = 10000
+
+    def __init__(self, *args, estimate=False, **kwargs):
+        super(CountCachingPaginator, self).__init__(*args, **kwargs)
+        self.estimate = estimate
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list)
+
+        sql, params = self.object_list.query.sql_with_params()
+
+        if self.estimate:
+            estimate = self.get_estimated_count(sql, params)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.count_is_estimate = True
+                return estimate
+
+        if not generations_available():
+            return self.object_list.count()
+
+        tables = get_query_tables(sql)
+        key_data = json.dumps([sql, params, sorted(get_generations(tables).items())], default=str)
+        key = f"{self.count_cache_prefix}:{hashlib.md5(key_data.encode('utf-8')).hexdigest()}"  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
+
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, self.count_cache_timeout)
+
+        return count
+
+    def get_estimated_count(self, sql, params):
+        '''
+        Returns the query planner's estimated row count of the SQL, or None if unavailable
+        '''
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class ControllableCursorPagination(CursorPagination):
+    '''
+    Keyset pagination, which seeks on the view's cursor_ordering rather than using an
+    OFFSET, and does not COUNT the queryset
+    '''
+
+    # Query parameter for the cursor, an empty cursor gives you the first page
+    cursor_query_param = "cursor"
+
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = "limit"
+
+    def get_ordering(self, request, queryset, view):
+        # The seek keys are fixed per endpoint, so the ordering query parameter is not supported here
+        ordering = view.cursor_ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def get_page_envelope(self):
+        return OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
 
 
 class ControllablePageNumberPagination(PageNumberPagination):
+    '''
+    Page number pagination, which delegates to cursor pagination when the cursor query
+    parameter is specified on views with a cursor_ordering, e.g. ?cursor=
+    '''
     # Query parameter for the page number
     page_query_param = "page"
 
@@ -14,3 +123,84 @@ class ControllablePageNumberPagination(PageNumberPagination):
 
     # Strings if used as the page number will give you the final page
     last_page_strings = ("last", "final", "end")
+
+    django_paginator_class = CountCachingPaginator
+
+    # Query parameter for the count mode, "estimate" allows an approximate count for large results
+    count_query_param = "count"
+
+    cursor_pagination_class = ControllableCursorPagination
+    cursor_paginator = None
+
+    def get_cursor_paginator(self, request, view=None):
+        '''
+        Returns a cursor paginator if the request is in cursor mode, otherwise None
+        '''
+        if getattr(view, "cursor_ordering", None) and self.cursor_pagination_class.cursor_query_param in request.query_params:
+            return self.cursor_pagination_class()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        object_list = self.get_page(queryset, request, view=view)
+        if object_list is None or self.cursor_paginator:
+            return object_list
+
+        if self.page.paginator.num_pages > 1 and self.template is not None:
+            # The browsable API will display pagination controls
+            self.display_page_controls = True
+
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return Response(OrderedDict([*self.get_page_envelope().items(), ('results', data)]))
+
+    def get_page(self, queryset, request, view=None):
+        '''
+        Paginates the queryset in the same manner as paginate_queryset, but returns the
+        page's object list without evaluating it, so that it may be iterated in chunks
+
+        Returns:
+            - QuerySet - The page's object list, or None if pagination is disabled
+        '''
+        self.cursor_paginator = self.get_cursor_paginator(request, view)
+        if self.cursor_paginator:
+            # Cursor pages are bounded by the page size, and must be evaluated to determine the next cursor
+            return self.cursor_paginator.paginate_queryset(queryset, request, view=view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size, estimate=self.is_estimate_request(request))
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        self.request = request
+        return self.page.object_list
+
+    def is_estimate_request(self, request):
+        return request.query_params.get(self.count_query_param, "") == "estimate"
+
+    def get_page_envelope(self):
+        '''
+        Returns the metadata of the current page, as rendered by get_paginated_response
+        '''
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_page_envelope()
+
+        envelope = OrderedDict([('count', self.page.paginator.count)])
+        if self.is_estimate_request(self.request):
+            # Whether the count is the query planner's estimate, rather than exact
+            envelope['count_is_estimate'] = self.page.paginator.count_is_estimate
+        envelope['next'] = self.get_next_link()
+        envelope['previous'] = self.get_previous_link()
+        return envelope
@@ -1,4 +1,9 @@
-from rest_framework.renderers import BrowsableAPIRenderer
+import csv
+import json
+
+from rest_framework import serializers
+from rest_framework.compat import SHORT_SEPARATORS
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from django.core.paginator import Page
 from rest_framework.request import override_method
 from django import forms
@@ -40,6 +45,111 @@ class PaginatedCSVRenderer (CSVRenderer):
         return super(PaginatedCSVRenderer, self).render(data, *args, **kwargs)
 
 
+class Echo(object):
+    '''
+    A file-like object which returns what is written to it, for use with csv.writer
+    '''
+
+    def write(self, value):
+        return value
+
+
+class StreamingCSVRenderer(PaginatedCSVRenderer):
+    '''
+    Renders rows incrementally as CSV, with headers derived from the serializer so that
+    the columns are stable regardless of the data. Nested serializers are flattened into
+    dotted column names (e.g. post.location), while lists and objects which can't be
+    flattened (e.g. many=True serializers) are written as JSON in a single cell.
+    '''
+
+    def get_header(self, serializer, prefix=""):
+        '''
+        Returns the flattened column names of the serializer's fields
+
+        Args:
+            - serializer (Serializer) - The serializer of a single row
+            - prefix (string) - The prefix of the column names, used for nested serializers
+
+        Returns:
+            - list - The column names
+        '''
+        header = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.Serializer):
+                header += self.get_header(field, f"{prefix}{name}.")
+            else:
+                header.append(f"{prefix}{name}")
+        return header
+
+    def get_cell(self, row, column):
+        value = row
+        for key in column.split("."):
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key, None)
+
+        if value is None:
+            return ""
+        elif isinstance(value, (list, dict)):
+            return json.dumps(value, cls=JSONRenderer.encoder_class)
+        return value
+
+    def render_stream(self, rows, header):
+        '''
+        Renders the rows as CSV
+
+        Args:
+            - rows (iterable) - The serialized rows
+            - header (list) - The column names, as returned by get_header
+
+        Returns:
+            - generator - The rendered CSV as bytes
+        '''
+        writer = csv.writer(Echo(), **(self.writer_opts or {}))
+
+        yield writer.writerow(header).encode("utf-8")
+        for row in rows:
+            yield writer.writerow([self.get_cell(row, column) for column in header]).encode("utf-8")
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    '''
+    Renders a list incrementally, one serialized row at a time, so that the full page
+    never needs to be held in memory as a single structure
+    '''
+    results_field = 'results'
+
+    def encode(self, data):
+        return json.dumps(data, cls=self.encoder_class, ensure_ascii=self.ensure_ascii,
+                          allow_nan=not self.strict, separators=SHORT_SEPARATORS).encode('utf-8')
+
+    def render_stream(self, rows, envelope=None):
+        '''
+        Renders the rows as a JSON array, wrapped in the page envelope if provided
+
+        Args:
+            - rows (iterable) - The serialized rows
+            - envelope (OrderedDict) - The page metadata, e.g. count, next and previous
+
+        Returns:
+            - generator - The rendered JSON as bytes
+        '''
+        if envelope is not None:
+            yield b'{'
+            for key, value in envelope.items():
+                yield self.encode(key) + b':' + self.encode(value) + b','
+            yield self.encode(self.results_field) + b':'
+
+        yield b'['
+        for index, row in enumerate(rows):
+            yield (b',' if index else b'') + self.encode(row)
+        yield b']'
+
+        if envelope is not None:
+            yield b'}'
+
+
 class BrowsableAPIRendererWithoutForms(BrowsableAPIRenderer):
     """Renders the browsable api, but excludes the HTML form."""
 
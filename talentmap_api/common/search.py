@@ -0,0 +1,84 @@
+'''
+Stored full text search documents.
+
+A model maintaining a stored search document declares a search_text TextField (indexed with
+gin_trgm_ops for substring matching) and a search_vector SearchVectorField (indexed with GIN),
+and the fields making up its document as search_document_fields, a list of (field path, weight)
+pairs. Field paths may span relationships, including many-to-many relationships.
+
+Documents are computed by the database, so any number of instances are updated in a single
+statement.
+'''
+from django.apps import apps
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce, Concat
+
+from talentmap_api.common.cache.generations import bump_model_generation
+
+# The stored search document fields, which are internal and never serialized
+SEARCH_DOCUMENT_FIELDS = ["search_text", "search_vector"]
+
+
+def get_field_text(model, path):
+    '''
+    Returns an expression for the text of the field path, relative to the instance being updated.
+    Related fields are aggregated in a subquery, as joins are not permitted in an update.
+    '''
+    if LOOKUP_SEP not in path:
+        return Coalesce(F(path), Value(''))
+
+    text = model._default_manager.filter(pk=OuterRef("pk")).order_by().values("pk").annotate(text=StringAgg(path, " ")).values("text")
+    return Coalesce(Subquery(text, output_field=TextField()), Value(''))
+
+
+def get_search_document(model, fields):
+    '''
+    Returns the updates which set the stored search document of a model's instances
+
+    Args:
+        - model (Model) - The model maintaining a stored search document
+        - fields (list) - The document's fields, as (field path, weight) pairs
+
+    Returns:
+        - dict - The search_text and search_vector update expressions
+    '''
+    texts = [Value(' ')] * (len(fields) * 2 - 1)
+    texts[::2] = [get_field_text(model, path) for path, _ in fields]
+
+    vector = None
+    for weight in sorted(set(x[1] for x in fields)):
+        weighted = SearchVector(*[get_field_text(model, path) for path, x in fields if x == weight], weight=weight)
+        vector = weighted if vector is None else vector + weighted
+
+    return {
+        "search_text": Concat(*texts, output_field=TextField()) if len(texts) > 1 else texts[0],
+        "search_vector": vector,
+    }
+
+
+def update_search_documents(queryset):
+    '''
+    Updates the stored search document of each instance in the queryset
+
+    Args:
+        - queryset (QuerySet) - The instances to update, of a model maintaining a stored search document
+
+    Returns:
+        - int - The number of instances updated
+    '''
+    model = queryset.model
+    document = get_search_document(model, model.search_document_fields)
+    count = queryset.update(**document)
+    if count:
+        bump_model_generation(model, fields=list(document))
+    return count
+
+
+def get_search_document_models():
+    '''
+    Returns all models maintaining a stored search document
+    '''
+    return [x for x in apps.get_models() if hasattr(x, "search_document_fields")]
@@ -1,9 +1,52 @@
+import copy
+
+from collections import OrderedDict
+from functools import lru_cache
 from pydoc import locate
 
 from rest_framework import serializers
 from django.db.models.constants import LOOKUP_SEP
 
+from talentmap_api.common.metrics import timed_serialization
 from talentmap_api.common.models import StaticRepresentationModel
+from talentmap_api.common.search import SEARCH_DOCUMENT_FIELDS
+
+
+# Cache of the model serializer fields built for each PrefetchedSerializer class
+_prototype_fields = {}
+
+
+@lru_cache(maxsize=1024)
+def _get_field_plan(serializer_class, override_fields, override_exclude):
+    return serializer_class.compile_field_plan(override_fields, override_exclude)
+
+
+@lru_cache(maxsize=1024)
+def _get_prefetch_plan(serializer_class, model, override_fields, override_exclude):
+    return serializer_class.compile_prefetch_plan(model, override_fields, override_exclude)
+
+
+@lru_cache(maxsize=1024)
+def _get_deferred_fields(serializer_class, model, override_fields, override_exclude):
+    return serializer_class.compile_deferred_fields(model, override_fields, override_exclude)
+
+
+class FieldPlan(object):
+    '''
+    A compiled PrefetchedSerializer field tree for a particular set of overrides.
+
+    Attributes:
+        serializer_class (class) - The serializer class this plan was compiled for
+        field_names (list) - The ordered names of the fields to serialize
+        nested (dict) - Nested field names mapped to a (serializer class, kwargs) tuple
+        read_only (set) - The names of fields which must be marked read only
+    '''
+
+    def __init__(self, serializer_class, field_names, nested, read_only):
+        self.serializer_class = serializer_class
+        self.field_names = field_names
+        self.nested = nested
+        self.read_only = read_only
 
 
 class StaticRepresentationField(serializers.RelatedField):
@@ -32,10 +75,21 @@ class PrefetchedSerializer(serializers.ModelSerializer):
         }
 
     }
+
+    To support column projection, serializer method fields should declare the model
+    attributes they read in the "field_dependencies" Meta field thusly:
+    "serializer_field_name": ["model_field", "relation__model_field"]
+
+    Named field presets, selectable via ?fields=<preset>, may be specified in the
+    "field_presets" Meta field thusly:
+    "preset_name": {
+        "override_fields": [] // List of fields to _only_ include
+        "override_exclude": []
+    }
     '''
     def __init__(self, *args, **kwargs):
-        override_fields = kwargs.pop("override_fields", [])
-        override_exclude = kwargs.pop("override_exclude", [])
+        override_fields = list(kwargs.pop("override_fields", []))
+        override_exclude = list(kwargs.pop("override_exclude", []))
 
         # Initializer our parent serializer
         super(PrefetchedSerializer, self).__init__(*args, **kwargs)
@@ -46,58 +100,204 @@ class PrefetchedSerializer(serializers.ModelSerializer):
         if "override_exclude" in self.context:
             override_exclude += self.context.pop("override_exclude")
 
-        override_fields = self.correct_include_hierarchy(override_fields)
+        # The field tree itself is compiled once per override set and shared across instances,
+        # the fields are only instantiated from the plan when they are first accessed
+        self.field_plan = self.get_field_plan(override_fields, override_exclude)
+
+    def get_fields(self):
+        '''
+        Builds this serializer's fields from the compiled field plan, copying the cached
+        prototype fields rather than re-introspecting the model on every instantiation
+        '''
+        prototypes = self.get_prototype_fields()
+        fields = OrderedDict()
+
+        for name in self.field_plan.field_names:
+            if name in self.field_plan.nested:
+                # Nested serializers inherit our current context
+                serializer_class, kwargs = self.field_plan.nested[name]
+                fields[name] = serializer_class(context=self.context, **kwargs)
+            else:
+                fields[name] = copy.deepcopy(prototypes[name])
+
+            # Deny write access to all fields unless explicitly stated
+            if name in self.field_plan.read_only:
+                fields[name].read_only = True
+
+        return fields
+
+    @timed_serialization
+    def to_representation(self, instance):
+        return super(PrefetchedSerializer, self).to_representation(instance)
+
+    @classmethod
+    def get_prototype_fields(cls):
+        '''
+        Returns the unbound fields the model serializer would build for this class. The model
+        serializer's field construction depends only on the Meta, so the result is cached per class.
+        '''
+        prototypes = _prototype_fields.get(cls, None)
+        if prototypes is None:
+            prototypes = super(PrefetchedSerializer, cls.__new__(cls)).get_fields()
+            _prototype_fields[cls] = prototypes
+        return prototypes
+
+    @classmethod
+    def get_field_plan(cls, override_fields=(), override_exclude=()):
+        '''
+        Returns the compiled field plan for this serializer and the specified overrides.
+        Plans are cached, so identical override sets (in any order) share the same plan.
+
+        Args:
+            override_fields (list) - List of fields to _only_ include
+            override_exclude (list) - List of fields to exclude
+
+        Returns:
+            FieldPlan - The compiled field plan
+        '''
+        return _get_field_plan(cls, tuple(sorted(set(override_fields))), tuple(sorted(set(override_exclude))))
+
+    @classmethod
+    def compile_field_plan(cls, override_fields, override_exclude):
+        '''
+        Resolves the nested serializers, include/exclude overrides and writable fields of this
+        serializer into a FieldPlan. Use get_field_plan to benefit from plan caching.
+        '''
+        override_fields = cls.correct_include_hierarchy(list(override_fields))
+        override_exclude = list(override_exclude)
+
+        field_names = list(cls.get_prototype_fields().keys())
+        nested = {}
 
         # Create our nested serializers
-        if hasattr(self.Meta, "nested"):
-            for name, nested in self.Meta.nested.items():
+        if hasattr(cls.Meta, "nested"):
+            for name, spec in cls.Meta.nested.items():
                 # Get the nested serializer's kwargs
-                kwargs = dict(nested.get("kwargs", {}))
+                kwargs = dict(spec.get("kwargs", {}))
 
                 # If our serializer field name is not the same as the source, specify it
-                if nested.get("field", False) and name != nested["field"]:
-                    kwargs["source"] = nested["field"]
-                    self.fields.pop(nested["field"])
+                if spec.get("field", False) and name != spec["field"]:
+                    kwargs["source"] = spec["field"]
+                    if spec["field"] in field_names:
+                        field_names.remove(spec["field"])
 
-                self.parse_child_overrides(override_fields, override_exclude, name, nested, kwargs)
-
-                # Inherit our current context
-                kwargs["context"] = self.context
+                cls.parse_child_overrides(override_fields, override_exclude, name, spec, kwargs)
 
                 # If our class is specified as a string, import it
-                if isinstance(nested["class"], str):
-                    nested["class"] = locate(nested["class"])
+                serializer_class = spec["class"]
+                if isinstance(serializer_class, str):
+                    serializer_class = locate(serializer_class)
 
-                self.fields[name] = nested["class"](**kwargs)
+                nested[name] = (serializer_class, kwargs)
+                if name not in field_names:
+                    field_names.append(name)
 
         # Get our list of writable fields, if it exists
-        # Allow either list, tuple, or string to conform with similar other DRF behaviors
-        writable_fields = self.get_writable_fields()
+        writable_fields = cls.get_writable_fields()
 
         # Iterate over our fields and modify the list as necessary
-        for field in list(self.fields.keys()):
-            # Ignore any fields that begin with _
-            if field[0] == "_":
-                self.fields.pop(field)
+        plan_field_names = []
+        read_only = set()
+        for field in field_names:
+            # Ignore any fields that begin with _, and stored search documents
+            if field[0] == "_" or field in SEARCH_DOCUMENT_FIELDS:
+                continue
             # If we have overridden fields, remove fields not present in the requested list
             elif override_fields and field not in override_fields:
-                self.fields.pop(field)
+                continue
             # If we have overridden exclusions, remove fields present in the exclusion list
             elif field in override_exclude:
-                self.fields.pop(field)
-            # Deny write access to all fields unless explicitly stated
-            elif field not in writable_fields:
-                self.fields[field].read_only = True
+                continue
+
+            plan_field_names.append(field)
+            if field not in writable_fields:
+                read_only.add(field)
+
+        nested = {name: value for name, value in nested.items() if name in plan_field_names}
 
-    def get_writable_fields(self):
+        return FieldPlan(cls, plan_field_names, nested, read_only)
+
+    @classmethod
+    def clear_field_plan_cache(cls):
+        '''
+        Clears all compiled field plans, prefetch plans, deferred fields and prototype fields
+        '''
+        _get_field_plan.cache_clear()
+        _get_prefetch_plan.cache_clear()
+        _get_deferred_fields.cache_clear()
+        _prototype_fields.clear()
+
+    @classmethod
+    def get_field_preset(cls, name):
+        '''
+        Returns the overrides of the named field preset
+
+        Args:
+            name (string) - The name of the preset, as specified in the "field_presets" Meta field
+
+        Returns:
+            tuple - The list of fields to include, and the list of fields to exclude
+        '''
+        presets = getattr(cls.Meta, "field_presets", {})
+        if name not in presets:
+            raise serializers.ValidationError({"fields": f"Invalid field preset '{name}', valid presets are: {', '.join(sorted(presets.keys()))}"})
+
+        preset = presets[name]
+        return list(preset.get("override_fields", [])), list(preset.get("override_exclude", []))
+
+    @classmethod
+    def get_declared_dependencies(cls, field_names):
+        '''
+        Returns the declared "field_dependencies" of the specified fields, as a dictionary
+        of field name to the lookups of the model attributes the field reads
+        '''
+        declared = getattr(cls.Meta, "field_dependencies", {})
+        return {name: list(declared[name]) for name in field_names if name in declared}
+
+    @classmethod
+    def get_field_dependencies(cls, model, field_plan):
+        '''
+        Returns the lookups of the model attributes read when serializing the fields of the plan
+
+        Args:
+            model (class) - The model being serialized
+            field_plan (FieldPlan) - The field plan being serialized
+
+        Returns:
+            set - The lookups of the attributes read, or None if they cannot be determined
+        '''
+        model_field_names = [x.name for x in model._meta.get_fields()]
+        declared = cls.get_declared_dependencies(field_plan.field_names)
+        prototypes = cls.get_prototype_fields()
+        dependencies = set()
+
+        for name in field_plan.field_names:
+            if name in declared:
+                dependencies.update(declared[name])
+                continue
+            elif name in field_plan.nested:
+                source = field_plan.nested[name][1].get("source", name)
+            else:
+                source = prototypes[name].source or name
+
+            # Method fields, properties and whole-object fields may read any attribute
+            source = source.replace(".", LOOKUP_SEP)
+            if isinstance(prototypes.get(name, None), serializers.SerializerMethodField) or source.split(LOOKUP_SEP)[0] not in model_field_names:
+                return None
+            dependencies.add(source)
+
+        return dependencies
+
+    @classmethod
+    def get_writable_fields(cls):
         writable_fields = []
-        if hasattr(self.Meta, "writable_fields"):
-            if isinstance(self.Meta.writable_fields, list):
-                writable_fields = self.Meta.writable_fields
-            elif isinstance(self.Meta.writable_fields, tuple):
-                writable_fields = list(self.Meta.writable_fields)
-            elif isinstance(self.Meta.writable_fields, str):
-                writable_fields = [self.Meta.writable_fields]
+        if hasattr(cls.Meta, "writable_fields"):
+            if isinstance(cls.Meta.writable_fields, list):
+                writable_fields = cls.Meta.writable_fields
+            elif isinstance(cls.Meta.writable_fields, tuple):
+                writable_fields = list(cls.Meta.writable_fields)
+            elif isinstance(cls.Meta.writable_fields, str):
+                writable_fields = [cls.Meta.writable_fields]
 
         return writable_fields
 
@@ -177,28 +377,65 @@ class PrefetchedSerializer(serializers.ModelSerializer):
                 child_kwargs[pair[1]] = child_overrides
 
     @classmethod
-    def prefetch_model(cls, model, queryset, prefix="", parent_method=None, visited=None):
+    def prefetch_model(cls, model, queryset, override_fields=(), override_exclude=()):
         '''
         This method sets up prefetch and selected related statements when applicable
         for foreign key relationships.
 
-        It iterates over all fields in the object, if the field is (1) a related
+        Only relationships present in the effective field set (after applying the
+        include and exclude overrides) are prefetched. The prefetch plan is cached
+        per model, serializer and field set.
+
+        Args:
+            model (class) - The model of the queryset
+            queryset (QuerySet) - The queryset to prefetch
+            override_fields (list) - List of fields to _only_ include
+            override_exclude (list) - List of fields to exclude
+
+        Returns:
+            QuerySet - The prefetched queryset
+        '''
+        for method, lookup in cls.get_prefetch_plan(model, override_fields, override_exclude):
+            queryset = getattr(queryset, method)(lookup)
+
+        return queryset
+
+    @classmethod
+    def get_prefetch_plan(cls, model, override_fields=(), override_exclude=()):
+        '''
+        Returns the cached prefetch plan for this serializer, the model and the overrides,
+        as a list of (method, lookup) tuples, e.g. ("select_related", "post__location")
+        '''
+        return _get_prefetch_plan(cls, model, tuple(sorted(set(override_fields))), tuple(sorted(set(override_exclude))))
+
+    @classmethod
+    def compile_prefetch_plan(cls, model, override_fields=(), override_exclude=(), prefix="", parent_method=None, visited=None):
+        '''
+        Builds the prefetch plan for this serializer.
+
+        It iterates over all serialized fields in the object, if the field is (1) a related
         field type, and (2) not a reverse lookup, it pre-fetches that field, and
-        all sub-fields
+        all sub-fields which are serialized by the nested serializer
         '''
         select_related_field_types = ["OneToOneField", "ForeignKey"]
         prefetch_field_types = ["ManyToManyField"]
+        plan = []
 
         # Don't prefetch already prefetched items
         if not visited:
             visited = []
         elif model in visited:
-            return queryset
+            return plan
         visited.append(model)
 
-        # Only prefetch serialized fields
-        serialized_field_names = cls().fields.keys()
-        fields = [x for x in model._meta.get_fields() if x.name in serialized_field_names]
+        # Only prefetch serialized fields, and the relations read by serialized method fields
+        field_plan = cls.get_field_plan(override_fields, override_exclude)
+        field_names = set(field_plan.field_names)
+        declared_lookups = set()
+        for dependencies in cls.get_declared_dependencies(field_plan.field_names).values():
+            field_names.update([x.split(LOOKUP_SEP)[0] for x in dependencies])
+            declared_lookups.update(dependencies)
+        fields = [x for x in model._meta.get_fields() if x.name in field_names]
 
         for field in fields:
             internal_type = field.get_internal_type()
@@ -222,15 +459,96 @@ class PrefetchedSerializer(serializers.ModelSerializer):
             if parent_method == "prefetch_related":
                 method = parent_method
 
-            # Call the appropriate prefetch method
-            queryset = getattr(queryset, method)(f"{prefix}{field.name}")
+            plan.append((method, f"{prefix}{field.name}"))
+
             # If we have a related model to step into, do so
-            if field.related_model != model:
-                # If our serializer has a meta class (it should if it is a PrefetchedSerializer)
-                if hasattr(cls.Meta, "nested"):
-                    nested_serializer_class = cls.Meta.nested.get(field.name, None)
-                    # If we have a nested serializer class, use it to prefetch the next level of fields
-                    if nested_serializer_class:
-                        queryset = nested_serializer_class.get("class").prefetch_model(field.related_model, queryset, parent_method=method, prefix=f"{prefix}{field.name}{LOOKUP_SEP}", visited=visited)
+            if field.related_model != model and field.name in field_plan.nested:
+                # Use the nested serializer, with the overrides it will be instantiated with, to prefetch the next level of fields
+                nested_serializer_class, kwargs = field_plan.nested[field.name]
+                if hasattr(nested_serializer_class, "compile_prefetch_plan"):
+                    plan += nested_serializer_class.compile_prefetch_plan(field.related_model,
+                                                                          kwargs.get("override_fields", ()),
+                                                                          kwargs.get("override_exclude", ()),
+                                                                          prefix=f"{prefix}{field.name}{LOOKUP_SEP}",
+                                                                          parent_method=method,
+                                                                          visited=visited)
+
+        # Step into the related models read by serialized method fields, e.g. "user__user__last_name"
+        for lookup in sorted(declared_lookups):
+            plan += cls.compile_dependency_prefetch_plan(model, lookup, prefix, parent_method)
+
+        return plan
 
-        return queryset
+    @classmethod
+    def compile_dependency_prefetch_plan(cls, model, lookup, prefix="", parent_method=None):
+        '''
+        Builds the prefetch plan of the relations beyond the first level of a declared field dependency,
+        e.g. the user's user of "user__user__last_name"; the first level is prefetched with the serialized fields
+        '''
+        plan = []
+        method = parent_method
+        path = []
+        for name in lookup.split(LOOKUP_SEP):
+            field = next((x for x in model._meta.get_fields() if x.name == name), None)
+            if field is None or not field.is_relation:
+                break
+
+            if field.many_to_many or field.one_to_many:
+                method = "prefetch_related"
+            elif method != "prefetch_related":
+                method = "select_related"
+
+            path.append(name)
+            if len(path) > 1:
+                plan.append((method, f"{prefix}{LOOKUP_SEP.join(path)}"))
+            model = field.related_model
+
+        return plan
+
+    @classmethod
+    def get_deferred_fields(cls, model, override_fields=(), override_exclude=()):
+        '''
+        Returns the cached list of column lookups which are not needed to serialize the model
+        with the specified overrides, suitable for QuerySet.defer()
+        '''
+        return _get_deferred_fields(cls, model, tuple(sorted(set(override_fields))), tuple(sorted(set(override_exclude))))
+
+    @classmethod
+    def compile_deferred_fields(cls, model, override_fields=(), override_exclude=(), prefix="", select_related=None, dependencies=()):
+        '''
+        Builds the list of deferrable columns for this serializer.
+
+        Only the model itself and the related models joined via select_related are projected.
+        Non-relational columns are deferred unless they are serialized, or read by a field as
+        declared in the "field_dependencies" Meta field. Levels with method fields which do not
+        declare their dependencies are left untouched, along with everything beneath them.
+        '''
+        if select_related is None:
+            select_related = [lookup for method, lookup in cls.get_prefetch_plan(model, override_fields, override_exclude) if method == "select_related"]
+
+        field_plan = cls.get_field_plan(override_fields, override_exclude)
+        field_dependencies = cls.get_field_dependencies(model, field_plan)
+
+        # We can't know what an undeclared method field reads, here or in any related model
+        if field_dependencies is None:
+            return []
+
+        field_dependencies.update(dependencies)
+        required = [x.split(LOOKUP_SEP)[0] for x in field_dependencies]
+
+        deferred = [f"{prefix}{x.name}" for x in model._meta.concrete_fields if not x.primary_key and not x.is_relation and x.name not in required]
+
+        for name, (nested_serializer_class, kwargs) in field_plan.nested.items():
+            if f"{prefix}{name}" not in select_related or not hasattr(nested_serializer_class, "compile_deferred_fields"):
+                continue
+
+            # Pass down any lookups into the related model read at this level
+            child_dependencies = [x.split(LOOKUP_SEP, 1)[1] for x in field_dependencies if x.split(LOOKUP_SEP)[0] == name and LOOKUP_SEP in x]
+            deferred += nested_serializer_class.compile_deferred_fields(model._meta.get_field(name).related_model,
+                                                                        kwargs.get("override_fields", ()),
+                                                                        kwargs.get("override_exclude", ()),
+                                                                        prefix=f"{prefix}{name}{LOOKUP_SEP}",
+                                                                        select_related=select_related,
+                                                                        dependencies=child_dependencies)
+
+        return deferred
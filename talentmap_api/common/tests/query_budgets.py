@@ -0,0 +1,371 @@
+'''
+The SQL query budgets of every list and retrieve endpoint, enforced by test_query_budgets.py
+
+Each endpoint (as a route, with URL parameters in angle brackets) declares the maximum number of
+queries a single request may execute, and a seed which creates a representative dataset of the
+requested number of rows. List endpoints are measured at page sizes of 1, 10 and 100, and must
+execute the same number of queries at each size, unless allow_growth is set; any growth is an N+1.
+
+Budgets are ceilings; tighten them as endpoints improve. Every new endpoint must be added either
+here or to EXEMPT_ENDPOINTS, with the reason it cannot be measured.
+'''
+from django.contrib.auth.models import Group, User
+
+from model_mommy import mommy
+
+from talentmap_api.user_profile.models import UserProfile
+
+# The default ceilings for a single request
+LIST_QUERIES = 25
+RETRIEVE_QUERIES = 25
+
+
+class QueryBudget(object):
+    '''
+    The query budget of an endpoint
+
+    Args:
+        - seed (callable) - Seeds the dataset; accepts the requesting user and the number of rows,
+                            and returns the URL kwargs of the endpoint
+        - queries (int) - The maximum number of queries of a single request
+        - allow_growth (bool) - Whether the number of queries may grow with the page size. Growth is
+                                an N+1; state why it is accepted alongside the budget
+    '''
+
+    def __init__(self, seed, queries, allow_growth=False):
+        self.seed = seed
+        self.queries = queries
+        self.allow_growth = allow_growth
+
+
+def make(target, count, **kwargs):
+    '''
+    Makes the specified number of rows of a model, e.g. "position.Grade", or mommy recipe,
+    e.g. "talentmap_api.position.tests.grade"
+    '''
+    if target.startswith("talentmap_api."):
+        # Made one at a time, as a recipe's related rows are otherwise shared by all rows, which
+        # violates the unique constraints of some models, e.g. language qualifications
+        return [mommy.make_recipe(target, **kwargs) for _ in range(count)]
+    return mommy.make(target, _quantity=count, **kwargs)
+
+
+def seed_model(target, **kwargs):
+    '''
+    Returns a seed making rows of the model or recipe; keyword arguments which are callables are
+    called with the requesting user, e.g. owner=lambda user: user.profile
+    '''
+    def seed(user, count):
+        rows = make(target, count, **{k: v(user) if callable(v) else v for k, v in kwargs.items()})
+        return {"pk": rows[0].pk}
+    return seed
+
+
+def seed_history(target):
+    '''
+    Returns a seed making one row of the model or recipe, with the requested number of historical records
+    '''
+    def seed(user, count):
+        instance = make(target, 1)[0]
+        # The creation is the first historical record, each save adds another
+        for _ in range(count - 1):
+            instance.save()
+        return {"instance_id": instance.pk, "history_id": instance.history.first().history_id}
+    return seed
+
+
+def seed_nothing(user, count):
+    return {}
+
+
+def seed_own_profile(user, count):
+    return {"pk": user.profile.pk}
+
+
+def make_users(count):
+    users = mommy.make(User, _quantity=count)
+    return list(UserProfile.objects.filter(user__in=users).order_by("id"))
+
+
+def make_positions(count, **kwargs):
+    '''
+    Makes open positions in an active bid cycle, each with a grade, skill, post, bureau and language
+
+    Returns:
+        - tuple - The list of positions, and the list of their cycle positions
+    '''
+    bidcycle = mommy.make_recipe("talentmap_api.bidding.tests.bidcycle")
+    qualification = mommy.make_recipe("talentmap_api.language.tests.qualification")
+    positions = make("talentmap_api.position.tests.position", count, **kwargs)
+
+    cycle_positions = []
+    for position in positions:
+        position.languages.add(qualification)
+        cycle_positions.append(mommy.make("bidding.CyclePosition", position=position, bidcycle=bidcycle, status_code="OP"))
+
+    return positions, cycle_positions
+
+
+def make_bureau_ao(user, position):
+    group = Group.objects.get_or_create(name=f"bureau_ao:{position.bureau.code}")[0]
+    group.user_set.add(user)
+
+
+def seed_positions(user, count):
+    positions, _ = make_positions(count)
+    return {"pk": positions[0].pk}
+
+
+def seed_cycle_positions(user, count):
+    _, cycle_positions = make_positions(count)
+    return {"pk": cycle_positions[0].pk}
+
+
+def seed_highlighted_positions(user, count):
+    positions, _ = make_positions(count)
+    mommy.make("organization.Organization").highlighted_positions.add(*positions)
+    return {"pk": positions[0].pk}
+
+
+def seed_favorite_positions(user, count):
+    _, cycle_positions = make_positions(count)
+    user.profile.favorite_positions.add(*cycle_positions)
+    return {"pk": cycle_positions[0].pk}
+
+
+def seed_similar_positions(user, count):
+    # Similar positions share a grade, skill and country
+    positions, cycle_positions = make_positions(count + 1,
+                                                grade=mommy.make_recipe("talentmap_api.position.tests.grade"),
+                                                skill=mommy.make_recipe("talentmap_api.position.tests.skill"),
+                                                post=mommy.make_recipe("talentmap_api.organization.tests.post"))
+    return {"pk": positions[0].pk, "cycle_position_pk": cycle_positions[0].pk}
+
+
+def seed_cycle_position_similar(user, count):
+    return {"pk": seed_similar_positions(user, count)["cycle_position_pk"]}
+
+
+def seed_bidcycle_positions(user, count):
+    positions, cycle_positions = make_positions(count)
+    bidcycle = cycle_positions[0].bidcycle
+    bidcycle.positions.add(*positions)
+    return {"pk": bidcycle.pk}
+
+
+def seed_position_assignments(user, count):
+    positions, _ = make_positions(1)
+    mommy.make("position.Assignment", position=positions[0], user=user.profile, _quantity=count)
+    return {"pk": positions[0].pk}
+
+
+def seed_position_waivers(user, count):
+    positions, cycle_positions = make_positions(1)
+    make_bureau_ao(user, positions[0])
+    for profile in make_users(count):
+        bid = mommy.make("bidding.Bid", user=profile, position=cycle_positions[0], bidcycle=cycle_positions[0].bidcycle)
+        mommy.make("bidding.Waiver", user=profile, bid=bid, position=positions[0])
+    return {"pk": positions[0].pk}
+
+
+def seed_cycle_position_bids(user, count):
+    positions, cycle_positions = make_positions(1)
+    make_bureau_ao(user, positions[0])
+    for profile in make_users(count):
+        mommy.make("bidding.Bid", user=profile, position=cycle_positions[0], bidcycle=cycle_positions[0].bidcycle)
+    # The bid list is addressed by the position
+    return {"pk": positions[0].pk}
+
+
+def make_client(user):
+    client = make_users(1)[0]
+    client.cdo = user.profile
+    client.save()
+    return client
+
+
+def seed_clients(user, count):
+    clients = make_users(count)
+    UserProfile.objects.filter(id__in=[x.id for x in clients]).update(cdo=user.profile)
+    return {"pk": clients[0].pk}
+
+
+def seed_client_surveys(user, count):
+    client = make_client(user)
+    mommy.make("bidding.StatusSurvey", user=client, _quantity=count)
+    return {"pk": client.pk}
+
+
+def seed_client_assignments(user, count):
+    client = make_client(user)
+    positions, _ = make_positions(count)
+    for position in positions:
+        mommy.make("position.Assignment", position=position, user=client)
+    return {"pk": client.pk}
+
+
+def seed_client_bids(user, count):
+    client = make_client(user)
+    _, cycle_positions = make_positions(count)
+    bids = [mommy.make("bidding.Bid", user=client, position=x, bidcycle=x.bidcycle) for x in cycle_positions]
+    return {"pk": client.pk, "bid_id": bids[0].pk}
+
+
+def seed_user_bids(user, count):
+    _, cycle_positions = make_positions(count)
+    for position in cycle_positions:
+        mommy.make("bidding.Bid", user=user.profile, position=position, bidcycle=position.bidcycle)
+    return {}
+
+
+def make_waivers(profile, count):
+    '''
+    Makes waivers of the profile's bids; waivers made without bids would make bidders with duplicate profiles
+    '''
+    _, cycle_positions = make_positions(count)
+    return [mommy.make("bidding.Waiver", user=profile, position=x.position,
+                       bid=mommy.make("bidding.Bid", user=profile, position=x, bidcycle=x.bidcycle)) for x in cycle_positions]
+
+
+def seed_client_waivers(user, count):
+    client = make_client(user)
+    make_waivers(client, count)
+    return {"pk": client.pk}
+
+
+def seed_user_waivers(user, count):
+    waivers = make_waivers(user.profile, count)
+    return {"pk": waivers[0].pk}
+
+
+def seed_user_assignments(user, count):
+    positions, _ = make_positions(count)
+    for position in positions:
+        mommy.make("position.Assignment", position=position, user=user.profile)
+    return {}
+
+
+def owner(user):
+    return user.profile
+
+
+# Bid cycles with timezone aware dates, for the days remaining statistic
+seed_bidcycle_statistics = seed_model("bidding.BidCycle",
+                                      cycle_end_date="2000-01-01T00:00:00+00:00",
+                                      cycle_deadline_date="1999-01-01T00:00:00+00:00",
+                                      cycle_start_date="1998-01-01T00:00:00+00:00")
+
+
+def lookup_endpoints(route, target):
+    '''
+    Returns the budgets of a simple lookup data endpoint, e.g. /api/v1/country/, with its
+    retrieve and history endpoints
+    '''
+    return {
+        route: QueryBudget(seed_model(target), LIST_QUERIES),
+        f"{route}<pk>/": QueryBudget(seed_model(target), RETRIEVE_QUERIES),
+        f"{route}<instance_id>/history/": QueryBudget(seed_history(target), LIST_QUERIES),
+        f"{route}<instance_id>/history/<history_id>/": QueryBudget(seed_history(target), RETRIEVE_QUERIES),
+    }
+
+
+QUERY_BUDGETS = {
+    # Positions
+    "/api/v1/position/": QueryBudget(seed_positions, LIST_QUERIES),
+    "/api/v1/position/<pk>/": QueryBudget(seed_positions, RETRIEVE_QUERIES),
+    "/api/v1/position/highlighted/": QueryBudget(seed_highlighted_positions, LIST_QUERIES),
+    "/api/v1/position/<pk>/assignments/": QueryBudget(seed_position_assignments, LIST_QUERIES),
+    "/api/v1/position/<pk>/similar/": QueryBudget(seed_similar_positions, LIST_QUERIES),
+    "/api/v1/position/<pk>/waivers/": QueryBudget(seed_position_waivers, LIST_QUERIES),
+    "/api/v1/position/<instance_id>/history/": QueryBudget(seed_history("talentmap_api.position.tests.position"), LIST_QUERIES),
+    "/api/v1/position/<instance_id>/history/<history_id>/": QueryBudget(seed_history("talentmap_api.position.tests.position"), RETRIEVE_QUERIES),
+    "/api/v1/position/classification/": QueryBudget(seed_model("position.Classification"), LIST_QUERIES),
+    "/api/v1/position/classification/<pk>/": QueryBudget(seed_model("position.Classification"), RETRIEVE_QUERIES),
+    "/api/v1/skill/": QueryBudget(seed_model("talentmap_api.position.tests.skill"), LIST_QUERIES),
+    "/api/v1/skill/<pk>/": QueryBudget(seed_model("talentmap_api.position.tests.skill"), RETRIEVE_QUERIES),
+    "/api/v1/skill/cone/": QueryBudget(seed_model("position.SkillCone"), LIST_QUERIES),
+    "/api/v1/skill/cone/<pk>/": QueryBudget(seed_model("position.SkillCone"), RETRIEVE_QUERIES),
+    "/api/v1/grade/": QueryBudget(seed_model("talentmap_api.position.tests.grade"), LIST_QUERIES),
+    "/api/v1/grade/<pk>/": QueryBudget(seed_model("talentmap_api.position.tests.grade"), RETRIEVE_QUERIES),
+    "/api/v1/capsule_description/": QueryBudget(seed_model("position.CapsuleDescription"), LIST_QUERIES),
+    "/api/v1/capsule_description/<pk>/": QueryBudget(seed_model("position.CapsuleDescription"), RETRIEVE_QUERIES),
+    "/api/v1/capsule_description/<instance_id>/history/": QueryBudget(seed_history("position.CapsuleDescription"), LIST_QUERIES),
+    "/api/v1/capsule_description/<instance_id>/history/<history_id>/": QueryBudget(seed_history("position.CapsuleDescription"), RETRIEVE_QUERIES),
+
+    # Bidding
+    "/api/v1/bidcycle/": QueryBudget(seed_model("talentmap_api.bidding.tests.bidcycle"), LIST_QUERIES),
+    "/api/v1/bidcycle/<pk>/": QueryBudget(seed_model("talentmap_api.bidding.tests.bidcycle"), RETRIEVE_QUERIES),
+    "/api/v1/bidcycle/<pk>/positions/": QueryBudget(seed_bidcycle_positions, LIST_QUERIES),
+    "/api/v1/bidcycle/<instance_id>/history/": QueryBudget(seed_history("talentmap_api.bidding.tests.bidcycle"), LIST_QUERIES),
+    "/api/v1/bidcycle/<instance_id>/history/<history_id>/": QueryBudget(seed_history("talentmap_api.bidding.tests.bidcycle"), RETRIEVE_QUERIES),
+    "/api/v1/bidcycle/statistics/": QueryBudget(seed_bidcycle_statistics, LIST_QUERIES),
+    "/api/v1/bidcycle/<pk>/statistics/": QueryBudget(seed_bidcycle_statistics, RETRIEVE_QUERIES),
+    "/api/v1/survey/": QueryBudget(seed_model("bidding.StatusSurvey", user=owner), LIST_QUERIES),
+    "/api/v1/survey/<pk>/": QueryBudget(seed_model("bidding.StatusSurvey", user=owner), RETRIEVE_QUERIES),
+    "/api/v1/waiver/": QueryBudget(seed_user_waivers, LIST_QUERIES),
+    "/api/v1/waiver/<pk>/": QueryBudget(seed_user_waivers, RETRIEVE_QUERIES),
+    "/api/v1/cycleposition/": QueryBudget(seed_cycle_positions, LIST_QUERIES),
+    "/api/v1/cycleposition/<pk>/": QueryBudget(seed_cycle_positions, RETRIEVE_QUERIES),
+    "/api/v1/cycleposition/highlighted/": QueryBudget(seed_highlighted_positions, LIST_QUERIES),
+    "/api/v1/cycleposition/favorites/": QueryBudget(seed_favorite_positions, LIST_QUERIES),
+    "/api/v1/cycleposition/<pk>/bids/": QueryBudget(seed_cycle_position_bids, LIST_QUERIES),
+    "/api/v1/cycleposition/<pk>/similar/": QueryBudget(seed_cycle_position_similar, LIST_QUERIES),
+    "/api/v1/bidlist/": QueryBudget(seed_user_bids, LIST_QUERIES),
+
+    # Languages
+    "/api/v1/language/": QueryBudget(seed_model("talentmap_api.language.tests.language"), LIST_QUERIES),
+    "/api/v1/language/<pk>/": QueryBudget(seed_model("talentmap_api.language.tests.language"), RETRIEVE_QUERIES),
+    "/api/v1/language_proficiency/": QueryBudget(seed_model("talentmap_api.language.tests.proficiency"), LIST_QUERIES),
+    "/api/v1/language_proficiency/<pk>/": QueryBudget(seed_model("talentmap_api.language.tests.proficiency"), RETRIEVE_QUERIES),
+    "/api/v1/language_qualification/": QueryBudget(seed_model("talentmap_api.language.tests.qualification"), LIST_QUERIES),
+    "/api/v1/language_qualification/<pk>/": QueryBudget(seed_model("talentmap_api.language.tests.qualification"), RETRIEVE_QUERIES),
+
+    # Organizations and posts
+    **lookup_endpoints("/api/v1/organization/", "talentmap_api.organization.tests.orphaned_organization"),
+    "/api/v1/organization/group/": QueryBudget(seed_model("organization.OrganizationGroup"), LIST_QUERIES),
+    "/api/v1/organization/group/<pk>/": QueryBudget(seed_model("organization.OrganizationGroup"), RETRIEVE_QUERIES),
+    **lookup_endpoints("/api/v1/orgpost/", "talentmap_api.organization.tests.post"),
+    **lookup_endpoints("/api/v1/tour_of_duty/", "talentmap_api.organization.tests.tour_of_duty"),
+    **lookup_endpoints("/api/v1/location/", "talentmap_api.organization.tests.location"),
+    **lookup_endpoints("/api/v1/country/", "talentmap_api.organization.tests.country"),
+
+    # Permissions
+    "/api/v1/permission/user/": QueryBudget(seed_nothing, RETRIEVE_QUERIES),
+    "/api/v1/permission/user/<pk>/": QueryBudget(seed_own_profile, RETRIEVE_QUERIES),
+    "/api/v1/permission/group/": QueryBudget(seed_model("auth.Group"), LIST_QUERIES),
+    "/api/v1/permission/group/<pk>/": QueryBudget(seed_model("auth.Group"), RETRIEVE_QUERIES),
+
+    # Profiles and clients
+    "/api/v1/profile/": QueryBudget(seed_nothing, RETRIEVE_QUERIES),
+    "/api/v1/profile/<pk>/": QueryBudget(seed_own_profile, RETRIEVE_QUERIES),
+    "/api/v1/profile/assignments/": QueryBudget(seed_user_assignments, LIST_QUERIES),
+    "/api/v1/searches/": QueryBudget(seed_model("user_profile.SavedSearch", owner=owner, endpoint="/api/v1/position/"), LIST_QUERIES),
+    "/api/v1/searches/<pk>/": QueryBudget(seed_model("user_profile.SavedSearch", owner=owner, endpoint="/api/v1/position/"), RETRIEVE_QUERIES),
+    "/api/v1/client/": QueryBudget(seed_clients, LIST_QUERIES),
+    "/api/v1/client/<pk>/": QueryBudget(seed_clients, RETRIEVE_QUERIES),
+    "/api/v1/client/<pk>/survey/": QueryBudget(seed_client_surveys, LIST_QUERIES),
+    "/api/v1/client/<pk>/bids/": QueryBudget(seed_client_bids, LIST_QUERIES),
+    "/api/v1/client/<pk>/bids/<bid_id>/prepanel/": QueryBudget(seed_client_bids, RETRIEVE_QUERIES),
+    "/api/v1/client/<pk>/assignments/": QueryBudget(seed_client_assignments, LIST_QUERIES),
+    "/api/v1/client/<pk>/waivers/": QueryBudget(seed_client_waivers, LIST_QUERIES),
+
+    # Messaging
+    "/api/v1/notification/": QueryBudget(seed_model("messaging.Notification", owner=owner), LIST_QUERIES),
+    "/api/v1/notification/<pk>/": QueryBudget(seed_model("messaging.Notification", owner=owner), RETRIEVE_QUERIES),
+    "/api/v1/task/": QueryBudget(seed_model("messaging.Task", owner=owner), LIST_QUERIES),
+    "/api/v1/task/<pk>/": QueryBudget(seed_model("messaging.Task", owner=owner), RETRIEVE_QUERIES),
+
+    # Glossary and feedback
+    "/api/v1/glossary/": QueryBudget(seed_model("glossary.GlossaryEntry"), LIST_QUERIES),
+    "/api/v1/glossary/<pk>/": QueryBudget(seed_model("glossary.GlossaryEntry"), RETRIEVE_QUERIES),
+    "/api/v1/feedback/": QueryBudget(seed_model("feedback.FeedbackEntry", user=owner), LIST_QUERIES),
+    "/api/v1/feedback/all/": QueryBudget(seed_model("feedback.FeedbackEntry", user=owner), LIST_QUERIES),
+    "/api/v1/feedback/all/<pk>/": QueryBudget(seed_model("feedback.FeedbackEntry", user=owner), RETRIEVE_QUERIES),
+
+    # Authentication
+    "/api/v1/accounts/token/view/": QueryBudget(seed_nothing, RETRIEVE_QUERIES),
+}
+
+# Endpoints which cannot be measured, and why
+EXEMPT_ENDPOINTS = {
+}
@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from django.core.management.base import CommandError
+
+from talentmap_api.common.management.commands.run_benchmarks import Command, DEFAULT_BASELINE
+
+
+def get_report(median, queries):
+    return {
+        "dataset": {"positions": 10},
+        "results": {"position_list": {"median_ms": median, "queries": queries}},
+    }
+
+
+def test_percentile():
+    values = list(range(1, 21))
+
+    assert Command.percentile(values, 50) == 10
+    assert Command.percentile(values, 95) == 19
+    assert Command.percentile(values, 100) == 20
+    assert Command.percentile([5], 95) == 5
+
+
+def test_compare():
+    baseline = get_report(100.0, 10)
+    command = Command()
+
+    assert command.compare(get_report(110.0, 10), baseline, 0.2, 5.0) == []
+    assert command.compare(get_report(90.0, 10), baseline, 0.2, 5.0) == []
+    assert command.compare(get_report(130.0, 10), baseline, 0.2, 5.0) == ["position_list"]
+    # More queries is always a regression
+    assert command.compare(get_report(100.0, 11), baseline, 0.2, 5.0) == ["position_list"]
+    # Slowdowns below the minimum delta are noise
+    assert command.compare(get_report(3.0, 10), get_report(1.0, 10), 0.2, 5.0) == []
+    # Benchmarks without a baseline are never regressions
+    assert command.compare(get_report(1000.0, 100), {"results": {}}, 0.2, 5.0) == []
+
+
+def test_committed_baseline():
+    assert os.path.exists(DEFAULT_BASELINE)
+    with open(DEFAULT_BASELINE) as baseline:
+        assert "results" in json.load(baseline)
+
+
+def test_empty_baseline(tmpdir):
+    baseline = tmpdir.join("baseline.json")
+    baseline.write(json.dumps({"dataset": None, "results": {}}))
+
+    # Comparing to an empty baseline would silently pass
+    with pytest.raises(CommandError, match="has no results"):
+        Command().load_results(str(baseline))
+
+    baseline.write(json.dumps(get_report(100.0, 10)))
+    assert Command().load_results(str(baseline)) == get_report(100.0, 10)
@@ -0,0 +1,102 @@
+import pytest
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+from model_mommy import mommy
+from rest_framework import status
+
+from talentmap_api.common.cache import generations
+from talentmap_api.position.tests.mommy_recipes import cycle_position
+
+
+@pytest.fixture
+def test_conditional_get_fixture():
+    return cycle_position(update_date=timezone.now()).position
+
+
+@pytest.mark.django_db()
+def test_conditional_get_list(client, test_conditional_get_fixture):
+    response = client.get('/api/v1/position/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"]
+    assert response["Last-Modified"]
+    assert response["Cache-Control"] == "no-cache"
+    assert "Authorization" in response["Vary"]
+
+    etag = response["ETag"]
+    response = client.get('/api/v1/position/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert not response.content
+
+    # Different query parameters are a different representation
+    response = client.get('/api/v1/position/?include=id', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+    # Updating the data invalidates the ETag
+    position = test_conditional_get_fixture
+    position.update_date = timezone.now() + timezone.timedelta(days=1)
+    position.save()
+
+    response = client.get('/api/v1/position/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db()
+def test_conditional_get_retrieve(client, test_conditional_get_fixture):
+    position = test_conditional_get_fixture
+    response = client.get(f'/api/v1/position/{position.id}/')
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(f'/api/v1/position/{position.id}/', HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get('/api/v1/position/999999/', HTTP_IF_NONE_MATCH="*")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db()
+def test_no_validators_no_store(client):
+    mommy.make('organization.Country')
+    response = client.get('/api/v1/country/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
+    assert response["Cache-Control"] == "no-cache,no-store"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conditional_get_generations(client, monkeypatch, test_conditional_get_fixture):
+    monkeypatch.setattr(generations, "get_cache", lambda: LocMemCache("test_conditional_get", {}))
+    position = test_conditional_get_fixture
+    position.skill = mommy.make('position.Skill')
+    position.save()
+
+    response = client.get('/api/v1/position/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"].startswith("W/")
+    assert not response.has_header("Last-Modified")
+
+    etag = response["ETag"]
+    response = client.get('/api/v1/position/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Changes to the related data the serializer reads invalidate the ETag
+    skill = position.skill
+    skill.description = "Changed"
+    skill.save()
+
+    response = client.get('/api/v1/position/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
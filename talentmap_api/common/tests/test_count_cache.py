@@ -0,0 +1,92 @@
+import pytest
+
+from model_mommy import mommy
+
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from talentmap_api.common import pagination
+from talentmap_api.common.cache import generations
+from talentmap_api.common.pagination import CountCachingPaginator
+from talentmap_api.position.models import Grade, Position
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    local_cache = LocMemCache("test_count_cache", {})
+    monkeypatch.setattr(pagination, "cache", local_cache)
+    monkeypatch.setattr(generations, "get_cache", lambda: local_cache)
+    return local_cache
+
+
+def test_query_tables():
+    sql, params = Position.objects.filter(post__location__city="Paris").query.sql_with_params()
+
+    assert generations.get_query_tables(sql) == ["organization_location", "organization_post", "position_position"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generation_bump(local_cache):
+    assert generations.get_generations(["position_grade"]) == {"position_grade": 0}
+
+    mommy.make(Grade)
+    generation = generations.get_generations(["position_grade"])["position_grade"]
+    assert generation > 0
+
+    mommy.make(Grade)
+    assert generations.get_generations(["position_grade"])["position_grade"] == generation + 1
+
+    # Changes inside a transaction bump the generation once it commits
+    with transaction.atomic():
+        mommy.make(Grade)
+        assert generations.get_generations(["position_grade"])["position_grade"] == generation + 1
+    assert generations.get_generations(["position_grade"])["position_grade"] == generation + 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_count_cache_invalidation(local_cache):
+    mommy.make(Grade, _quantity=3)
+
+    assert CountCachingPaginator(Grade.objects.all(), 10).count == 3
+
+    # Bulk creation doesn't send signals, so the cached count is served
+    Grade.objects.bulk_create([Grade(code="bulk")])
+    assert CountCachingPaginator(Grade.objects.all(), 10).count == 3
+
+    # Saving an instance bumps the table's generation, invalidating the cached count
+    mommy.make(Grade)
+    assert CountCachingPaginator(Grade.objects.all(), 10).count == 5
+
+    # Different filters have distinct cache entries
+    assert CountCachingPaginator(Grade.objects.filter(code="bulk"), 10).count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_count_not_cached_without_generations(local_cache, monkeypatch):
+    monkeypatch.setattr(generations, "get_cache", lambda: DummyCache("test_count_cache", {}))
+    mommy.make(Grade, _quantity=3)
+
+    assert CountCachingPaginator(Grade.objects.all(), 10).count == 3
+
+    # Changes couldn't invalidate a cached count, so it's counted each time
+    Grade.objects.bulk_create([Grade(code="bulk")])
+    assert CountCachingPaginator(Grade.objects.all(), 10).count == 4
+
+
+@pytest.mark.django_db()
+def test_count_is_estimate(client, monkeypatch):
+    mommy.make(Grade, _quantity=3)
+
+    response = client.get('/api/v1/grade/')
+    assert "count_is_estimate" not in response.data
+
+    # Small results are counted exactly
+    response = client.get('/api/v1/grade/?count=estimate')
+    assert response.data["count"] == 3
+    assert response.data["count_is_estimate"] is False
+
+    monkeypatch.setattr(CountCachingPaginator, "estimate_threshold", 0)
+    response = client.get('/api/v1/grade/?count=estimate')
+    assert response.data["count_is_estimate"] is True
+    assert list(response.data)[:2] == ["count", "count_is_estimate"]
@@ -50,3 +50,21 @@ def test_field_child_exclusion(client):
     assert "post" in list(response.data["results"][0].keys())
     assert "id" not in list(response.data["results"][0]["post"].keys())
     assert list(response.data["results"][0].keys()) != []
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_field_params_fixture")
+def test_field_preset(client):
+    response = client.get('/api/v1/position/?fields=card')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "description" not in list(response.data["results"][0].keys())
+    assert "title" in list(response.data["results"][0].keys())
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_field_params_fixture")
+def test_field_preset_invalid(client):
+    response = client.get('/api/v1/position/?fields=banana')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,5 +1,7 @@
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from freezegun import freeze_time
 from model_mommy import mommy
@@ -27,3 +29,63 @@ def test_post_historical_view(client):
         response = client.get(f'/api/v1/orgpost/{post.id}/history/?history_date__lte=1993-01-01T00:00:00Z')
 
         assert len(response.data["results"]) == 1
+
+
+@pytest.mark.django_db()
+def test_position_historical_view(client):
+    position = mommy.make_recipe('talentmap_api.position.tests.position', title="Political Officer")
+    position.classifications.add(mommy.make('position.Classification'))
+    position.title = "Economic Officer"
+    position.save()
+
+    response = client.get(f'/api/v1/position/{position.id}/history/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["title"] for x in response.data["results"]] == ["Economic Officer", "Political Officer"]
+    # Relations and fields which aren't recorded in the history aren't serialized
+    assert "classifications" not in response.data["results"][0]
+    assert "availability" not in response.data["results"][0]
+
+
+@pytest.mark.django_db()
+def test_capsule_description_historical_view(client):
+    description = mommy.make('position.CapsuleDescription', content="Old content")
+    mommy.make_recipe('talentmap_api.position.tests.position', description=description)
+    description.content = "New content"
+    description.save()
+
+    response = client.get(f'/api/v1/capsule_description/{description.id}/history/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["content"] for x in response.data["results"]] == ["New content", "Old content"]
+    # The editable flag reads the position, whose reverse relation isn't recorded in the history
+    assert "is_editable_by_user" not in response.data["results"][0]
+
+
+@pytest.mark.django_db()
+def test_position_historical_representation(client):
+    location = mommy.make('organization.Location', city="Paris", country=mommy.make('organization.Country', code="USA"))
+    position = mommy.make_recipe('talentmap_api.position.tests.position', post=mommy.make('organization.Post', location=location))
+    expected = str(position.history.first())
+
+    # The representation is the one recorded, unaffected by later changes to related rows
+    location.city = "Lyon"
+    location.save()
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f'/api/v1/position/{position.id}/history/')
+    single_record_queries = len(context)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Paris" in expected
+    assert response.data["results"][0]["representation"] == expected
+
+    # And isn't rebuilt from each record's position and its relations
+    for title in ["Economic Officer", "Consular Officer", "Management Officer"]:
+        position.title = title
+        position.save()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f'/api/v1/position/{position.id}/history/')
+
+    assert len(response.data["results"]) == 4
+    assert len(context) == single_record_queries
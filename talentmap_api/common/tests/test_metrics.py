@@ -0,0 +1,69 @@
+import pytest
+
+from model_mommy import mommy
+from prometheus_client import CollectorRegistry, generate_latest
+from rest_framework import status
+
+from talentmap_api.common import metrics
+
+
+@pytest.fixture
+def test_metrics_fixture():
+    mommy.make('organization.Country', _quantity=3)
+
+
+def get_sample(name, **labels):
+    return metrics.registry.get_sample_value(name, {k: str(v) for k, v in labels.items()}) or 0
+
+
+@pytest.mark.django_db()
+def test_endpoint_metrics(client, settings, test_metrics_fixture):
+    settings.METRICS_TOKEN = "secret"
+    labels = {"route": "CountryView.list", "method": "GET", "status": 200}
+    requests = get_sample("talentmap_request_duration_seconds_count", **labels)
+    sizes = get_sample("talentmap_response_size_bytes_sum", **labels)
+
+    response = client.get('/api/v1/country/')
+    assert response.status_code == status.HTTP_200_OK
+
+    assert get_sample("talentmap_request_duration_seconds_count", **labels) == requests + 1
+    assert get_sample("talentmap_request_sql_queries_sum", **labels) > 0
+    assert get_sample("talentmap_request_serializer_duration_seconds_sum", **labels) > 0
+    assert get_sample("talentmap_response_size_bytes_sum", **labels) == sizes + len(response.content)
+
+    response = client.get('/metrics', HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain")
+
+    content = response.content.decode("utf-8")
+    assert f'talentmap_request_duration_seconds_count{{method="GET",route="CountryView.list",status="200"}} {float(requests + 1)}' in content
+    assert "talentmap_request_sql_queries_bucket" in content
+
+
+def test_multiprocess_registry(monkeypatch, tmpdir):
+    assert metrics.get_registry() is metrics.registry
+
+    # In multiprocess mode, the metrics of all workers are read from the shared directory
+    monkeypatch.setenv(metrics.MULTIPROCESS_DIRECTORY_VARIABLE, str(tmpdir))
+    registry = metrics.get_registry()
+    assert isinstance(registry, CollectorRegistry) and registry is not metrics.registry
+    assert generate_latest(registry) == b""
+
+
+@pytest.mark.django_db()
+def test_metrics_token(client, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    assert client.get('/metrics').status_code == status.HTTP_403_FORBIDDEN
+    assert client.get('/metrics', HTTP_AUTHORIZATION="Bearer secret").status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db()
+def test_metrics_without_token(client, settings):
+    settings.METRICS_TOKEN = None
+
+    # Without a token, only staff users may view the metrics
+    assert client.get('/metrics').status_code == status.HTTP_403_FORBIDDEN
+
+    client.force_login(mommy.make('auth.User', is_staff=True))
+    assert client.get('/metrics').status_code == status.HTTP_200_OK
@@ -1,6 +1,15 @@
 import pytest
 
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+
 from talentmap_api.common.serializers import PrefetchedSerializer
+from talentmap_api.position.models import Position
+from talentmap_api.position.serializers import PositionListSerializer
 
 
 @pytest.mark.django_db()
@@ -46,3 +55,92 @@ def test_prefetched_child_fields():
     PrefetchedSerializer.parse_child_overrides(override_fields, override_exclude, "post", {}, kwargs)
 
     assert expected_kwargs == kwargs
+
+
+def test_field_plan_is_cached():
+    plan = PositionListSerializer.get_field_plan(["id", "title"], [])
+
+    assert PositionListSerializer.get_field_plan(["title", "id"], []) is plan
+    assert PositionListSerializer.get_field_plan(["id"], []) is not plan
+
+
+def test_field_plan_overrides():
+    plan = PositionListSerializer.get_field_plan(["id", "post__location"], ["id"])
+
+    assert plan.field_names == ["post"]
+    assert list(plan.nested.keys()) == ["post"]
+    assert plan.nested["post"][1]["override_fields"] == ["location"]
+    assert "post" in plan.read_only
+
+
+@pytest.mark.django_db()
+def test_field_plan_serializer_fields():
+    serializer = PositionListSerializer(context={"override_fields": ["id", "post__location"]})
+
+    assert list(serializer.fields.keys()) == ["id", "post"]
+    assert list(serializer.fields["post"].fields.keys()) == ["location"]
+    assert serializer.fields["id"].read_only
+
+    # Excluded nested serializers should not be created
+    serializer = PositionListSerializer(context={"override_exclude": ["description", "_string_representation"]})
+    assert "description" not in serializer.fields
+    assert "languages" in serializer.fields
+
+
+def test_prefetch_plan_follows_field_set():
+    plan = PositionListSerializer.get_prefetch_plan(Position, ["id", "title", "grade"])
+
+    assert plan == [("select_related", "grade")]
+    assert PositionListSerializer.get_prefetch_plan(Position, ["grade", "title", "id"]) is plan
+
+    # Including a nested field includes all of its own nested fields
+    plan = PositionListSerializer.get_prefetch_plan(Position, ["post__location"])
+    assert plan == [("select_related", "post"), ("select_related", "post__location"), ("select_related", "post__location__country")]
+
+    plan = PositionListSerializer.get_prefetch_plan(Position, [], ["languages"])
+    assert ("prefetch_related", "languages") not in plan
+    assert ("select_related", "post") in plan
+
+
+def test_deferred_fields_follow_field_set():
+    deferred = PositionListSerializer.get_deferred_fields(Position, ["id", "title", "grade"])
+
+    assert "title" not in deferred
+    assert "_string_representation" in deferred
+    assert "_language_1_code" in deferred
+    assert "grade" not in deferred
+
+    # Method fields keep the columns they declare as dependencies
+    deferred = PositionListSerializer.get_deferred_fields(Position, ["bureau", "description"])
+    assert "_bureau_code" not in deferred
+    assert "title" in deferred
+    assert "description__content" not in deferred
+    assert "description___string_representation" in deferred
+
+
+def test_field_presets():
+    override_fields, override_exclude = PositionListSerializer.get_field_preset("card")
+
+    assert "title" in override_fields
+    assert "description" not in override_fields
+    assert override_exclude == []
+
+    with pytest.raises(ValidationError):
+        PositionListSerializer.get_field_preset("banana")
+
+
+def test_field_limited_prefetching_keeps_view_lookups():
+    class PositionView(FieldLimitableSerializerMixin, GenericAPIView):
+        serializer_class = PositionListSerializer
+        filter_backends = ()
+
+    view = PositionView()
+    view.request = Request(APIRequestFactory().get("/", {"include": "id,title"}))
+    view.format_kwarg = None
+
+    queryset = PositionListSerializer.prefetch_model(Position, Position.objects.all())
+    queryset = view.filter_queryset(queryset.select_related("current_assignment__position").prefetch_related("classifications"))
+
+    # The serializer's relations are limited to the effective field set, the view's own are kept
+    assert queryset.query.select_related == {"current_assignment": {"position": {}}}
+    assert queryset._prefetch_related_lookups == ("classifications",)
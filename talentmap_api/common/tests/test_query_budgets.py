@@ -0,0 +1,92 @@
+'''
+Enforces the SQL query budgets declared in query_budgets.py for every list and retrieve
+endpoint in the URL conf, to catch N+1 regressions.
+'''
+import re
+
+import pytest
+
+from model_mommy import mommy
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from rest_framework import status
+
+from talentmap_api.common.tests.query_budgets import QUERY_BUDGETS, EXEMPT_ENDPOINTS
+
+PAGE_SIZES = [1, 10, 100]
+
+GROUP_REGEX = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+PARAMETER_REGEX = re.compile(r"<(\w+)>")
+
+
+def get_endpoints(patterns=None, prefix=""):
+    '''
+    Walks the URL conf, returning the list and retrieve endpoints as a dictionary of route to
+    action, where the route's URL parameters are in angle brackets, e.g. /api/v1/position/<pk>/
+    '''
+    endpoints = {}
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + GROUP_REGEX.sub(r"<\1>", str(pattern.pattern)).replace("^", "").replace("$", "")
+        if isinstance(pattern, URLResolver):
+            endpoints.update(get_endpoints(pattern.url_patterns, route))
+            continue
+
+        action = (getattr(pattern.callback, "actions", None) or {}).get("get")
+        if action in ["list", "retrieve"] and route.startswith("api/"):
+            endpoints[f"/{route}"] = action
+    return endpoints
+
+
+ENDPOINTS = get_endpoints()
+
+
+def get_url(route, kwargs):
+    return PARAMETER_REGEX.sub(lambda match: str(kwargs[match.group(1)]), route)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK, f"{url} returned {response.status_code}"
+    return len(context.captured_queries)
+
+
+@pytest.fixture
+def budget_client(authorized_client, authorized_user):
+    # The superuser group passes every group permission check
+    authorized_user.groups.add(mommy.make('auth.Group', name="superuser"))
+    return authorized_client
+
+
+def test_endpoints_have_budgets():
+    unbudgeted = sorted(set(ENDPOINTS) - set(QUERY_BUDGETS) - set(EXEMPT_ENDPOINTS))
+    assert not unbudgeted, f"Endpoints without a query budget in query_budgets.py: {unbudgeted}"
+
+    stale = sorted((set(QUERY_BUDGETS) | set(EXEMPT_ENDPOINTS)) - set(ENDPOINTS))
+    assert not stale, f"Query budgets for endpoints which no longer exist: {stale}"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("route", sorted(x for x in QUERY_BUDGETS if ENDPOINTS.get(x) == "list"))
+def test_list_query_budget(budget_client, authorized_user, route):
+    budget = QUERY_BUDGETS[route]
+    url = get_url(route, budget.seed(authorized_user, max(PAGE_SIZES)))
+
+    counts = {size: count_queries(budget_client, f"{url}?limit={size}") for size in PAGE_SIZES}
+
+    if not budget.allow_growth:
+        assert len(set(counts.values())) == 1, f"{route} queries grow with the page size: {counts}"
+    assert max(counts.values()) <= budget.queries, f"{route} is over its budget of {budget.queries} queries: {counts}"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("route", sorted(x for x in QUERY_BUDGETS if ENDPOINTS.get(x) == "retrieve"))
+def test_retrieve_query_budget(budget_client, authorized_user, route):
+    budget = QUERY_BUDGETS[route]
+    url = get_url(route, budget.seed(authorized_user, 1))
+
+    count = count_queries(budget_client, url)
+
+    assert count <= budget.queries, f"{route} is over its budget of {budget.queries} queries: {count}"
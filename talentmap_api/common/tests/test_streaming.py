@@ -0,0 +1,75 @@
+import csv
+import json
+import pytest
+
+from model_mommy import mommy
+from rest_framework import status
+
+
+@pytest.fixture
+def test_streaming_fixture():
+    mommy.make('organization.Country', _quantity=25)
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_streaming_fixture")
+def test_streaming_list_matches_list(client):
+    response = client.get('/api/v1/country/?limit=10&page=2')
+    streamed_response = client.get('/api/v1/country/?limit=10&page=2&stream=true')
+
+    assert streamed_response.status_code == status.HTTP_200_OK
+    assert streamed_response.streaming
+
+    data = json.loads(b"".join(streamed_response.streaming_content).decode("utf-8"))
+
+    assert list(data.keys()) == ["count", "next", "previous", "results"]
+    assert data["count"] == 25
+    # The page links keep the stream parameter, so following them streams the next page
+    assert data["next"] == f"{response.data['next']}&stream=true"
+    assert data["previous"] == f"{response.data['previous']}&stream=true"
+    assert [x["id"] for x in data["results"]] == [x["id"] for x in response.data["results"]]
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_streaming_fixture")
+def test_streaming_list_chunks(client):
+    streamed_response = client.get('/api/v1/country/?limit=250&stream=true')
+
+    data = json.loads(b"".join(streamed_response.streaming_content).decode("utf-8"))
+
+    assert data["count"] == 25
+    assert len(data["results"]) == 25
+    assert data["next"] is None
+
+
+@pytest.mark.django_db()
+def test_streaming_invalid_page(client):
+    response = client.get('/api/v1/country/?page=5&stream=true')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_streaming_fixture")
+def test_csv_export_all(client):
+    response = client.get('/api/v1/country/?format=csv&export=all&limit=5&include=id,code')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Disposition"] == 'attachment; filename="country.csv"'
+
+    rows = list(csv.reader(b"".join(response.streaming_content).decode("utf-8").splitlines()))
+
+    assert rows[0] == ["id", "code"]
+    assert len(rows) == 26
+
+
+@pytest.mark.django_db()
+def test_csv_export_nested_header(client):
+    mommy.make('organization.Post', _quantity=3)
+    response = client.get('/api/v1/orgpost/?format=csv&export=all&include=id,location__city')
+
+    rows = list(csv.reader(b"".join(response.streaming_content).decode("utf-8").splitlines()))
+
+    assert rows[0] == ["id", "location.city"]
+    assert len(rows) == 4
@@ -0,0 +1,38 @@
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from talentmap_api.bidding.models import Bid, CyclePosition
+from talentmap_api.messaging.models import Notification
+from talentmap_api.position.models import Position
+from talentmap_api.user_profile.models import UserProfile
+
+
+def get_distribution():
+    return sorted(Position.objects.filter(_create_id="SYN").values_list("position_number", "grade__code", "skill__code", "post__location__code"))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_synthetic_data():
+    call_command("generate_synthetic_data", scale=0.001, seed=7)
+
+    assert Position.objects.filter(_create_id="SYN").count() == 50
+    assert CyclePosition.objects.filter(position___create_id="SYN").count() == 100
+    assert UserProfile.objects.filter(user__username__startswith="synthetic_").count() == 30
+    assert Bid.objects.count() == 500
+    assert Notification.objects.count() == 1000
+    assert Position.history.filter(_create_id="SYN").count() == 200
+    assert Position.objects.filter(_create_id="SYN", current_assignment__isnull=False).count() == 35
+    assert UserProfile.objects.filter(cdo__user__username="bench_cdo").exists()
+
+    # Generated data is only replaced explicitly
+    with pytest.raises(CommandError):
+        call_command("generate_synthetic_data", scale=0.001, seed=7)
+
+    # The same seed generates the same dataset
+    distribution = get_distribution()
+    call_command("generate_synthetic_data", scale=0.001, seed=7, flush=True)
+
+    assert get_distribution() == distribution
+    assert Bid.objects.count() == 500
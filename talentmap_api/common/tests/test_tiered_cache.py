@@ -0,0 +1,67 @@
+import pytest
+
+from talentmap_api.common.cache.backends import TieredCache
+
+
+@pytest.fixture
+def tiered_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "tiered_test_shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tiered_test_shared",
+        }
+    }
+
+    cache = TieredCache("tiered_test", {
+        "OPTIONS": {
+            "SHARED_CACHE": "tiered_test_shared",
+            "LOCAL_MAX_ENTRIES": 2,
+        }
+    })
+    cache.clear()
+    return cache
+
+
+def test_tiered_cache_set_get(tiered_cache):
+    tiered_cache.set("banana", {"fruit": True})
+
+    assert tiered_cache.get("banana") == {"fruit": True}
+    assert tiered_cache.shared.get("banana") == {"fruit": True}
+    assert tiered_cache.get("apple", "missing") == "missing"
+
+
+def test_tiered_cache_local_tier(tiered_cache):
+    tiered_cache.set("banana", 1)
+
+    # The local tier continues to serve the value
+    tiered_cache.shared.delete("banana")
+    assert tiered_cache.get("banana") == 1
+
+    # Values only in the shared tier are served from it
+    tiered_cache.shared.set("apple", 2)
+    assert tiered_cache.get("apple") == 2
+
+    tiered_cache.delete("banana")
+    assert tiered_cache.get("banana") is None
+
+
+def test_tiered_cache_local_eviction(tiered_cache):
+    tiered_cache.set("a", 1)
+    tiered_cache.set("b", 2)
+    tiered_cache.set("c", 3)
+
+    # "a" has been evicted from the local tier, so the shared tier is authoritative
+    tiered_cache.shared.set("a", 4)
+    tiered_cache.shared.set("c", 5)
+
+    assert tiered_cache.get("a") == 4
+    assert tiered_cache.get("c") == 3
+
+
+def test_tiered_cache_incr(tiered_cache):
+    tiered_cache.set("counter", 1)
+
+    assert tiered_cache.incr("counter") == 2
+    assert tiered_cache.get("counter") == 2
+    assert tiered_cache.add("counter", 5) is False
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from talentmap_api.common.metrics import get_registry
+
+
+def metrics_view(request):
+    '''
+    Returns the performance metrics in the Prometheus text exposition format, see talentmap_api.common.metrics
+
+    If METRICS_TOKEN is configured, the scraper must present it as a bearer token. Otherwise, only
+    staff users may view the metrics.
+    '''
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        if not constant_time_compare(request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"):
+            return HttpResponseForbidden()
+    elif not request.user.is_staff:
+        return HttpResponseForbidden()
+
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -11,6 +11,8 @@ import datetime
 from io import StringIO
 
 from talentmap_api.common.common_helpers import ensure_date, xml_etree_to_dict
+from talentmap_api.common.cache.generations import bump_model_generation
+from talentmap_api.common.search import update_search_documents
 
 
 class XMLloader():
@@ -119,6 +121,12 @@ class XMLloader():
             instance.save()
         new_instances = [instance.id for instance in new_instances]
 
+        # Updates are made in bulk, without signals, so invalidate any cached data and update search documents ourselves
+        if updated_instances:
+            bump_model_generation(self.model)
+            if hasattr(self.model, "search_document_fields"):
+                update_search_documents(self.model.objects.filter(id__in=updated_instances))
+
         # Create our instances
         return (new_instances, updated_instances)
 
@@ -265,6 +273,12 @@ class CSVloader():
             instance.save()
         new_instances = [instance.id for instance in new_instances]
 
+        # Updates are made in bulk, without signals, so invalidate any cached data and update search documents ourselves
+        if updated_instances:
+            bump_model_generation(self.model)
+            if hasattr(self.model, "search_document_fields"):
+                update_search_documents(self.model.objects.filter(id__in=updated_instances))
+
         # Create our instances
         return (new_instances, updated_instances)
 
@@ -21,6 +21,9 @@ def pytest_configure():
     test_cache = {
         'default': {
             'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
         }
     }
     settings.CACHES = test_cache
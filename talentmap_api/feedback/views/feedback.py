@@ -4,7 +4,7 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 from talentmap_api.common.permissions import isDjangoGroupMember
 
 from talentmap_api.feedback.models import FeedbackEntry
@@ -14,7 +14,7 @@ from talentmap_api.feedback.serializers import FeedbackEntrySerializer
 
 class FeedbackUserView(FieldLimitableSerializerMixin,
                        GenericViewSet,
-                       mixins.ListModelMixin,
+                       StreamingListModelMixin,
                        mixins.CreateModelMixin):
     """
     Endpoint for creating a new feedback item, open to all authenticated users
@@ -39,7 +39,7 @@ class FeedbackUserView(FieldLimitableSerializerMixin,
 
 class FeedbackAdminView(FieldLimitableSerializerMixin,
                         GenericViewSet,
-                        mixins.ListModelMixin,
+                        StreamingListModelMixin,
                         mixins.DestroyModelMixin,
                         mixins.RetrieveModelMixin):
     """
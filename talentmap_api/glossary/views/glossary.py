@@ -4,7 +4,7 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 from talentmap_api.common.common_helpers import in_group_or_403
 
 from talentmap_api.glossary.models import GlossaryEntry
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 class GlossaryView(FieldLimitableSerializerMixin,
                    GenericViewSet,
                    mixins.CreateModelMixin,
-                   mixins.ListModelMixin,
+                   StreamingListModelMixin,
                    mixins.RetrieveModelMixin,
                    mixins.UpdateModelMixin):
     """
@@ -5,6 +5,7 @@ import logging
 from django.core.management import call_command
 
 from talentmap_api.integrations.models import SynchronizationJob
+from talentmap_api.position.models import similar_position_updates
 
 
 class Command(BaseCommand):
@@ -30,18 +31,22 @@ class Command(BaseCommand):
         if options['model']:
             jobs = jobs.filter(talentmap_model=options['model'])
 
-        item_count = 0
-        for job in list(jobs.all()):
-            if options['test']:
-                self.logger.info("Running in test mode")
-                item_count += job.synchronize(test=True)
-            else:  # pragma: no cover
-                item_count += job.synchronize()
+        # Similar positions are recomputed once, after all jobs, rather than per synchronized position
+        with similar_position_updates.deferred():
+            item_count = 0
+            for job in list(jobs.all()):
+                if options['test']:
+                    self.logger.info("Running in test mode")
+                    item_count += job.synchronize(test=True)
+                else:  # pragma: no cover
+                    item_count += job.synchronize()
+
+            self.logger.info(f"Updated or created {item_count} items")
+            if item_count != 0:
+                self.logger.info("Now updating relationships...")
+                call_command('update_relationships')
 
-        self.logger.info(f"Updated or created {item_count} items")
         if item_count != 0:
-            self.logger.info("Now updating relationships...")
-            call_command('update_relationships')
             self.logger.info("Updating string representations...")
             call_command("update_string_representations")
             self.logger.info("Clearing cache...")
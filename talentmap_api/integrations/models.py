@@ -16,6 +16,7 @@ from talentmap_api.integrations.synchronization_helpers import get_synchronizati
 from talentmap_api.common.xml_helpers import XMLloader
 from talentmap_api.common.common_helpers import ensure_date
 from talentmap_api.settings import get_delineated_environment_variable
+from talentmap_api.position.models import current_assignment_updates
 
 
 class SynchronizationJob(models.Model):
@@ -140,7 +141,9 @@ class SynchronizationJob(models.Model):
                         break
                     data_elapsed_time = (datetime.datetime.now() - pre_data_time).total_seconds()
                     logger.info(f"Retrieved SOAP response in {data_elapsed_time} seconds")
-                    newer_ids, updateder_ids = loader.create_models_from_xml(response_xml, raw_string=True)
+                    # Positions' current assignments are updated once per page, rather than per loaded assignment
+                    with current_assignment_updates.deferred():
+                        newer_ids, updateder_ids = loader.create_models_from_xml(response_xml, raw_string=True)
 
                     # If there are no new or updated ids on this page, we've reached the end
                     # Also, if the loader has no last pagination start key, we break
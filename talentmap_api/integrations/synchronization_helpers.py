@@ -18,6 +18,7 @@ import defusedxml.lxml as ET
 from django.conf import settings
 
 from talentmap_api.common.common_helpers import ensure_date, safe_navigation
+from talentmap_api.common.cache.generations import bump_model_generation
 from talentmap_api.common.xml_helpers import parse_boolean, parse_date, get_nested_tag, xml_etree_to_dict, set_foreign_key_by_filters
 
 from talentmap_api.settings import get_delineated_environment_variable
@@ -478,6 +479,7 @@ def mode_cycles(last_updated_date=None):
                         cycle_position.update(status_code='OP', status='OP')
                     elif new_status == 'C':
                         cycle_position.update(status_code='MC', status='MC')
+                    bump_model_generation(CyclePosition)
 
         instance, updated = loader.default_xml_action(tag, new_instances, updated_instances)
 
@@ -553,25 +555,27 @@ def mode_cycle_positions(last_updated_date=None):
                 tod = position.tour_of_duty
                 if not tod:
                     tod = safe_navigation(position, "post.tour_of_duty")
+                # The stored current assignment may be pending a deferred update, so find the latest directly
+                current_assignment = position.assignments.order_by('-start_date').first()
                 if ted and tod and tod.months:
                     cycle_position.ted = ted
                     start_date = ted - relativedelta(months=tod.months)
-                    if not position.current_assignment:
+                    if not current_assignment:
                         Assignment.objects.create(position=position, start_date=start_date, tour_of_duty=tod, status="active")
                     else:
-                        position.current_assignment.start_date = start_date
-                        position.current_assignment.tour_of_duty = tod
-                        position.current_assignment.save()
+                        current_assignment.start_date = start_date
+                        current_assignment.tour_of_duty = tod
+                        current_assignment.save()
                 elif ted:
                     cycle_position.ted = ted
                     logger.warning(f"Attepting to set position {position} TED to {data['TED']} but no position or post TOD is available - start date will not be set")
-                    if not position.current_assignment:
+                    if not current_assignment:
                         Assignment.objects.create(position=position, estimated_end_date=ted, status="active")
                     else:
-                        position.current_assignment.estimated_end_date = ted
-                        position.current_assignment.state_date = None
-                        position.current_assignment.tour_of_duty = None
-                        position.current_assignment.save()
+                        current_assignment.estimated_end_date = ted
+                        current_assignment.state_date = None
+                        current_assignment.tour_of_duty = None
+                        current_assignment.save()
                 else:
                     logger.warning(f"Attempting to set position {position} TED, but TED is {ted}")
             cycle_position.save()
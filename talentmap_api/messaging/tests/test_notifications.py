@@ -78,3 +78,27 @@ def test_notification_delete(authorized_client, authorized_user):
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert Notification.objects.count() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_cursor_pagination(authorized_client, authorized_user):
+    mommy.make(Notification, owner=authorized_user.profile, _quantity=5)
+
+    response = authorized_client.get('/api/v1/notification/?cursor=&limit=2')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 2
+    assert response.data["previous"] is None
+
+    seen = [x["id"] for x in response.data["results"]]
+    while response.data["next"]:
+        response = authorized_client.get(response.data["next"])
+        seen += [x["id"] for x in response.data["results"]]
+
+    assert sorted(seen) == sorted(Notification.objects.filter(owner=authorized_user.profile).values_list("id", flat=True))
+
+    # Page number pagination is unchanged
+    response = authorized_client.get('/api/v1/notification/?limit=2')
+
+    assert response.data["count"] == 5
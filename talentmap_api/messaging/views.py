@@ -10,7 +10,7 @@ from rest_framework import status
 
 from rest_framework.permissions import IsAuthenticated
 
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.messaging.models import Notification, Sharable, Task
@@ -20,7 +20,7 @@ from talentmap_api.messaging.serializers import NotificationSerializer, Sharable
 
 class NotificationView(FieldLimitableSerializerMixin,
                        GenericViewSet,
-                       mixins.ListModelMixin,
+                       StreamingListModelMixin,
                        mixins.RetrieveModelMixin,
                        mixins.UpdateModelMixin,
                        mixins.DestroyModelMixin):
@@ -41,16 +41,18 @@ class NotificationView(FieldLimitableSerializerMixin,
     serializer_class = NotificationSerializer
     filter_class = NotificationFilter
     permission_classes = (IsAuthenticated,)
+    # The cursor seeks on a unique key; update dates may be shared
+    cursor_ordering = "id"
 
     def get_queryset(self):
         queryset = Notification.objects.filter(owner=self.request.user.profile)
-        self.serializer_class.prefetch_model(Notification, queryset)
+        queryset = self.serializer_class.prefetch_model(Notification, queryset)
         return queryset
 
 
 class TaskView(FieldLimitableSerializerMixin,
                GenericViewSet,
-               mixins.ListModelMixin,
+               StreamingListModelMixin,
                mixins.RetrieveModelMixin,
                mixins.UpdateModelMixin,
                mixins.DestroyModelMixin):
@@ -74,7 +76,7 @@ class TaskView(FieldLimitableSerializerMixin,
 
     def get_queryset(self):
         queryset = Task.objects.filter(owner=self.request.user.profile)
-        self.serializer_class.prefetch_model(Task, queryset)
+        queryset = self.serializer_class.prefetch_model(Task, queryset)
         return queryset
 
 
@@ -30,6 +30,10 @@ class OrganizationSerializer(PrefetchedSerializer):
     class Meta:
         model = Organization
         fields = "__all__"
+        field_dependencies = {
+            "bureau_organization": ["bureau_organization", "_parent_bureau_code"],
+            "parent_organization": ["parent_organization", "_parent_organization_code"],
+        }
 
 
 class OrganizationGroupSerializer(PrefetchedSerializer):
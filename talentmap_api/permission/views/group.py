@@ -18,13 +18,13 @@ from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.permission.serializers import PermissionGroupSerializer, PermissionGroupMembersSerializer
 from talentmap_api.permission.filters import GroupFilter
 
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin, StreamingListModelMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class PermissionGroupView(mixins.ListModelMixin,
+class PermissionGroupView(StreamingListModelMixin,
                           mixins.RetrieveModelMixin,
                           ActionDependentSerializerMixin,
                           FieldLimitableSerializerMixin,
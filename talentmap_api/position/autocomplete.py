@@ -0,0 +1,124 @@
+'''
+An in-memory prefix index of position search suggestions, for typeahead.
+
+Each process holds its own index, built from the listed positions, and rebuilt once any table
+or position column it is derived from changes, such as after a synchronization (see GenerationalValue).
+'''
+import bisect
+import heapq
+import re
+
+from django.db.models import Count
+
+from talentmap_api.bidding.models import BidCycle, CyclePosition
+from talentmap_api.common.cache.generations import GenerationalValue, get_column_tables
+from talentmap_api.language.models import Language, Qualification
+from talentmap_api.organization.models import Country, Location, Organization, Post
+from talentmap_api.position.models import Position, Skill
+
+# Suggestion categories, and the field path of their text
+SOURCES = [
+    ("title", "title"),
+    ("position_number", "position_number"),
+    ("city", "post__location__city"),
+    ("country", "post__location__country__name"),
+    ("skill", "skill__description"),
+    ("bureau", "bureau__long_description"),
+    ("language", "languages__language__long_description"),
+]
+
+# The models the index is derived from, and the columns of positions it reads; changes to other
+# position columns, such as the availability or search document, don't rebuild it
+SOURCE_MODELS = [Position.languages.through, CyclePosition, BidCycle, Post, Location, Country, Skill, Organization, Qualification, Language]
+SOURCE_COLUMNS = get_column_tables(Position, "title", "position_number", "post", "skill", "bureau")
+
+# Suggestions for prefixes up to this length are precomputed, as they match much of the index
+PRECOMPUTED_PREFIX_LENGTH = 2
+MAX_LIMIT = 50
+
+WORD_REGEX = re.compile(r"\w+")
+
+
+def normalize(text):
+    return " ".join(WORD_REGEX.findall(text.lower()))
+
+
+class PrefixIndex(object):
+    '''
+    A sorted array of keys, supporting lookups of the highest weighted suggestions with a key
+    beginning with a prefix. Every word of a suggestion begins a key, so that suggestions
+    match by the start of any word.
+    '''
+
+    def __init__(self, suggestions):
+        '''
+        Args:
+            - suggestions (list) - The suggestions, as (text, category, weight) tuples
+        '''
+        self.suggestions = suggestions
+
+        entries = []
+        for index, (text, _, _) in enumerate(suggestions):
+            words = normalize(text).split(" ")
+            for i in range(len(words)):
+                entries.append((" ".join(words[i:]), index))
+        entries.sort()
+
+        self.keys = [x[0] for x in entries]
+        self.entries = [x[1] for x in entries]
+
+        self.precomputed = {}
+        for key, index in entries:
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                self.precomputed.setdefault(key[:length], set()).add(index)
+        self.precomputed = {prefix: self.rank(indices, MAX_LIMIT) for prefix, indices in self.precomputed.items()}
+
+    def rank(self, indices, limit):
+        return heapq.nsmallest(limit, indices, key=lambda x: (-self.suggestions[x][2], self.suggestions[x][0]))
+
+    def lookup(self, prefix, limit=10):
+        '''
+        Returns the highest weighted suggestions with a word beginning with the prefix
+
+        Args:
+            - prefix (str) - The prefix
+            - limit (int) - The maximum number of suggestions
+
+        Returns:
+            - list - The suggestions, as (text, category, weight) tuples, in descending weight
+        '''
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        if prefix in self.precomputed:
+            indices = self.precomputed[prefix]
+        else:
+            start = bisect.bisect_left(self.keys, prefix)
+            end = bisect.bisect_right(self.keys, prefix + "\uffff", start)
+            indices = set(self.entries[start:end])
+
+        return [self.suggestions[x] for x in self.rank(indices, limit)]
+
+
+def build_index():
+    '''
+    Builds the prefix index from the listed positions; suggestions are weighted by the number of
+    positions they match
+    '''
+    positions = Position.get_listed()
+    suggestions = []
+    for category, path in SOURCES:
+        counts = positions.exclude(**{f"{path}__isnull": True}).exclude(**{path: ""}).order_by().values_list(path).annotate(count=Count("id", distinct=True))
+        suggestions.extend((text, category, count) for text, count in counts)
+    return PrefixIndex(suggestions)
+
+
+_index = GenerationalValue(build_index, SOURCE_MODELS, SOURCE_COLUMNS)
+
+
+def get_index():
+    '''
+    Returns this process's prefix index, rebuilding it if its data has changed
+    '''
+    return _index.get()
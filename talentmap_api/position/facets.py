@@ -0,0 +1,331 @@
+'''
+An in-memory bitmap index of the listed positions' facets, answering common position filters
+without the nested subqueries of PositionFilter.
+
+Each listed position is assigned a bit, and each value of each facet holds the bitset (an int)
+of the positions with that value. A filter is the intersection of, for each filtered facet, the
+union of the bitsets of its accepted values. Each process holds its own index, rebuilt once any
+table or position column it is derived from changes, such as after a synchronization (see GenerationalValue).
+'''
+import hashlib
+import json
+
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework_filters.backends import DjangoFilterBackend
+
+from talentmap_api.bidding.models import BidCycle, CyclePosition
+from talentmap_api.common.cache.generations import GenerationalValue, get_column_tables, get_generations, get_model_tables, get_query_tables
+from talentmap_api.language.models import Language, Qualification
+from talentmap_api.organization.models import Country, Location, Organization, Post, TourOfDuty
+from talentmap_api.position.filters import PositionFilter
+from talentmap_api.position.models import Grade, Position, Skill
+
+# Facets, and the field path of their value
+FACETS = {
+    "grade": "grade__code",
+    "skill": "skill__code",
+    "cone": "skill__cone_id",
+    "bureau": "bureau__code",
+    "organization": "organization__code",
+    "post": "post_id",
+    "country": "post__location__country__code",
+    "tour_of_duty": "post__tour_of_duty__code",
+    "differential_rate": "post__differential_rate",
+    "danger_pay": "post__danger_pay",
+    "is_overseas": "is_overseas",
+    "accepting_bids": "accepting_bids",
+}
+LANGUAGE_FACET = "language"
+# The language facet value of positions without language requirements, as in PositionFilter.language_codes
+NO_LANGUAGE = "NONE"
+
+# Filter parameters answered by the index, and their facet
+FILTERS = {
+    "grade__code": "grade",
+    "skill__code": "skill",
+    "skill__cone": "cone",
+    "skill__cone__id": "cone",
+    "bureau__code": "bureau",
+    "organization__code": "organization",
+    "post": "post",
+    "post__id": "post",
+    "post__location__country__code": "country",
+    "post__tour_of_duty__code": "tour_of_duty",
+    "post__differential_rate": "differential_rate",
+    "post__danger_pay": "danger_pay",
+    "is_overseas": "is_overseas",
+    "accepting_bids": "accepting_bids",
+}
+INTEGER_FACETS = ["cone", "post", "differential_rate", "danger_pay"]
+BOOLEAN_FACETS = ["is_overseas", "accepting_bids"]
+INTEGER_COMPARISONS = {
+    "gt": lambda x, y: x > y,
+    "gte": lambda x, y: x >= y,
+    "lt": lambda x, y: x < y,
+    "lte": lambda x, y: x <= y,
+}
+BOOLEANS = {"true": True, "True": True, "1": True, "false": False, "False": False, "0": False}
+
+# Parameters which don't filter, and so don't prevent the use of the index
+NON_FILTER_PARAMETERS = ["page", "limit", "cursor", "ordering", "format", "include", "exclude", "fields", "count", "stream", "export"]
+
+FACET_COUNTS_CACHE_PREFIX = "facet_counts"
+FACET_COUNTS_CACHE_TIMEOUT = 86400  # 1 day
+
+# The models the index is derived from, and the columns of positions it reads; changes to other
+# position columns, such as the search document, don't rebuild it
+SOURCE_MODELS = [Position.languages.through, CyclePosition, BidCycle, Post, Location, Country, TourOfDuty, Grade, Skill, Organization,
+                 Qualification, Language]
+SOURCE_COLUMNS = get_column_tables(Position, "grade", "skill", "bureau", "organization", "post", "is_overseas", "accepting_bids")
+
+
+class FacetIndex(object):
+    '''
+    Bitsets of positions per facet value
+    '''
+
+    def __init__(self, positions, languages):
+        '''
+        Args:
+            - positions (list) - The positions, as dictionaries of id and the value of each facet
+            - languages (list) - The positions' language requirements, as (position id, language code) tuples
+        '''
+        self.ids = sorted(x["id"] for x in positions)
+        self.bits = bits = {position_id: i for i, position_id in enumerate(self.ids)}
+        self.all = (1 << len(self.ids)) - 1
+
+        self.facets = {facet: defaultdict(int) for facet in list(FACETS) + [LANGUAGE_FACET]}
+        for position in positions:
+            bit = 1 << bits[position["id"]]
+            for facet in FACETS:
+                self.facets[facet][position[facet]] |= bit
+
+        with_language = 0
+        for position_id, code in languages:
+            if position_id in bits:
+                self.facets[LANGUAGE_FACET][code] |= 1 << bits[position_id]
+                with_language |= 1 << bits[position_id]
+        self.facets[LANGUAGE_FACET][NO_LANGUAGE] = self.all & ~with_language
+
+        self.facets = {facet: dict(values) for facet, values in self.facets.items()}
+
+    def get_bitset(self, facet, values):
+        '''
+        Returns the bitset of positions with any of the values of the facet
+        '''
+        bitset = 0
+        for value in values:
+            bitset |= self.facets[facet].get(value, 0)
+        return bitset
+
+    def get_ids(self, bitset):
+        '''
+        Returns the ids of the positions in the bitset, in ascending order
+        '''
+        return [self.ids[i] for i, bit in enumerate(reversed(bin(bitset)[2:])) if bit == "1"]
+
+    def get_ids_bitset(self, ids):
+        '''
+        Returns the bitset of the positions with the specified ids; ids not in the index are ignored
+        '''
+        bitset = 0
+        for position_id in ids:
+            if position_id in self.bits:
+                bitset |= 1 << self.bits[position_id]
+        return bitset
+
+    @staticmethod
+    def count(bitset):
+        return bin(bitset).count("1")
+
+    def get_counts(self, bitset):
+        '''
+        Returns the number of positions in the bitset with each value of each facet
+
+        Returns:
+            - dict - The counts of each facet, as a list of value and count dictionaries in descending
+                     count, omitting values with no positions
+        '''
+        counts = {}
+        for facet, values in self.facets.items():
+            facet_counts = [(value, self.count(bitset & x)) for value, x in values.items() if value is not None]
+            counts[facet] = [{"value": value, "count": count} for value, count in sorted(facet_counts, key=lambda x: (-x[1], str(x[0]))) if count]
+        return counts
+
+    def filter(self, query_params):
+        '''
+        Evaluates filter parameters against the index
+
+        Args:
+            - query_params (QueryDict) - The filter parameters
+
+        Returns:
+            - int - The bitset of the matching positions, or None if any of the parameters can't
+                    be answered by the index, or no parameter filters
+        '''
+        bitset = None
+        for parameter in query_params:
+            value = query_params.get(parameter)
+            if parameter in NON_FILTER_PARAMETERS or value == "":
+                continue
+
+            matches = self.evaluate(parameter, value)
+            if matches is None:
+                return None
+            bitset = matches if bitset is None else bitset & matches
+
+        return bitset
+
+    def evaluate(self, parameter, value):
+        '''
+        Returns the bitset of positions matching a single filter parameter, or None if it can't be answered
+        '''
+        if parameter == "language_codes":
+            return self.get_bitset(LANGUAGE_FACET, value.split(","))
+
+        if parameter == "is_domestic":
+            return None if value not in BOOLEANS else self.get_bitset("is_overseas", [not BOOLEANS[value]])
+
+        lookup = "exact"
+        if parameter not in FILTERS and LOOKUP_SEP in parameter:
+            parameter, lookup = parameter.rsplit(LOOKUP_SEP, 1)
+
+        facet = FILTERS.get(parameter, None)
+        if facet is None:
+            return None
+
+        if facet in BOOLEAN_FACETS:
+            return None if lookup != "exact" or value not in BOOLEANS else self.get_bitset(facet, [BOOLEANS[value]])
+
+        if lookup == "exact":
+            # Commas are literal in exact lookups, which are better left to the database
+            values = [value] if "," not in value else None
+        elif lookup == "in":
+            values = value.split(",")
+        elif lookup in INTEGER_COMPARISONS and facet in INTEGER_FACETS:
+            values = [value]
+        else:
+            return None
+
+        if values is None:
+            return None
+
+        if facet in INTEGER_FACETS:
+            try:
+                values = [int(x) for x in values]
+            except ValueError:
+                return None
+            if lookup in INTEGER_COMPARISONS:
+                compare = INTEGER_COMPARISONS[lookup]
+                values = [x for x in self.facets[facet] if x is not None and compare(x, values[0])]
+
+        return self.get_bitset(facet, values)
+
+
+def build_index():
+    '''
+    Builds the facet index from the listed positions
+    '''
+    listed = Position.get_listed()
+    facets = list(FACETS)
+    positions = [dict(zip(["id"] + facets, x)) for x in listed.order_by().values_list("id", *[FACETS[x] for x in facets])]
+    languages = list(listed.exclude(languages__isnull=True).order_by().values_list("id", "languages__language__code"))
+    return FacetIndex(positions, languages)
+
+
+_index = GenerationalValue(build_index, SOURCE_MODELS, SOURCE_COLUMNS)
+
+
+def get_index():
+    '''
+    Returns this process's facet index, rebuilding it if its data has changed
+    '''
+    return _index.get()
+
+
+def get_canonical_parameters(query_params):
+    '''
+    Returns the filtering parameters, ordered so that equivalent requests are equal
+
+    Args:
+        - query_params (QueryDict) - The filter parameters
+
+    Returns:
+        - list - The (parameter, values) pairs, in parameter order
+    '''
+    parameters = []
+    for parameter in sorted(query_params):
+        if parameter in NON_FILTER_PARAMETERS:
+            continue
+        values = sorted(x for x in query_params.getlist(parameter) if x != "")
+        if parameter == "language_codes" or parameter.endswith(f"{LOOKUP_SEP}in"):
+            values = [",".join(sorted(x.split(","))) for x in values]
+        if values:
+            parameters.append((parameter, values))
+    return parameters
+
+
+def get_facet_counts(query_params, request=None):
+    '''
+    Returns the number of listed positions matching the filter parameters, and the counts per value
+    of each facet among them, in a single pass over the facet index.
+
+    Filters the index can't answer are evaluated by PositionFilter, and the matching ids counted
+    from the index. Counts are cached by the canonical filter parameters and the generations of
+    the tables they were derived from.
+
+    Args:
+        - query_params (QueryDict) - The filter parameters
+        - request (Request) - The request, if any
+
+    Returns:
+        - dict - The count of positions, and the counts of each facet
+    '''
+    index = get_index()
+    bitset = index.filter(query_params)
+
+    queryset = None
+    tables = set(get_model_tables(*SOURCE_MODELS) + SOURCE_COLUMNS)
+    if bitset is None and get_canonical_parameters(query_params):
+        queryset = PositionFilter.get_subset(query_params)(data=query_params, queryset=Position.get_listed(), request=request).qs
+        tables.update(get_query_tables(queryset.query.sql_with_params()[0]))
+
+    key_data = json.dumps([get_canonical_parameters(query_params), sorted(get_generations(tables).items())], default=str)
+    key = f"{FACET_COUNTS_CACHE_PREFIX}:{hashlib.md5(key_data.encode('utf-8')).hexdigest()}"  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
+
+    counts = cache.get(key)
+    if counts is None:
+        if queryset is not None:
+            bitset = index.get_ids_bitset(queryset.order_by().values_list("id", flat=True).distinct())
+        elif bitset is None:
+            bitset = index.all
+        counts = {
+            "count": index.count(bitset),
+            "facets": index.get_counts(bitset),
+        }
+        cache.set(key, counts, FACET_COUNTS_CACHE_TIMEOUT)
+
+    return counts
+
+
+class FacetIndexFilterMixin(object):
+    '''
+    Answers filter requests from the facet index when every filter parameter is supported by it,
+    filtering the queryset to the matching ids in place of the filter set. Other filter backends,
+    such as ordering, still apply.
+    '''
+
+    def filter_queryset(self, queryset):
+        index = get_index()
+        bitset = index.filter(self.request.query_params)
+        if bitset is None:
+            return super(FacetIndexFilterMixin, self).filter_queryset(queryset)
+
+        queryset = queryset.filter(id__in=index.get_ids(bitset))
+        for backend in self.filter_backends:
+            if not issubclass(backend, DjangoFilterBackend):
+                queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
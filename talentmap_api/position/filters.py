@@ -58,7 +58,8 @@ class CapsuleDescriptionFilter(filters.FilterSet):
     q = filters.CharFilter(name="content", method=full_text_search(
         fields=[
             "content"
-        ]
+        ],
+        document="search"
     ))
 
     class Meta:
@@ -97,6 +98,8 @@ class PositionFilter(filters.FilterSet):
 
     is_domestic = filters.BooleanFilter(name="is_overseas", lookup_expr="exact", exclude=True)
     is_highlighted = filters.BooleanFilter(name="highlighted_by_org", lookup_expr="isnull", exclude=True)
+    # Declared, as filters aren't generated for non-editable fields
+    accepting_bids = filters.BooleanFilter(name="accepting_bids", lookup_expr="exact")
     org_has_groups = NumberInFilter(name='organization__groups', lookup_expr='in')
 
     # Full text search across multiple fields
@@ -116,7 +119,8 @@ class PositionFilter(filters.FilterSet):
             "post__location__state",
             "description__content",
             "position_number"
-        ]
+        ],
+        document="search"
     ))
 
     vacancy_in_years = filters.NumberFilter(name="current_assignment__estimated_end_date", method="filter_vacancy_in_years")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+import logging
+
+from talentmap_api.position.models import Position, update_availability
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the stored availability of all positions in their latest bid cycle'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', dest='batch_size', type=int, default=10000, help='The number of positions to update per batch')
+
+    def handle(self, *args, **options):
+        position_ids = list(Position.objects.order_by("id").values_list("id", flat=True))
+        batch_size = options['batch_size']
+
+        count = 0
+        for i in range(0, len(position_ids), batch_size):
+            count += update_availability(Position.objects.filter(id__in=position_ids[i:i + batch_size]))
+
+        self.logger.info(f"Updated the availability of {count} of {len(position_ids)} positions")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+import logging
+
+from talentmap_api.position.models import update_similar_positions
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the stored similar positions of all positions, such as after deploying or bulk imports'
+    logger = logging.getLogger(__name__)
+
+    def handle(self, *args, **options):
+        count = update_similar_positions()
+
+        self.logger.info(f"Updated the similar positions of {count} positions")
@@ -0,0 +1,69 @@
+# Generated by Django 2.0.4 on 2019-05-28 10:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from talentmap_api.common.search import get_search_document
+
+
+class Migration(migrations.Migration):
+    '''
+    Adds stored full text search documents to positions and capsule descriptions, with a GIN index
+    on the search vector and a trigram index on the (upper case) text for substring matching
+    '''
+
+    def populate_search_documents(apps, schema_editor):
+        from talentmap_api.position.models import Position as CurrentPosition, CapsuleDescription as CurrentCapsuleDescription
+
+        Position = apps.get_model('position', 'Position')
+        CapsuleDescription = apps.get_model('position', 'CapsuleDescription')
+        Position.objects.update(**get_search_document(Position, CurrentPosition.search_document_fields))
+        CapsuleDescription.objects.update(**get_search_document(CapsuleDescription, CurrentCapsuleDescription.search_document_fields))
+
+    dependencies = [
+        ('position', '0026_auto_20190521_1338'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='position',
+            name='search_text',
+            field=models.TextField(editable=False, help_text="The text of the position's search document", null=True),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text="The position's search document", null=True),
+        ),
+        migrations.AddField(
+            model_name='capsuledescription',
+            name='search_text',
+            field=models.TextField(editable=False, help_text="The text of the description's search document", null=True),
+        ),
+        migrations.AddField(
+            model_name='capsuledescription',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text="The description's search document", null=True),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='position_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='capsuledescription',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='capsule_search_vector_gin'),
+        ),
+        # icontains compares upper case text, so index the upper case text
+        migrations.RunSQL(
+            'CREATE INDEX position_search_text_trgm ON position_position USING gin (UPPER(search_text) gin_trgm_ops)',
+            'DROP INDEX position_search_text_trgm',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX capsule_search_text_trgm ON position_capsuledescription USING gin (UPPER(search_text) gin_trgm_ops)',
+            'DROP INDEX capsule_search_text_trgm',
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 2.0.4 on 2019-06-14 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    '''
+    Stores each position's availability in its latest bid cycle
+    '''
+
+    def populate_availability(apps, schema_editor):
+        # Evaluates each position in its latest bidcycle, as Position.get_availability does
+        Position = apps.get_model('position', 'Position')
+        schema_editor.execute(f'''
+            UPDATE {Position._meta.db_table} AS p
+            SET accepting_bids = a.accepting_bids, availability_reason = a.reason
+            FROM (
+                SELECT p.id,
+                       p.latest_bidcycle_id IS NOT NULL AND m.position_id IS NOT NULL AND b.status IS NULL AS accepting_bids,
+                       CASE
+                           WHEN p.latest_bidcycle_id IS NULL THEN 'This position is not in an available bid cycle'
+                           WHEN m.position_id IS NULL THEN 'Position not in specified bid cycle'
+                           WHEN b.status = 'handshake_accepted' THEN 'This position has an accepted handshake'
+                           WHEN b.status = 'in_panel' THEN 'This position is currently due for paneling'
+                           WHEN b.status = 'approved' THEN 'This position has been filled'
+                           ELSE ''
+                       END AS reason
+                FROM {Position._meta.db_table} AS p
+                LEFT JOIN bidding_bidcycle_positions AS m ON m.position_id = p.id AND m.bidcycle_id = p.latest_bidcycle_id
+                LEFT JOIN LATERAL (
+                    SELECT bid.status FROM bidding_bid AS bid
+                    JOIN bidding_cycleposition AS cp ON cp.id = bid.position_id
+                    WHERE cp.position_id = p.id AND cp.bidcycle_id = p.latest_bidcycle_id
+                    AND bid.status IN ('handshake_accepted', 'in_panel', 'approved')
+                    ORDER BY bid.update_date
+                    LIMIT 1
+                ) AS b ON TRUE
+            ) AS a
+            WHERE a.id = p.id
+        ''')
+
+    dependencies = [
+        ('bidding', '0017_auto_20190611_1912'),
+        ('position', '0027_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='position',
+            name='accepting_bids',
+            field=models.BooleanField(default=False, editable=False, help_text='Whether the position can accept new bids in its latest bid cycle'),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='availability_reason',
+            field=models.TextField(blank=True, default='This position is not in an available bid cycle', editable=False, help_text="Why the position can't accept new bids, if it can't"),
+        ),
+        migrations.RunPython(populate_availability, migrations.RunPython.noop),
+    ]
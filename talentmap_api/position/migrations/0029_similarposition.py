@@ -0,0 +1,36 @@
+# Generated by Django 2.0.4 on 2019-06-17 14:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    '''
+    Stores each position's precomputed similar positions; populated by the update_similar_positions command
+    '''
+
+    dependencies = [
+        ('bidding', '0017_auto_20190611_1912'),
+        ('position', '0028_position_availability'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarPosition',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.IntegerField(help_text='The rank of the similar position, from 0 for the most similar')),
+                ('score', models.IntegerField(help_text='The similarity score of the similar position')),
+                ('position', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_position_entries', to='position.Position')),
+                ('similar_position', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to_entries', to='position.Position')),
+            ],
+            options={
+                'ordering': ['position', 'rank'],
+                'managed': True,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='similarposition',
+            unique_together={('position', 'rank')},
+        ),
+    ]
@@ -1,9 +1,13 @@
 import itertools
 
-from django.db.models import OuterRef, Subquery
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db import connection, models, transaction
 from djchoices import DjangoChoices, ChoiceItem
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 from simple_history.models import HistoricalRecords
@@ -12,10 +16,17 @@ from dateutil.relativedelta import relativedelta
 
 import talentmap_api.bidding.models
 from talentmap_api.common.common_helpers import ensure_date, month_diff, safe_navigation
+from talentmap_api.common.cache.generations import bump_model_generation
+from talentmap_api.common.deferred import DeferredUpdate
 from talentmap_api.common.models import StaticRepresentationModel
-from talentmap_api.organization.models import Organization, Post
-from talentmap_api.language.models import Qualification
+from talentmap_api.common.search import update_search_documents
+from talentmap_api.organization.models import Country, Location, Organization, Post
+from talentmap_api.language.models import Language, Qualification
 from talentmap_api.bidding.models import CyclePosition
+from talentmap_api.position.similar import MIN_SIMILAR_POSITIONS, SimilarityIndex
+
+# The availability reason of positions not in an active bid cycle
+NOT_IN_AVAILABLE_BIDCYCLE = "This position is not in an available bid cycle"
 
 
 class Position(StaticRepresentationModel):
@@ -50,7 +61,15 @@ class Position(StaticRepresentationModel):
 
     latest_bidcycle = models.ForeignKey('bidding.BidCycle', on_delete=models.DO_NOTHING, related_name='latest_cycle_for_positions', null=True, help_text="The latest bid cycle this position is in")
 
-    history = HistoricalRecords()
+    # The stored availability of the position in its latest bid cycle, see update_availability
+    accepting_bids = models.BooleanField(default=False, editable=False, help_text="Whether the position can accept new bids in its latest bid cycle")
+    availability_reason = models.TextField(default=NOT_IN_AVAILABLE_BIDCYCLE, blank=True, editable=False, help_text="Why the position can't accept new bids, if it can't")
+
+    # The stored full text search document, see talentmap_api.common.search
+    search_text = models.TextField(null=True, editable=False, help_text="The text of the position's search document")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="The position's search document")
+
+    history = HistoricalRecords(excluded_fields=["search_text", "search_vector", "accepting_bids", "availability_reason"])
 
     create_date = models.DateTimeField(null=True, help_text="The creation date of the position")
     update_date = models.DateTimeField(null=True, help_text="The update date of this position")
@@ -84,28 +103,42 @@ class Position(StaticRepresentationModel):
     _jobcode_code = models.TextField(null=True)
     _occ_series_code = models.TextField(null=True)
 
+    # The search document's fields and their weights; identifying fields rank highest
+    search_document_fields = [
+        ("title", "A"),
+        ("position_number", "A"),
+        ("skill__description", "B"),
+        ("skill__code", "B"),
+        ("organization__long_description", "B"),
+        ("bureau__long_description", "B"),
+        ("post__location__city", "B"),
+        ("post__location__country__name", "B"),
+        ("languages__language__long_description", "C"),
+        ("languages__language__code", "C"),
+        ("post__location__code", "C"),
+        ("post__location__country__code", "C"),
+        ("post__location__state", "C"),
+        ("description__content", "D"),
+    ]
+
+    # Columns whose changes bump their own generations, for the in-memory indexes derived from them
+    # (see talentmap_api.position.facets and talentmap_api.position.autocomplete)
+    column_generation_fields = ["title", "position_number", "grade", "skill", "bureau", "organization", "post", "is_overseas", "accepting_bids"]
+
+    @staticmethod
+    def get_listed():
+        '''
+        Returns a queryset of the listed positions; those open or with a handshake in an active bid cycle
+        '''
+        position_ids = CyclePosition.objects.filter(bidcycle__active=True, status_code__in=["HS", "OP"]).values_list("position_id", flat=True)
+        return Position.objects.filter(id__in=position_ids)
+
     @property
     def similar_positions(self):
         '''
-        Returns a query set of similar positions, using the base criteria.
-        If there are not at least 3 results, the criteria is loosened.
+        Returns a query set of similar positions, most similar first, as precomputed by update_similar_positions
         '''
-        base_criteria = {
-            "post__location__country__id": safe_navigation(self, "post.location.country.id"),
-            "skill__code": safe_navigation(self, "skill.code"),
-            "grade__code": safe_navigation(self, "grade.code"),
-        }
-
-        q_obj = models.Q(**base_criteria)
-        position_ids = talentmap_api.bidding.models.CyclePosition.objects.filter(status_code__in=["HS", "OP"]).values_list("position_id", flat=True)
-        all_pos_queryset = Position.objects.filter(id__in=position_ids)
-        queryset = all_pos_queryset.filter(q_obj).exclude(id=self.id)
-
-        while queryset.count() < 3:
-            del base_criteria[list(base_criteria.keys())[0]]
-            q_obj = models.Q(**base_criteria)
-            queryset = all_pos_queryset.filter(q_obj).exclude(id=self.id)
-        return queryset
+        return Position.objects.filter(similar_to_entries__position=self).order_by("similar_to_entries__rank")
 
     def __str__(self):
         return f"[{self.position_number}] {self.title} ({self.post})"
@@ -113,19 +146,40 @@ class Position(StaticRepresentationModel):
     @property
     def availability(self):
         '''
-        Evaluates if this position can accept new bids in it's latest bidcycle
+        Returns whether this position can accept new bids in it's latest bidcycle, as stored
         '''
-        if self.latest_bidcycle:
-            available, reason = self.can_accept_new_bids(self.latest_bidcycle)
-            return {
-                "availability": available,
-                "reason": reason,
-            }
-        else:
-            return {
-                "availability": False,
-                "reason": "This position is not in an available bid cycle",
+        return {
+            "availability": self.accepting_bids,
+            "reason": self.availability_reason,
+        }
+
+    @staticmethod
+    def get_availability(in_bidcycle, unavailable_status=None):
+        '''
+        Evaluates if a position can accept new bids for a bidcycle
+
+        Args:
+            - in_bidcycle (Boolean) - Whether the position is in the bidcycle's position list
+            - unavailable_status (String) - The status of the position's bid in the bidcycle which makes it unavailable, if any
+
+        Returns:
+            - Boolean - True if the position can accept new bids for the cycle, otherwise False
+            - String - An explanation of why this position is not biddable
+        '''
+        if not in_bidcycle:
+            # We must be in the bidcycle's position list
+            return False, "Position not in specified bid cycle"
+
+        if unavailable_status:
+            messages = {
+                talentmap_api.bidding.models.Bid.Status.handshake_offered: "This position has an outstanding handshake",
+                talentmap_api.bidding.models.Bid.Status.handshake_accepted: "This position has an accepted handshake",
+                talentmap_api.bidding.models.Bid.Status.in_panel: "This position is currently due for paneling",
+                talentmap_api.bidding.models.Bid.Status.approved: "This position has been filled",
             }
+            return False, messages[unavailable_status]
+
+        return True, ""
 
     def can_accept_new_bids(self, bidcycle):
         '''
@@ -143,22 +197,13 @@ class Position(StaticRepresentationModel):
         #     # We must be looking at an active bidcycle
         #     return False, "Bid cycle is not open"
         if not bidcycle.positions.filter(id=self.id).exists():
-            # We must be in the bidcycle's position list
-            return False, "Position not in specified bid cycle"
+            return Position.get_availability(False)
 
         # Filter this positions bid by bidcycle and our Q object
         q_obj = talentmap_api.bidding.models.Bid.get_unavailable_status_filter()
-        fulfilling_bids = CyclePosition.objects.filter(bidcycle=bidcycle, position=self).values_list('bids').filter(q_obj)
-        if fulfilling_bids.exists():
-            messages = {
-                talentmap_api.bidding.models.Bid.Status.handshake_offered: "This position has an outstanding handshake",
-                talentmap_api.bidding.models.Bid.Status.handshake_accepted: "This position has an accepted handshake",
-                talentmap_api.bidding.models.Bid.Status.in_panel: "This position is currently due for paneling",
-                talentmap_api.bidding.models.Bid.Status.approved: "This position has been filled",
-            }
-            return False, messages[fulfilling_bids.first().status]
+        fulfilling_bid = talentmap_api.bidding.models.Bid.objects.filter(q_obj, position__bidcycle=bidcycle, position__position=self).order_by("update_date").first()
 
-        return True, ""
+        return Position.get_availability(True, safe_navigation(fulfilling_bid, "status"))
 
     def update_relationships(self):
         '''
@@ -209,6 +254,9 @@ class Position(StaticRepresentationModel):
     class Meta:
         managed = True
         ordering = ["position_number"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="position_search_vector_gin"),
+        ]
 
 
 class PositionBidStatistics(StaticRepresentationModel):
@@ -227,19 +275,53 @@ class PositionBidStatistics(StaticRepresentationModel):
     has_handshake_accepted = models.BooleanField(default=False)
 
     def update_statistics(self):
-        bidcycle_bids = self.position.bids.filter(bidcycle=self.position.bidcycle)
-        self.total_bids = bidcycle_bids.count()
-        self.in_grade = bidcycle_bids.filter(user__grade=self.position.position.grade).count()
-        self.at_skill = bidcycle_bids.filter(user__skills=self.position.position.skill).count()
-        self.in_grade_at_skill = bidcycle_bids.filter(user__grade=self.position.position.grade, user__skills=self.position.position.skill).count()
-        self.has_handshake_offered = any(x.status == talentmap_api.bidding.models.Bid.Status.handshake_offered for x in bidcycle_bids)
-        self.has_handshake_accepted = any(x.status == talentmap_api.bidding.models.Bid.Status.handshake_accepted for x in bidcycle_bids)
+        '''
+        Recomputes the statistics from the position's bids in its bidcycle, in a single aggregate query
+        '''
+        Bid = talentmap_api.bidding.models.Bid
+        position = self.position.position
+        in_grade = Q(user__grade=position.grade_id)
+        at_skill = Q(user__skills=position.skill_id)
+
+        # Bids are counted distinctly, as users may have several skills
+        statistics = self.position.bids.filter(bidcycle=self.position.bidcycle_id).aggregate(
+            total_bids=Count("id", distinct=True),
+            in_grade=Count("id", distinct=True, filter=in_grade),
+            at_skill=Count("id", distinct=True, filter=at_skill),
+            in_grade_at_skill=Count("id", distinct=True, filter=in_grade & at_skill),
+            handshakes_offered=Count("id", distinct=True, filter=Q(status=Bid.Status.handshake_offered)),
+            handshakes_accepted=Count("id", distinct=True, filter=Q(status=Bid.Status.handshake_accepted)),
+        )
+
+        self.has_handshake_offered = statistics.pop("handshakes_offered") > 0
+        self.has_handshake_accepted = statistics.pop("handshakes_accepted") > 0
+        for field, value in statistics.items():
+            setattr(self, field, value)
         self.save()
 
     class Meta:
         managed = True
 
 
+def update_bid_statistics(cycle_position_ids):
+    '''
+    Recomputes the bid statistics of cycle positions, skipping any since deleted
+
+    Args:
+        - cycle_position_ids (iterable) - The cycle positions whose bids changed
+    '''
+    for cycle_position in CyclePosition.objects.filter(id__in=list(cycle_position_ids)).select_related("position"):
+        statistics, _ = PositionBidStatistics.objects.get_or_create(position=cycle_position)
+        statistics.position = cycle_position
+        statistics.update_statistics()
+
+
+# Cycle positions whose bids changed. Recomputed once the changing transaction commits, so each cycle
+# position's statistics are recomputed once per transaction. Defer around bursts of bid changes outside
+# of a transaction, such as removing positions from a bidcycle.
+bid_statistics_updates = DeferredUpdate(update_bid_statistics, on_commit=True)
+
+
 class CapsuleDescription(StaticRepresentationModel):
     '''
     Represents a capsule description, describing the associated object in plain English
@@ -253,13 +335,24 @@ class CapsuleDescription(StaticRepresentationModel):
     date_created = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
 
-    history = HistoricalRecords()
+    history = HistoricalRecords(excluded_fields=["search_text", "search_vector"])
 
     _pos_seq_num = models.TextField(null=True)
 
+    # The stored full text search document, see talentmap_api.common.search
+    search_text = models.TextField(null=True, editable=False, help_text="The text of the description's search document")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="The description's search document")
+
+    search_document_fields = [
+        ("content", "A"),
+    ]
+
     class Meta:
         managed = True
         ordering = ["date_updated"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="capsule_search_vector_gin"),
+        ]
 
 
 class Grade(StaticRepresentationModel):
@@ -364,6 +457,7 @@ class SkillCone(StaticRepresentationModel):
 
         # Update all skills to point to this cone
         Skill.objects.filter(code__in=skill_codes).update(cone=self)
+        bump_model_generation(Skill)
 
         # Delete the duplicate cones
         same_cone.delete()
@@ -468,6 +562,182 @@ class Assignment(StaticRepresentationModel):
         ordering = ["update_date"]
 
 
+def update_current_assignments(position_ids):
+    '''
+    Updates the current assignment of positions to their latest assignment, in a single statement
+
+    Args:
+        - position_ids (iterable) - The positions whose assignments changed
+    '''
+    latest_assignment = Assignment.objects.filter(position=OuterRef('pk')).order_by('-start_date')
+    Position.objects.filter(id__in=list(position_ids)).update(current_assignment_id=Subquery(latest_assignment.values('id')[:1]))
+    bump_model_generation(Position, fields=["current_assignment"])
+
+
+# Positions whose assignments changed. Defer around bulk loads of assignments to update each position once.
+# Updated on commit, as a deleted or moved assignment's transaction may not have completed when requested.
+current_assignment_updates = DeferredUpdate(update_current_assignments, on_commit=True)
+
+
+class SimilarPosition(models.Model):
+    '''
+    A precomputed similar position of a position, see talentmap_api.position.similar
+    '''
+
+    position = models.ForeignKey('position.Position', on_delete=models.CASCADE, related_name='similar_position_entries')
+    similar_position = models.ForeignKey('position.Position', on_delete=models.CASCADE, related_name='similar_to_entries')
+    rank = models.IntegerField(help_text="The rank of the similar position, from 0 for the most similar")
+    score = models.IntegerField(help_text="The similarity score of the similar position")
+
+    class Meta:
+        managed = True
+        ordering = ["position", "rank"]
+        unique_together = (("position", "rank"),)
+
+
+def update_similar_positions(position_ids=None):
+    '''
+    Recomputes and stores the similar positions of positions
+
+    Args:
+        - position_ids (iterable) - The positions which were listed, unlisted or changed; only the
+                                    positions whose similar positions may change as a result are
+                                    recomputed. If None, all positions are recomputed.
+
+    Returns:
+        - int - The number of positions recomputed
+    '''
+    listed = set(CyclePosition.objects.filter(status_code__in=["HS", "OP"]).values_list("position_id", flat=True))
+    positions = Position.objects.order_by()
+    stored = set()
+
+    if position_ids is not None:
+        position_ids = set(position_ids)
+        stored = set(SimilarPosition.objects.filter(similar_position_id__in=position_ids).values_list("position_id", flat=True))
+
+        # Every criteria level includes the grade, so other positions only match the changed positions
+        # if they share a grade, or if too few listed positions share their own grade and they fall
+        # back to matching any listed position. The positions of other grades can't be affected.
+        grades = set(Position.objects.filter(id__in=position_ids).values_list("grade_id", flat=True))
+        listed_grades = Counter(Position.objects.filter(id__in=listed).values_list("grade_id", flat=True))
+        matched_grades = {x for x, count in listed_grades.items() if count > MIN_SIMILAR_POSITIONS} - grades - {None}
+        positions = positions.filter(~Q(grade_id__in=matched_grades) | Q(id__in=listed | position_ids | stored))
+
+    index = SimilarityIndex(
+        positions.values_list("id", "post__location__country_id", "skill_id", "grade_id", "bureau_id"),
+        Position.languages.through.objects.filter(position__in=positions).values_list("position_id", "qualification__language_id"),
+        listed,
+    )
+
+    if position_ids is None:
+        targets = set(index.positions)
+    else:
+        targets = index.get_affected(position_ids) | stored
+        targets &= set(index.positions)
+
+    entries = [SimilarPosition(position_id=position_id, similar_position_id=similar_id, rank=rank, score=score)
+               for position_id in targets for rank, (similar_id, score) in enumerate(index.get_similar(position_id))]
+
+    with transaction.atomic():
+        # Deleted directly, rather than through the ORM, which would send a signal per entry
+        with connection.cursor() as cursor:
+            if position_ids is None:
+                cursor.execute(f"DELETE FROM {SimilarPosition._meta.db_table}")
+            else:
+                cursor.execute(f"DELETE FROM {SimilarPosition._meta.db_table} WHERE position_id = ANY(%s)", [list(targets)])
+        SimilarPosition.objects.bulk_create(entries, batch_size=1000)
+
+    bump_model_generation(SimilarPosition)
+    return len(targets)
+
+
+# Listed, unlisted and changed positions whose similar positions must be recomputed. Defer around bulk
+# changes, such as synchronization, to recompute once.
+similar_position_updates = DeferredUpdate(update_similar_positions)
+
+
+def update_latest_bidcycles(queryset):
+    '''
+    Updates the latest bidcycle of each position in the queryset to its active bidcycle with the latest
+    start date, or None if it is in no active bidcycle, in a single statement
+
+    Args:
+        - queryset (QuerySet) - The positions to update
+
+    Returns:
+        - int - The number of positions whose latest bidcycle changed
+    '''
+    BidCycle = talentmap_api.bidding.models.BidCycle
+    position_ids = list(queryset.values_list("id", flat=True))
+    if not position_ids:
+        return 0
+
+    # Matches QuerySet.latest(), which orders null start dates first
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            UPDATE {Position._meta.db_table} AS p SET latest_bidcycle_id = latest.bidcycle_id
+            FROM (
+                SELECT ids.id AS position_id, l.bidcycle_id
+                FROM unnest(%s::integer[]) AS ids(id)
+                LEFT JOIN (
+                    SELECT DISTINCT ON (bp.position_id) bp.position_id, bp.bidcycle_id
+                    FROM {BidCycle.positions.through._meta.db_table} AS bp
+                    JOIN {BidCycle._meta.db_table} AS c ON c.id = bp.bidcycle_id
+                    WHERE c.active AND bp.position_id = ANY(%s)
+                    ORDER BY bp.position_id, c.cycle_start_date DESC, c.id DESC
+                ) AS l ON l.position_id = ids.id
+            ) AS latest
+            WHERE p.id = latest.position_id AND p.latest_bidcycle_id IS DISTINCT FROM latest.bidcycle_id
+        ''', [position_ids, position_ids])
+        count = cursor.rowcount
+
+    if count:
+        bump_model_generation(Position, fields=["latest_bidcycle"])
+    return count
+
+
+def update_availability(queryset):
+    '''
+    Updates the stored availability of each position in the queryset in its latest bidcycle,
+    in a fixed number of queries however many positions there are
+
+    Args:
+        - queryset (QuerySet) - The positions to update
+
+    Returns:
+        - int - The number of positions whose availability changed
+    '''
+    Bid = talentmap_api.bidding.models.Bid
+    position_ids = queryset.values("id")
+
+    latest_bidcycles = Position.objects.filter(id__in=position_ids).values_list("id", "latest_bidcycle_id")
+    in_bidcycle = set(talentmap_api.bidding.models.BidCycle.positions.through.objects.filter(position_id__in=position_ids).values_list("position_id", "bidcycle_id"))
+
+    # The earliest unavailable status of each position's bids, per bidcycle
+    unavailable_statuses = {}
+    bids = Bid.objects.filter(Bid.get_unavailable_status_filter(), position__position_id__in=position_ids).order_by("update_date")
+    for position_id, bidcycle_id, status in bids.values_list("position__position_id", "position__bidcycle_id", "status"):
+        unavailable_statuses.setdefault((position_id, bidcycle_id), status)
+
+    updates = defaultdict(list)
+    for position_id, bidcycle_id in latest_bidcycles:
+        if bidcycle_id is None:
+            availability = (False, NOT_IN_AVAILABLE_BIDCYCLE)
+        else:
+            key = (position_id, bidcycle_id)
+            availability = Position.get_availability(key in in_bidcycle, unavailable_statuses.get(key))
+        updates[availability].append(position_id)
+
+    # Only write the positions whose availability has changed
+    count = 0
+    for (accepting_bids, reason), ids in updates.items():
+        count += Position.objects.filter(id__in=ids).exclude(accepting_bids=accepting_bids, availability_reason=reason).update(accepting_bids=accepting_bids, availability_reason=reason)
+
+    if count:
+        bump_model_generation(Position, fields=["accepting_bids", "availability_reason"])
+    return count
+
+
 # Signal listeners
 @receiver(pre_save, sender=Assignment, dispatch_uid="assignment_pre_save")
 def assignment_pre_save(sender, instance, **kwargs):
@@ -484,6 +754,7 @@ def assignment_pre_save(sender, instance, **kwargs):
     else:
         # Get our assignment as it is in the database
         db_assignment = Assignment.objects.get(id=instance.id)
+        instance._previous_position_id = db_assignment.position_id
 
         # Check if our status has changed, and if we're now completed or curtailed
         if instance.status in [Assignment.Status.completed, Assignment.Status.curtailed]:
@@ -520,11 +791,134 @@ def assignment_pre_save(sender, instance, **kwargs):
 @receiver(post_save, sender=Assignment, dispatch_uid="assignment_post_save")
 def assignment_post_save(sender, instance, created, **kwargs):
     '''
-    This listener updates all positions' current assignments when any assignment is updated
+    This listener updates the current assignment of the assignment's position, and of its previous
+    position if it was moved
     '''
-    # Update the current assignment for all positions
-    latest_assignment = Assignment.objects.filter(position=OuterRef('pk')).order_by('-start_date')
-    latest_assignment = Subquery(latest_assignment.values('id')[:1])
+    current_assignment_updates.request(*{instance.position_id, getattr(instance, "_previous_position_id", instance.position_id)})
+
+
+@receiver(post_delete, sender=Assignment, dispatch_uid="assignment_post_delete")
+def assignment_post_delete(sender, instance, **kwargs):
+    '''
+    This listener updates the current assignment of a deleted assignment's position
+    '''
+    # The reference to the deleted assignment must be cleared within its transaction, for the
+    # foreign key checked on commit; the position's latest assignment is found once committed
+    Position.objects.filter(current_assignment_id=instance.id).update(current_assignment=None)
+    current_assignment_updates.request(instance.position_id)
+
+
+@receiver(post_save, sender=Position, dispatch_uid="position_post_save_search_document")
+def position_post_save_search_document(sender, instance, **kwargs):
+    '''
+    This listener updates the stored search document of a saved position
+    '''
+    update_search_documents(Position.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Position.languages.through, dispatch_uid="position_languages_changed_search_document")
+def position_languages_changed_search_document(sender, instance, action, reverse, pk_set, **kwargs):
+    '''
+    This listener updates the stored search documents of positions whose language requirements change
+    '''
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        update_search_documents(Position.objects.filter(pk=instance.pk))
+    elif pk_set:
+        update_search_documents(Position.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=CapsuleDescription, dispatch_uid="capsule_description_post_save_search_document")
+def capsule_description_post_save_search_document(sender, instance, **kwargs):
+    '''
+    This listener updates the stored search documents of a saved capsule description, and of its position
+    '''
+    update_search_documents(CapsuleDescription.objects.filter(pk=instance.pk))
+    update_search_documents(Position.objects.filter(description=instance))
+
+
+# The related models whose text is part of the position search document, and their lookup paths from positions
+SEARCH_DOCUMENT_RELATIONS = {
+    Skill: ["skill"],
+    Organization: ["organization", "bureau"],
+    Post: ["post"],
+    Location: ["post__location"],
+    Country: ["post__location__country"],
+    Language: ["languages__language"],
+}
+
+
+@receiver(post_save, sender=Skill, dispatch_uid="skill_post_save_search_document")
+@receiver(post_save, sender=Organization, dispatch_uid="organization_post_save_search_document")
+@receiver(post_save, sender=Post, dispatch_uid="post_post_save_search_document")
+@receiver(post_save, sender=Location, dispatch_uid="location_post_save_search_document")
+@receiver(post_save, sender=Country, dispatch_uid="country_post_save_search_document")
+@receiver(post_save, sender=Language, dispatch_uid="language_post_save_search_document")
+def related_post_save_search_document(sender, instance, created, **kwargs):
+    '''
+    This listener updates the stored search documents of the positions related to a saved skill,
+    organization, post, location, country or language
+    '''
+    if created:
+        # No position can refer to it yet
+        return
+
+    related = Q()
+    for path in SEARCH_DOCUMENT_RELATIONS[sender]:
+        related |= Q(**{path: instance})
+    update_search_documents(Position.objects.filter(pk__in=Position.objects.filter(related).values("pk")))
 
-    # Update all positions
-    Position.objects.update(current_assignment_id=latest_assignment)
+
+@receiver(pre_save, sender=Position, dispatch_uid="position_pre_save_similar_positions")
+def position_pre_save_similar_positions(sender, instance, **kwargs):
+    '''
+    This listener notes the similarity attributes of a position as they are in the database
+    '''
+    instance._similarity_attributes = instance.get_saved_values("post_id", "skill_id", "grade_id", "bureau_id")
+
+
+@receiver(post_save, sender=Position, dispatch_uid="position_post_save_similar_positions")
+def position_post_save_similar_positions(sender, instance, **kwargs):
+    '''
+    This listener recomputes similar positions when a position's similarity attributes change
+    '''
+    if getattr(instance, "_similarity_attributes", None) != (instance.post_id, instance.skill_id, instance.grade_id, instance.bureau_id):
+        similar_position_updates.request(instance.pk)
+
+
+@receiver(m2m_changed, sender=Position.languages.through, dispatch_uid="position_languages_changed_similar_positions")
+def position_languages_changed_similar_positions(sender, instance, action, reverse, pk_set, **kwargs):
+    '''
+    This listener recomputes similar positions when a position's language requirements change
+    '''
+    if action.startswith("post_") and not reverse:
+        similar_position_updates.request(instance.pk)
+
+
+@receiver(pre_save, sender=CyclePosition, dispatch_uid="cycle_position_pre_save_similar_positions")
+def cycle_position_pre_save_similar_positions(sender, instance, **kwargs):
+    '''
+    This listener notes the status of a cycle position as it is in the database
+    '''
+    instance._previous_status_code = (instance.get_saved_values("status_code") or [None])[0]
+
+
+@receiver(post_save, sender=CyclePosition, dispatch_uid="cycle_position_post_save_similar_positions")
+def cycle_position_post_save_similar_positions(sender, instance, **kwargs):
+    '''
+    This listener recomputes similar positions when a position is listed or unlisted, by a cycle
+    position's status changing to or from open or handshake
+    '''
+    listed_statuses = ["HS", "OP"]
+    if (getattr(instance, "_previous_status_code", None) in listed_statuses) != (instance.status_code in listed_statuses):
+        similar_position_updates.request(instance.position_id)
+
+
+@receiver(post_delete, sender=CyclePosition, dispatch_uid="cycle_position_post_delete_similar_positions")
+def cycle_position_post_delete_similar_positions(sender, instance, **kwargs):
+    '''
+    This listener recomputes similar positions when a listed position's cycle position is deleted
+    '''
+    if instance.status_code in ["HS", "OP"]:
+        similar_position_updates.request(instance.position_id)
@@ -27,6 +27,9 @@ class CapsuleDescriptionSerializer(PrefetchedSerializer):
         model = CapsuleDescription
         fields = "__all__"
         writable_fields = ("content", "point_of_contact", "website",)
+        field_dependencies = {
+            "is_editable_by_user": ["position__post"],
+        }
 
 
 class CurrentAssignmentSerializer(PrefetchedSerializer):
@@ -42,6 +45,9 @@ class CurrentAssignmentSerializer(PrefetchedSerializer):
     class Meta:
         model = Assignment
         fields = "__all__"
+        field_dependencies = {
+            "user": ["user__user__last_name"],
+        }
         nested = {
             "position": {
                 "class": "talentmap_api.position.serializers.AssignmentPositionSerializer",
@@ -65,6 +71,9 @@ class AssignmentSerializer(CurrentAssignmentSerializer):
     class Meta:
         model = Assignment
         fields = "__all__"
+        field_dependencies = {
+            "user": ["user__user__last_name"],
+        }
         nested = {
             "position": {
                 "class": "talentmap_api.position.serializers.PositionSerializer",
@@ -138,6 +147,18 @@ class PositionListSerializer(PrefetchedSerializer):
         model = Position
         fields = ["id", "grade", "skill", "bureau", "organization", "tour_of_duty", "languages", "post",
                   "current_assignment", "position_number",  "posted_date", "title", "availability"]
+        field_dependencies = {
+            "bureau": ["bureau", "organization", "_bureau_code"],
+            "organization": ["organization", "post__location__country__code"],
+            "availability": ["accepting_bids", "availability_reason"],
+        }
+        field_presets = {
+            "card": {
+                "override_fields": ["id", "position_number", "title", "grade", "skill", "bureau", "post",
+                                    "languages", "current_assignment", "posted_date", "availability"]
+            },
+            "detail": {},
+        }
         nested = {
             "description": {
                 "class": CapsuleDescriptionSerializer,
@@ -230,6 +251,19 @@ class PositionSerializer(PrefetchedSerializer):
     class Meta:
         model = Position
         fields = "__all__"
+        field_dependencies = {
+            "bureau": ["bureau", "organization", "_bureau_code"],
+            "organization": ["organization", "_org_code"],
+            "representation": ["_string_representation"],
+            "availability": ["accepting_bids", "availability_reason"],
+        }
+        field_presets = {
+            "card": {
+                "override_fields": ["id", "position_number", "title", "grade", "skill", "bureau", "organization",
+                                    "post", "languages", "current_assignment", "posted_date", "availability"]
+            },
+            "detail": {},
+        }
         nested = {
             "bid_statistics": {
                 "class": PositionBidStatisticsSerializer,
@@ -316,6 +350,12 @@ class AssignmentPositionSerializer(PrefetchedSerializer):
     class Meta:
         model = Position
         fields = "__all__"
+        field_dependencies = {
+            "bureau": ["bureau", "_bureau_code"],
+            "organization": ["organization", "_org_code"],
+            "representation": ["_string_representation"],
+            "availability": ["accepting_bids", "availability_reason"],
+        }
         nested = {
             "bid_statistics": {
                 "class": PositionBidStatisticsSerializer,
@@ -0,0 +1,113 @@
+'''
+Similar positions, precomputed and stored by update_similar_positions (see position.models).
+
+The similar positions of a position are the listed positions (those open or with a handshake) with
+the same country, skill and grade. While fewer than MIN_SIMILAR_POSITIONS match, the criteria are
+loosened, dropping country, then skill, then grade. The matching positions are ranked by their
+similarity score, a weighted overlap of country, skill, grade, bureau and language requirements,
+and the highest ranked MAX_SIMILAR_POSITIONS are stored.
+'''
+import heapq
+
+from collections import defaultdict
+
+MIN_SIMILAR_POSITIONS = 3
+MAX_SIMILAR_POSITIONS = 25
+
+# The matching criteria, in the order they are dropped
+CRITERIA = ["country", "skill", "grade"]
+ATTRIBUTES = CRITERIA + ["bureau"]
+
+SIMILARITY_WEIGHTS = {
+    "country": 8,
+    "skill": 4,
+    "grade": 2,
+    "bureau": 1,
+    "language": 1,  # Per shared language
+}
+
+
+class SimilarityIndex(object):
+    '''
+    The listed positions, grouped by each combination of criteria
+    '''
+
+    def __init__(self, positions, languages, listed):
+        '''
+        Args:
+            - positions (list) - All positions, as (id, country id, skill id, grade id, bureau id) tuples
+            - languages (list) - The positions' language requirements, as (position id, language id) tuples
+            - listed (iterable) - The ids of the listed positions, which may be similar to others
+        '''
+        self.positions = {x[0]: dict(zip(ATTRIBUTES, x[1:])) for x in positions}
+        self.languages = defaultdict(set)
+        for position_id, language_id in languages:
+            self.languages[position_id].add(language_id)
+        self.listed_ids = set(listed) & set(self.positions)
+        self.listed = sorted(self.listed_ids)
+
+        # Level n groups the listed positions by all but the first n criteria
+        self.groups = [defaultdict(list) for _ in CRITERIA]
+        for position_id in self.listed:
+            for level in range(len(CRITERIA)):
+                key = self.get_key(position_id, level)
+                if key is not None:
+                    self.groups[level][key].append(position_id)
+
+    def get_key(self, position_id, level):
+        values = tuple(self.positions[position_id][x] for x in CRITERIA[level:])
+        return None if None in values else values
+
+    def get_matches(self, position_id, level):
+        key = self.get_key(position_id, level)
+        return [x for x in self.groups[level].get(key, []) if x != position_id] if key is not None else []
+
+    def get_candidates(self, position_id):
+        '''
+        Returns the listed positions matching the most criteria of the position, of which there are
+        at least MIN_SIMILAR_POSITIONS, or all listed positions if no criteria match enough
+        '''
+        for level in range(len(CRITERIA)):
+            matches = self.get_matches(position_id, level)
+            if len(matches) >= MIN_SIMILAR_POSITIONS:
+                return matches
+        return [x for x in self.listed if x != position_id]
+
+    def is_unmatched(self, position_id):
+        '''
+        Returns whether too few listed positions match even the last criterion of the position, so
+        that any listed position may be similar to it
+        '''
+        key = self.get_key(position_id, len(CRITERIA) - 1)
+        if key is None:
+            return True
+        # A listed position is in its own group
+        return len(self.groups[-1].get(key, [])) - (position_id in self.listed_ids) < MIN_SIMILAR_POSITIONS
+
+    def get_score(self, position_id, other_id):
+        position = self.positions[position_id]
+        other = self.positions[other_id]
+        score = sum(SIMILARITY_WEIGHTS[x] for x in ATTRIBUTES if position[x] is not None and position[x] == other[x])
+        return score + SIMILARITY_WEIGHTS["language"] * len(self.languages[position_id] & self.languages[other_id])
+
+    def get_similar(self, position_id):
+        '''
+        Returns the similar positions of the position
+
+        Returns:
+            - list - The similar positions, as (position id, score) tuples, highest score first
+        '''
+        scores = [(x, self.get_score(position_id, x)) for x in self.get_candidates(position_id)]
+        return heapq.nsmallest(MAX_SIMILAR_POSITIONS, scores, key=lambda x: (-x[1], x[0]))
+
+    def get_affected(self, position_ids):
+        '''
+        Returns the positions whose similar positions may change when the specified positions are
+        listed, unlisted or changed; the positions themselves, those sharing their grade, and those
+        unmatched by grade. Positions whose stored similar positions include them may also change,
+        and must be found from the stored similar positions.
+        '''
+        grades = {self.positions[x]["grade"] for x in position_ids if x in self.positions} - {None}
+        affected = {x for x in position_ids if x in self.positions}
+        affected.update(x for x, position in self.positions.items() if position["grade"] in grades or self.is_unmatched(x))
+        return affected
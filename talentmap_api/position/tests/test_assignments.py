@@ -1,7 +1,8 @@
 import pytest
+from django.db import transaction
 from dateutil.relativedelta import relativedelta
 
-from talentmap_api.position.models import Position, Assignment
+from talentmap_api.position.models import Position, Assignment, current_assignment_updates
 from talentmap_api.organization.models import TourOfDuty
 from talentmap_api.user_profile.models import UserProfile
 
@@ -50,6 +51,47 @@ def test_assignment_position_update(authorized_client, authorized_user):
     position.refresh_from_db()
     assert position.current_assignment is None
 
+    position_2.refresh_from_db()
+    assert position_2.current_assignment == assignment
+
+    assignment.delete()
+    position_2.refresh_from_db()
+    assert position_2.current_assignment is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_assignment_deferred_current_assignment(authorized_user):
+    positions = mommy.make_recipe('talentmap_api.position.tests.position', _quantity=2)
+
+    with current_assignment_updates.deferred():
+        assignments = [Assignment.objects.create(position=position, user=authorized_user.profile, start_date="1991-01-01T00:00:00Z") for position in positions]
+        latest = Assignment.objects.create(position=positions[0], user=authorized_user.profile, start_date="1995-01-01T00:00:00Z")
+
+        # Updated on leaving the deferral
+        assert not Position.objects.filter(current_assignment__isnull=False).exists()
+
+    positions[0].refresh_from_db()
+    positions[1].refresh_from_db()
+    assert positions[0].current_assignment == latest
+    assert positions[1].current_assignment == assignments[1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_assignment_current_assignment_on_commit(authorized_user):
+    position = mommy.make_recipe('talentmap_api.position.tests.position')
+    previous = Assignment.objects.create(position=position, user=authorized_user.profile, start_date="1991-01-01T00:00:00Z")
+    assignment = Assignment.objects.create(position=position, user=authorized_user.profile, start_date="1995-01-01T00:00:00Z")
+
+    with transaction.atomic():
+        assignment.delete()
+
+        # The deleted assignment is cleared at once, the latest assignment found once the transaction commits
+        position.refresh_from_db()
+        assert position.current_assignment is None
+
+    position.refresh_from_db()
+    assert position.current_assignment == previous
+
 
 @pytest.mark.django_db(transaction=True)
 def test_assignment_estimated_end_date(authorized_client, authorized_user, test_assignment_fixture):
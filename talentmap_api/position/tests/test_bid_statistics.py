@@ -1,6 +1,9 @@
 import pytest
 
-from talentmap_api.position.models import Position, Skill
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from talentmap_api.position.models import Position, PositionBidStatistics, Skill, bid_statistics_updates
 from talentmap_api.bidding.models import Bid, BidCycle, CyclePosition
 
 from model_mommy import mommy
@@ -80,3 +83,62 @@ def test_bid_statistics(authorized_client, authorized_user):
     assert statistics.in_grade == 1
     assert statistics.at_skill == 1
     assert statistics.in_grade_at_skill == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_statistics_filter")
+def test_bid_statistics_deferred():
+    bidcycle = BidCycle.objects.first()
+    cp = CyclePosition.objects.first()
+    statistics = cp.bid_statistics
+
+    # A user with several skills is counted once
+    user = mommy.make("auth.User").profile
+    user.grade_id = 1
+    user.skills.add(Skill.objects.get(id=1), mommy.make('position.Skill', id=2))
+    user.save()
+
+    with bid_statistics_updates.deferred():
+        Bid.objects.create(user=user, bidcycle=bidcycle, position=cp, status=Bid.Status.handshake_offered)
+        for i in range(3):
+            Bid.objects.create(user=mommy.make("auth.User").profile, bidcycle=bidcycle, position=cp)
+
+        # Recomputed on leaving the deferral
+        statistics.refresh_from_db()
+        assert statistics.total_bids == 0
+
+    statistics.refresh_from_db()
+    assert statistics.total_bids == 4
+    assert statistics.in_grade == 1
+    assert statistics.at_skill == 1
+    assert statistics.in_grade_at_skill == 1
+    assert statistics.has_handshake_offered
+    assert not statistics.has_handshake_accepted
+
+    # Removing the position from the bidcycle deletes its bids, without recreating its statistics
+    bidcycle.positions.remove(cp.position)
+    assert not PositionBidStatistics.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_statistics_filter")
+def test_bid_statistics_on_commit():
+    bidcycle = BidCycle.objects.first()
+    cp = CyclePosition.objects.first()
+    statistics = cp.bid_statistics
+    users = [mommy.make("auth.User").profile for i in range(3)]
+
+    with CaptureQueriesContext(connection) as context:
+        with transaction.atomic():
+            for user in users:
+                Bid.objects.create(user=user, bidcycle=bidcycle, position=cp)
+
+            # Not recomputed until the transaction commits
+            statistics.refresh_from_db()
+            assert statistics.total_bids == 0
+
+    # Recomputed once for all of the transaction's bids
+    aggregates = [x for x in context.captured_queries if '"handshakes_offered"' in x["sql"]]
+    assert len(aggregates) == 1
+    statistics.refresh_from_db()
+    assert statistics.total_bids == 3
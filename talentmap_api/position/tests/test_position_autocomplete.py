@@ -0,0 +1,48 @@
+import pytest
+
+from model_mommy import mommy
+from rest_framework import status
+
+from talentmap_api.position.autocomplete import PrefixIndex
+
+
+def test_prefix_index_lookup():
+    index = PrefixIndex([
+        ("Political Officer", "title", 5),
+        ("Political-Economic Officer", "title", 2),
+        ("Consular Officer", "title", 8),
+        ("Poland", "country", 1),
+    ])
+
+    assert [x[0] for x in index.lookup("pol")] == ["Political Officer", "Political-Economic Officer", "Poland"]
+    # Any word may begin a match
+    assert [x[0] for x in index.lookup("offi")] == ["Consular Officer", "Political Officer", "Political-Economic Officer"]
+    assert [x[0] for x in index.lookup("Political Econ")] == ["Political-Economic Officer"]
+    # Precomputed short prefixes
+    assert [x[0] for x in index.lookup("p", 2)] == ["Political Officer", "Political-Economic Officer"]
+    assert index.lookup("  ") == []
+    assert index.lookup("zz") == []
+
+
+@pytest.mark.django_db()
+def test_position_autocomplete(client):
+    bidcycle = mommy.make('bidding.BidCycle', active=True)
+    for title in ["Political Officer", "Political Officer", "Consular Officer"]:
+        position = mommy.make('position.Position', title=title, skill__description="Political Affairs")
+        mommy.make('bidding.CyclePosition', position=position, bidcycle=bidcycle, status_code="OP")
+
+    # Unlisted positions are not suggested
+    mommy.make('position.Position', title="Political Advisor")
+
+    response = client.get('/api/v1/position/autocomplete/?q=polit')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"text": "Political Affairs", "category": "skill", "count": 3},
+        {"text": "Political Officer", "category": "title", "count": 2},
+    ]
+
+    response = client.get('/api/v1/position/autocomplete/?q=officer&limit=1')
+    assert [x["text"] for x in response.data["results"]] == ["Political Officer"]
+
+    response = client.get('/api/v1/position/autocomplete/?q=officer&limit=x')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,66 @@
+import pytest
+
+from django.core.management import call_command
+from model_mommy import mommy
+from rest_framework import status
+
+from talentmap_api.bidding.models import Bid, BidCycle, CyclePosition
+from talentmap_api.position.models import Position, NOT_IN_AVAILABLE_BIDCYCLE
+
+
+@pytest.fixture
+def test_availability_fixture():
+    bidcycle = mommy.make(BidCycle, active=True)
+    for i in range(2):
+        bidcycle.positions.add(mommy.make('position.Position'))
+    mommy.make('position.Position')
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_availability_fixture")
+def test_availability_maintained():
+    cycle_position = CyclePosition.objects.first()
+    position = cycle_position.position
+    position.refresh_from_db()
+    assert position.availability == {"availability": True, "reason": ""}
+
+    # Positions not in a bid cycle are unavailable
+    assert Position.objects.get(latest_bidcycle__isnull=True).availability == {"availability": False, "reason": NOT_IN_AVAILABLE_BIDCYCLE}
+
+    bid = mommy.make(Bid, user=mommy.make('auth.User').profile, bidcycle=cycle_position.bidcycle, position=cycle_position, status=Bid.Status.submitted)
+    position.refresh_from_db()
+    assert position.accepting_bids
+
+    bid.status = Bid.Status.handshake_accepted
+    bid.save()
+    position.refresh_from_db()
+    assert position.availability == {"availability": False, "reason": "This position has an accepted handshake"}
+    assert position.can_accept_new_bids(cycle_position.bidcycle) == (False, "This position has an accepted handshake")
+
+    bid.status = Bid.Status.declined
+    bid.save()
+    position.refresh_from_db()
+    assert position.accepting_bids
+
+    bid.status = Bid.Status.approved
+    bid.save()
+    bid.delete()
+    position.refresh_from_db()
+    assert position.accepting_bids
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_availability_fixture")
+def test_availability_filter_and_backfill(client):
+    cycle_position = CyclePosition.objects.first()
+    mommy.make(Bid, user=mommy.make('auth.User').profile, bidcycle=cycle_position.bidcycle, position=cycle_position, status=Bid.Status.in_panel)
+
+    response = client.get('/api/v1/position/?accepting_bids=true')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 1
+
+    Position.objects.update(accepting_bids=False, availability_reason="")
+    call_command("update_position_availability", batch_size=1)
+
+    assert Position.objects.filter(accepting_bids=True).count() == 1
+    assert Position.objects.get(id=cycle_position.position_id).availability_reason == "This position is currently due for paneling"
@@ -334,4 +334,20 @@ def test_position_similar_list(client):
     response = client.get(f'/api/v1/position/{position.id}/similar/')
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 9
\ No newline at end of file
+    assert response.data["count"] == 9
+
+
+@pytest.mark.django_db()
+def test_position_cursor_pagination(client):
+    # Position numbers may be missing or shared, which the cursor must not skip over
+    positions = bidcycle_positions(position_number=None, _quantity=3) + bidcycle_positions(position_number="100", _quantity=3)
+
+    response = client.get('/api/v1/position/?cursor=&limit=2')
+
+    assert response.status_code == status.HTTP_200_OK
+    seen = [x["id"] for x in response.data["results"]]
+    while response.data["next"]:
+        response = client.get(response.data["next"])
+        seen += [x["id"] for x in response.data["results"]]
+
+    assert seen == sorted(x.id for x in positions)
@@ -0,0 +1,171 @@
+import pytest
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import QueryDict
+from model_mommy import mommy
+from rest_framework import status
+
+from talentmap_api.common.cache import generations
+from talentmap_api.position.facets import FacetIndex, get_canonical_parameters, get_index
+from talentmap_api.position.tests.mommy_recipes import bidcycle_positions
+
+
+def make_position(id, grade, skill, cone, post, danger_pay, is_overseas):
+    return {
+        "id": id,
+        "grade": grade,
+        "skill": skill,
+        "cone": cone,
+        "bureau": "B1",
+        "organization": "O1",
+        "post": post,
+        "country": "USA" if not is_overseas else "FRA",
+        "tour_of_duty": "2Y",
+        "differential_rate": 0,
+        "danger_pay": danger_pay,
+        "is_overseas": is_overseas,
+        "accepting_bids": True,
+    }
+
+
+@pytest.fixture
+def index():
+    return FacetIndex(
+        [
+            make_position(10, "03", "S1", 1, 100, 0, False),
+            make_position(11, "03", "S2", 2, 101, 15, True),
+            make_position(12, "04", "S1", 1, 101, 25, True),
+            make_position(13, "05", "S3", None, None, None, False),
+        ],
+        [(11, "FR"), (12, "FR"), (12, "DE"), (99, "FR")]
+    )
+
+
+def filter_ids(index, query):
+    bitset = index.filter(QueryDict(query))
+    return None if bitset is None else index.get_ids(bitset)
+
+
+def test_facet_index_filter(index):
+    assert filter_ids(index, "grade__code=03") == [10, 11]
+    assert filter_ids(index, "grade__code=03&skill__code=S1") == [10]
+    assert filter_ids(index, "grade__code__in=03,05") == [10, 11, 13]
+    assert filter_ids(index, "skill__cone=1") == [10, 12]
+    assert filter_ids(index, "post__in=101") == [11, 12]
+    assert filter_ids(index, "post__danger_pay__gte=15") == [11, 12]
+    assert filter_ids(index, "post__danger_pay__lt=20") == [10, 11]
+    assert filter_ids(index, "language_codes=FR") == [11, 12]
+    assert filter_ids(index, "language_codes=DE,NONE") == [10, 12, 13]
+    assert filter_ids(index, "is_domestic=true") == [10, 13]
+    assert filter_ids(index, "is_overseas=true&limit=5&ordering=title") == [11, 12]
+    assert filter_ids(index, "grade__code=03&fields=id,title&count=estimate") == [10, 11]
+    assert filter_ids(index, "grade__code=99") == []
+
+    assert index.count(index.filter(QueryDict("grade__code__in=03,04"))) == 3
+
+
+def test_facet_index_unsupported(index):
+    # Nothing to filter
+    assert filter_ids(index, "") is None
+    assert filter_ids(index, "page=2&grade__code=") is None
+    # Unsupported parameters and lookups are left to the filter set
+    assert filter_ids(index, "grade__code=03&q=political") is None
+    assert filter_ids(index, "grade__code__icontains=3") is None
+    assert filter_ids(index, "skill__code__gte=S1") is None
+    assert filter_ids(index, "skill__cone=x") is None
+    assert filter_ids(index, "is_domestic=maybe") is None
+
+
+def test_facet_index_counts(index):
+    counts = index.get_counts(index.filter(QueryDict("grade__code__in=03,04")))
+
+    assert counts["grade"] == [{"value": "03", "count": 2}, {"value": "04", "count": 1}]
+    assert counts["skill"] == [{"value": "S1", "count": 2}, {"value": "S2", "count": 1}]
+    assert counts["language"] == [{"value": "FR", "count": 2}, {"value": "DE", "count": 1}, {"value": "NONE", "count": 1}]
+    assert counts["is_overseas"] == [{"value": True, "count": 2}, {"value": False, "count": 1}]
+
+    assert index.get_ids(index.get_ids_bitset([12, 10, 99])) == [10, 12]
+
+
+def test_canonical_parameters():
+    assert get_canonical_parameters(QueryDict("skill__code__in=S2,S1&page=3&grade__code=03&q=")) == \
+        get_canonical_parameters(QueryDict("grade__code=03&skill__code__in=S1,S2")) == \
+        [("grade__code", ["03"]), ("skill__code__in", ["S1,S2"])]
+
+
+@pytest.mark.django_db()
+def test_position_facet_counts(client):
+    bidcycle = mommy.make('bidding.BidCycle', active=True)
+    grade = mommy.make('position.Grade', code="03")
+    for position_grade, title in [(grade, "Political Officer"), (grade, "Consular Officer"), (mommy.make('position.Grade', code="04"), "Political Officer")]:
+        position = mommy.make('position.Position', grade=position_grade, title=title)
+        mommy.make('bidding.CyclePosition', position=position, bidcycle=bidcycle, status_code="OP")
+
+    response = client.get('/api/v1/position/facets/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert response.data["facets"]["grade"] == [{"value": "03", "count": 2}, {"value": "04", "count": 1}]
+
+    response = client.get('/api/v1/position/facets/?grade__code=03')
+    assert response.data["count"] == 2
+    assert response.data["facets"]["grade"] == [{"value": "03", "count": 2}]
+
+    # Filters unsupported by the index are evaluated by the filter set
+    response = client.get('/api/v1/position/facets/?title__icontains=political')
+    assert response.data["count"] == 2
+    assert response.data["facets"]["grade"] == [{"value": "03", "count": 1}, {"value": "04", "count": 1}]
+
+
+@pytest.mark.django_db()
+def test_position_list_facet_filter(client):
+    bidcycle = mommy.make('bidding.BidCycle', active=True)
+    grade = mommy.make('position.Grade', code="03")
+    for position_grade in [grade, grade, mommy.make('position.Grade', code="04")]:
+        position = mommy.make('position.Position', grade=position_grade)
+        mommy.make('bidding.CyclePosition', position=position, bidcycle=bidcycle, status_code="OP")
+
+    response = client.get('/api/v1/position/?grade__code=03')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2
+
+    # Falls back to the filter set
+    response = client.get('/api/v1/position/?grade__code__icontains=3')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_facet_index_rebuilt_for_indexed_columns(monkeypatch):
+    monkeypatch.setattr(generations, "get_cache", lambda: LocMemCache("test_facet_index", {}))
+    position = bidcycle_positions()
+    index = get_index()
+
+    # Changes to position columns the index doesn't read keep it
+    position.title = "Changed"
+    position.save()
+    assert get_index() is index
+
+    # Changes to the columns it reads rebuild it
+    position.grade = mommy.make('position.Grade')
+    position.save()
+    assert get_index() is not index
+
+
+@pytest.mark.django_db(transaction=True)
+def test_facet_index_rebuilt_for_indexed_relations(monkeypatch):
+    monkeypatch.setattr(generations, "get_cache", lambda: LocMemCache("test_facet_index_relations", {}))
+    tour_of_duty = mommy.make('organization.TourOfDuty', code="A")
+    position = bidcycle_positions(post=mommy.make('organization.Post', tour_of_duty=tour_of_duty), grade=mommy.make('position.Grade', code="03"))
+    index = get_index()
+
+    # The tour of duty code is indexed through the position's post
+    tour_of_duty.code = "B"
+    tour_of_duty.save()
+    assert get_index() is not index
+    assert get_index().count(get_index().filter(QueryDict("post__tour_of_duty__code=B"))) == 1
+
+    # As is the grade code
+    index = get_index()
+    position.grade.code = "99"
+    position.grade.save()
+    assert get_index() is not index
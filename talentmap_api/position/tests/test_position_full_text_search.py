@@ -45,3 +45,71 @@ def test_available_filtering(client, term, expected_count):
     response = client.get(f'/api/v1/position/?q={term}')
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data["results"]) == expected_count
+
+
+@pytest.mark.django_db()
+def test_search_document_maintained():
+    position = mommy.make('position.Position', title="Political Officer", languages__language__long_description="German")
+    position.refresh_from_db()
+
+    assert "Political Officer" in position.search_text
+    assert "German" in position.search_text
+
+    # Changes to the position's description are reflected in its document
+    position.description = mommy.make('position.CapsuleDescription', content="Oversees the consular section")
+    position.save()
+    position.description.content = "Oversees the visa section"
+    position.description.save()
+    position.refresh_from_db()
+
+    assert "visa section" in position.search_text
+    assert "consular" not in position.search_text
+
+    # As are changes to its related models
+    position.skill = mommy.make('position.Skill', description="Doctor")
+    position.save()
+    position.skill.description = "Nurse"
+    position.skill.save()
+    language = position.languages.first().language
+    language.long_description = "Dutch"
+    language.save()
+    position.refresh_from_db()
+
+    assert "Nurse" in position.search_text
+    assert "Dutch" in position.search_text
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("test_position_fts_fixture")
+def test_search_ranking_and_substrings(client):
+    position = mommy.make('position.Position', title="Embassy Doctor", skill__description="Doctor")
+    mommy.make('bidding.CyclePosition', position=position, bidcycle=mommy.make('bidding.BidCycle', active=True), status_code="OP")
+
+    # Title matches rank above matches in other fields
+    response = client.get('/api/v1/position/?q=embassy doctor')
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 3
+    assert response.data["results"][0]["title"] == "Embassy Doctor"
+
+    # An explicit ordering replaces the ranking
+    response = client.get('/api/v1/position/?q=embassy doctor&ordering=-id')
+    ids = [x["id"] for x in response.data["results"]]
+    assert ids == sorted(ids, reverse=True)
+
+    # Partial words match by substring
+    response = client.get('/api/v1/position/?q=colorgu')
+    assert len(response.data["results"]) == 1
+
+    response = client.get('/api/v1/cycleposition/?q=colorgu')
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db()
+def test_search_document_not_serialized(client):
+    position = mommy.make('position.Position', title="Political Officer")
+    mommy.make('bidding.CyclePosition', position=position, bidcycle=mommy.make('bidding.BidCycle', active=True), status_code="OP")
+
+    response = client.get(f'/api/v1/position/{position.id}/')
+    assert response.status_code == status.HTTP_200_OK
+    assert "search_text" not in response.data
+    assert "search_vector" not in response.data
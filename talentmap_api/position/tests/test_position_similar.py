@@ -0,0 +1,94 @@
+import pytest
+
+from django.core.management import call_command
+from model_mommy import mommy
+
+from talentmap_api.bidding.models import CyclePosition
+from talentmap_api.position.models import Position, SimilarPosition, update_similar_positions
+from talentmap_api.position.similar import SimilarityIndex, MAX_SIMILAR_POSITIONS
+from talentmap_api.position.tests.mommy_recipes import bidcycle_positions
+
+
+def test_similarity_index():
+    # (id, country, skill, grade, bureau)
+    positions = [
+        (1, 1, 1, 1, 1),
+        (2, 1, 1, 1, 1),
+        (3, 1, 1, 1, 2),
+        (4, 1, 1, 1, 2),
+        (5, 2, 1, 1, 1),
+        (6, 2, 2, 1, 1),
+        (7, 2, 2, 2, 1),
+        (8, None, 2, 2, 1),
+    ]
+    languages = [(1, 1), (4, 1), (4, 2)]
+    index = SimilarityIndex(positions, languages, listed=range(1, 8))
+
+    # Matching all criteria, ranked by bureau and language overlap
+    assert index.get_similar(1) == [(2, 15), (4, 15), (3, 14)]
+
+    # Too few matches for country, skill and grade, so country is dropped
+    assert [x[0] for x in index.get_similar(5)] == [1, 2, 3, 4]
+
+    # No criteria match enough, so any listed position may be similar
+    assert [x[0] for x in index.get_similar(8)] == [7, 6, 1, 2, 5, 3, 4]
+    assert index.is_unmatched(8)
+    assert not index.is_unmatched(1)
+
+    # Changes to a position affect its grade and the unmatched positions
+    assert index.get_affected([7]) == {7, 8}
+    assert index.get_affected([1]) == {1, 2, 3, 4, 5, 6, 7, 8}
+
+
+@pytest.mark.django_db()
+def test_similar_positions_maintained():
+    grade = mommy.make('position.Grade')
+    skill = mommy.make('position.Skill')
+    positions = bidcycle_positions(grade=grade, skill=skill, _quantity=5)
+    position = positions[0]
+
+    assert list(position.similar_positions.values_list("id", flat=True)) == [x.id for x in positions[1:]]
+
+    # Unlisting a position removes it from the similar positions of others
+    cycle_position = CyclePosition.objects.get(position=positions[1])
+    cycle_position.status_code = "CL"
+    cycle_position.save()
+    assert positions[1] not in position.similar_positions
+    assert cycle_position not in CyclePosition.objects.get(position=position).similar_positions
+
+    cycle_position.status_code = "HS"
+    cycle_position.save()
+    assert positions[1] in position.similar_positions
+
+    # Recomputing all positions stores the same lists
+    entries = sorted(SimilarPosition.objects.values_list("position_id", "similar_position_id", "rank", "score"))
+    assert update_similar_positions() == Position.objects.count()
+    assert sorted(SimilarPosition.objects.values_list("position_id", "similar_position_id", "rank", "score")) == entries
+
+    # As does the command, which populates them when deploying
+    SimilarPosition.objects.all().delete()
+    call_command("update_similar_positions")
+    assert sorted(SimilarPosition.objects.values_list("position_id", "similar_position_id", "rank", "score")) == entries
+
+
+@pytest.mark.django_db()
+def test_similar_positions_capped():
+    grade = mommy.make('position.Grade')
+    position = bidcycle_positions(grade=grade)
+    bidcycle_positions(grade=grade, _quantity=MAX_SIMILAR_POSITIONS + 2)
+
+    assert position.similar_positions.count() == MAX_SIMILAR_POSITIONS
+
+
+@pytest.mark.django_db()
+def test_similar_positions_incremental():
+    grades = mommy.make('position.Grade', _quantity=2)
+    positions = bidcycle_positions(grade=grades[0], _quantity=5)
+    bidcycle_positions(grade=grades[1], _quantity=5)
+
+    # Only the positions sharing the changed position's grade are recomputed
+    assert update_similar_positions([positions[0].id]) == 5
+
+    entries = sorted(SimilarPosition.objects.values_list("position_id", "similar_position_id", "rank", "score"))
+    update_similar_positions()
+    assert sorted(SimilarPosition.objects.values_list("position_id", "similar_position_id", "rank", "score")) == entries
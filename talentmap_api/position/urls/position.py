@@ -12,6 +12,8 @@ urlpatterns = [
     url(r'^$', views.PositionListView.as_view(get_list), name='position.Position-list'),
     url(r'^(?P<pk>[0-9]+)/$', views.PositionListView.as_view({**get_retrieve, **patch_update}), name='position.Position-detail'),
     url(r'^highlighted/$', views.PositionHighlightListView.as_view(get_list), name='view-highlighted-positions'),
+    url(r'^autocomplete/$', views.PositionAutocompleteView.as_view(), name='position.Position-autocomplete'),
+    url(r'^facets/$', views.PositionFacetCountsView.as_view(), name='position.Position-facets'),
     url(r'^(?P<pk>[0-9]+)/highlight/$', views.PositionHighlightActionView.as_view(), name='position.Position-highlight'),
     url(r'^(?P<pk>[0-9]+)/assignments/$', views.PositionAssignmentHistoryView.as_view(get_list), name='position.Position-assignment-history'),
     url(r'^(?P<pk>[0-9]+)/similar/$', views.PositionSimilarView.as_view(get_list), name='position.Position-similar'),
@@ -5,7 +5,7 @@ from rest_framework import mixins
 
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.common.history_helpers import generate_historical_view
 from talentmap_api.common.common_helpers import has_permission_or_403
@@ -20,7 +20,7 @@ HistoricalCapsuleDescriptionView = generate_historical_view(CapsuleDescription,
 
 class CapsuleDescriptionView(FieldLimitableSerializerMixin,
                              GenericViewSet,
-                             mixins.ListModelMixin,
+                             StreamingListModelMixin,
                              mixins.RetrieveModelMixin,
                              mixins.UpdateModelMixin):
     '''
@@ -45,5 +45,5 @@ class CapsuleDescriptionView(FieldLimitableSerializerMixin,
 
     def get_queryset(self):
         queryset = CapsuleDescription.objects.all()
-        self.serializer_class.prefetch_model(CapsuleDescription, queryset)
+        queryset = self.serializer_class.prefetch_model(CapsuleDescription, queryset)
         return queryset
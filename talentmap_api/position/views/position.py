@@ -11,14 +11,16 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 
 from talentmap_api.common.cache.views import CachedViewSet
 from talentmap_api.common.history_helpers import generate_historical_view
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin, StreamingListModelMixin
 from talentmap_api.common.common_helpers import has_permission_or_403, in_group_or_403
 from talentmap_api.common.permissions import isDjangoGroupMember
 
-from talentmap_api.bidding.models import Bid, Waiver, CyclePosition
+from talentmap_api.bidding.models import Bid, Waiver
 from talentmap_api.bidding.serializers.serializers import BidSerializer, WaiverSerializer, CyclePositionSerializer
 from talentmap_api.bidding.filters import BidFilter, WaiverFilter
 
+from talentmap_api.position.autocomplete import MAX_LIMIT, get_index
+from talentmap_api.position.facets import FacetIndexFilterMixin, get_facet_counts
 from talentmap_api.position.models import Position, Classification, Assignment
 from talentmap_api.position.filters import PositionFilter, AssignmentFilter
 from talentmap_api.position.serializers import PositionSerializer, PositionListSerializer, PositionWritableSerializer, ClassificationSerializer, AssignmentSerializer
@@ -30,6 +32,7 @@ HistoricalPositionView = generate_historical_view(Position, PositionSerializer,
 
 
 class PositionListView(FieldLimitableSerializerMixin,
+                       FacetIndexFilterMixin,
                        ActionDependentSerializerMixin,
                        mixins.UpdateModelMixin,
                        CachedViewSet):
@@ -53,16 +56,16 @@ class PositionListView(FieldLimitableSerializerMixin,
     serializer_class = PositionSerializer
     filter_class = PositionFilter
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    # The cursor seeks on a unique, non-null key; position numbers are neither
+    cursor_ordering = "id"
 
-    def get_queryset(self):	   
-        position_ids = CyclePosition.objects.filter(bidcycle__active=True, status_code__in=["HS", "OP"]).values_list("position_id", flat=True)
-        queryset = Position.objects.filter(id__in=position_ids)
-        queryset = self.serializer_class.prefetch_model(Position, queryset)	
+    def get_queryset(self):
+        queryset = self.serializer_class.prefetch_model(Position, Position.get_listed())
         return queryset
 
 
 class PositionWaiverListView(FieldLimitableSerializerMixin,
-                             mixins.ListModelMixin,
+                             StreamingListModelMixin,
                              GenericViewSet):
     """
     list:
@@ -79,12 +82,12 @@ class PositionWaiverListView(FieldLimitableSerializerMixin,
         in_group_or_403(self.request.user, f"bureau_ao:{position.bureau.code}")
         # Get the position's bids
         queryset = position.waivers
-        self.serializer_class.prefetch_model(Waiver, queryset)
+        queryset = self.serializer_class.prefetch_model(Waiver, queryset)
         return queryset
 
 
 class PositionSimilarView(FieldLimitableSerializerMixin,
-                          mixins.ListModelMixin,
+                          StreamingListModelMixin,
                           GenericViewSet):
     """
     list:
@@ -100,7 +103,7 @@ class PositionSimilarView(FieldLimitableSerializerMixin,
         position = get_object_or_404(Position, pk=self.request.parser_context.get("kwargs").get("pk"))
         # Get the position's similar positions
         queryset = position.similar_positions
-        self.serializer_class.prefetch_model(Position, queryset)
+        queryset = self.serializer_class.prefetch_model(Position, queryset)
         return queryset
 
 
@@ -147,7 +150,7 @@ class PositionWaiverActionView(GenericViewSet):
 
 class PositionAssignmentHistoryView(FieldLimitableSerializerMixin,
                                     GenericViewSet,
-                                    mixins.ListModelMixin):
+                                    StreamingListModelMixin):
     '''
     list:
     Lists all of the position's assignments
@@ -162,7 +165,7 @@ class PositionAssignmentHistoryView(FieldLimitableSerializerMixin,
         position = get_object_or_404(Position, pk=self.request.parser_context.get("kwargs").get("pk"))
         # Get the position's assignments
         queryset = position.assignments
-        self.serializer_class.prefetch_model(Assignment, queryset)
+        queryset = self.serializer_class.prefetch_model(Assignment, queryset)
         return queryset
 
 class PositionHighlightListView(FieldLimitableSerializerMixin,
@@ -180,6 +183,51 @@ class PositionHighlightListView(FieldLimitableSerializerMixin,
         queryset = self.serializer_class.prefetch_model(Position, queryset)
         return queryset
 
+class PositionAutocompleteView(APIView):
+    '''
+    Suggests search terms for positions, from an in-memory prefix index
+    '''
+
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get(self, request, format=None):
+        '''
+        Returns the suggestions with a word beginning with the q parameter, most common first
+
+        Query parameters:
+            - q (str) - The text typed so far
+            - limit (int) - The maximum number of suggestions (default 10, maximum 50)
+        '''
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), MAX_LIMIT)
+        except ValueError:
+            return Response({"limit": "A valid integer is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        suggestions = get_index().lookup(request.query_params.get("q", ""), limit)
+        return Response({
+            "results": [{"text": text, "category": category, "count": count} for text, category, count in suggestions]
+        })
+
+
+class PositionFacetCountsView(APIView):
+    '''
+    Counts the positions matching a search per value of each facet, for the search filters
+    '''
+
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get(self, request, format=None):
+        '''
+        Returns the number of listed positions matching the filters, and the number of those with
+        each grade, skill, cone, bureau, organization, post, country, tour of duty, differential
+        rate, danger pay, overseas flag, availability and language
+
+        Query parameters:
+            - Any position list filter
+        '''
+        return Response(get_facet_counts(request.query_params, request))
+
+
 class PositionHighlightActionView(APIView):
     '''
     Controls the highlighted status of a position
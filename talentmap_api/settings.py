@@ -122,6 +122,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Measures all other middleware, so must be first
+    'talentmap_api.common.middleware.MetricsMiddleware',
+
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -176,12 +179,36 @@ REST_FRAMEWORK = {
 }
 
 
+# The shared cache is memcached when a location is configured, otherwise a local file based cache
+if get_delineated_environment_variable('MEMCACHED_LOCATION'):
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': get_delineated_environment_variable('MEMCACHED_LOCATION').split(','),
+    }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': get_delineated_environment_variable('CACHE_DIRECTORY', '/tmp/talentmap_cache'),
+    }
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
+        'BACKEND': 'talentmap_api.common.cache.backends.TieredCache',
+        'OPTIONS': {
+            'SHARED_CACHE': 'shared',
+            'LOCAL_MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 60,
+        }
+    },
+    'shared': SHARED_CACHE,
 }
 
+# Generations must be read from the shared cache, bypassing the local tier
+GENERATION_CACHE_ALIAS = 'shared'
+
+# The bearer token required to scrape /metrics; without one, only staff users may view the metrics
+METRICS_TOKEN = get_delineated_environment_variable('METRICS_TOKEN')
+
 
 REST_FRAMEWORK_EXTENSIONS = {
     'DEFAULT_USE_CACHE': 'default',
@@ -20,6 +20,7 @@ from rest_framework_swagger.views import get_swagger_view
 from rest_framework_expiring_authtoken import views as auth_views
 from djangosaml2.views import echo_attributes
 from talentmap_api.saml2.acs_patch import assertion_consumer_service
+from talentmap_api.common.views import metrics_view
 
 urlpatterns = [
     # Position and position detail related resources
@@ -75,6 +76,9 @@ urlpatterns = [
 
     # Feedback
     url(r'^api/v1/feedback/', include('talentmap_api.feedback.urls.feedback')),
+
+    # Performance metrics
+    url(r'^metrics$', metrics_view, name='metrics'),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
 # Auth patterns
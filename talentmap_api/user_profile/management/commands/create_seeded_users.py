@@ -5,6 +5,7 @@ import logging
 from django.contrib.auth.models import User
 from django.utils import timezone
 from talentmap_api.common.common_helpers import get_group_by_name
+from talentmap_api.common.cache.generations import bump_model_generation
 from talentmap_api.position.models import Position, Assignment
 from talentmap_api.organization.models import TourOfDuty, Country
 from talentmap_api.user_profile.models import UserProfile
@@ -68,6 +69,7 @@ class Command(BaseCommand):
 
                 if data[6]:
                     UserProfile.objects.exclude(id=profile.id).update(cdo=profile)
+                    bump_model_generation(UserProfile)
 
                 for group in data[7]:
                     get_group_by_name(group).user_set.add(user)
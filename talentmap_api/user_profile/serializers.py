@@ -82,6 +82,9 @@ class ClientSerializer(PrefetchedSerializer):
     class Meta:
         model = UserProfile
         fields = ["id", "current_assignment", "assignments", "skills", "grade", "is_cdo", "primary_nationality", "secondary_nationality", "bid_statistics", "user", "language_qualifications", "initials", "display_name"]
+        field_dependencies = {
+            "is_cdo": ["direct_reports"],
+        }
         nested = {
             "user": {
                 "class": UserSerializer,
@@ -250,3 +253,6 @@ class SavedSearchSerializer(PrefetchedSerializer):
         model = SavedSearch
         fields = "__all__"
         writable_fields = ("name", "endpoint", "filters",)
+        field_dependencies = {
+            "owner": ["owner__user__first_name", "owner__user__last_name"],
+        }
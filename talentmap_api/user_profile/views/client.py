@@ -9,12 +9,13 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, ActionDependentSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.bidding.serializers.serializers import SurveySerializer, BidSerializer, WaiverSerializer
 from talentmap_api.bidding.serializers.prepanel import PrePanelSerializer
 from talentmap_api.bidding.filters import StatusSurveyFilter, BidFilter, WaiverFilter
 from talentmap_api.bidding.models import StatusSurvey, Bid, Waiver
+from talentmap_api.position.models import Assignment
 from talentmap_api.position.serializers import AssignmentSerializer
 from talentmap_api.position.filters import AssignmentFilter
 
@@ -25,7 +26,7 @@ from talentmap_api.user_profile.serializers import ClientSerializer, ClientDetai
 
 class CdoClientView(ActionDependentSerializerMixin,
                     FieldLimitableSerializerMixin,
-                    mixins.ListModelMixin,
+                    StreamingListModelMixin,
                     mixins.RetrieveModelMixin,
                     GenericViewSet):
     """
@@ -75,7 +76,7 @@ class CdoClientStatisticsView(APIView):
 
 
 class CdoClientSurveyView(FieldLimitableSerializerMixin,
-                          mixins.ListModelMixin,
+                          StreamingListModelMixin,
                           GenericViewSet):
     """
     list:
@@ -89,11 +90,10 @@ class CdoClientSurveyView(FieldLimitableSerializerMixin,
     def get_queryset(self):
         client = get_object_or_404(UserProfile.objects.filter(cdo=self.request.user.profile), id=self.request.parser_context.get("kwargs").get("pk"))
         queryset = client.status_surveys.all()
-        self.serializer_class.prefetch_model(StatusSurvey, queryset)
-        return queryset
+        return self.serializer_class.prefetch_model(StatusSurvey, queryset)
 
 
-class CdoClientAssignmentView(FieldLimitableSerializerMixin, mixins.ListModelMixin, GenericViewSet):
+class CdoClientAssignmentView(FieldLimitableSerializerMixin, StreamingListModelMixin, GenericViewSet):
     """
     list:
     Lists all of the specified client's assignments
@@ -106,13 +106,12 @@ class CdoClientAssignmentView(FieldLimitableSerializerMixin, mixins.ListModelMix
     def get_queryset(self):
         client = get_object_or_404(UserProfile.objects.filter(cdo=self.request.user.profile), id=self.request.parser_context.get("kwargs").get("pk"))
         queryset = client.assignments.all()
-        self.serializer_class.prefetch_model(StatusSurvey, queryset)
-        return queryset
+        return self.serializer_class.prefetch_model(Assignment, queryset)
 
 
 class CdoClientBidView(FieldLimitableSerializerMixin,
                        ActionDependentSerializerMixin,
-                       mixins.ListModelMixin,
+                       StreamingListModelMixin,
                        mixins.RetrieveModelMixin,
                        GenericViewSet):
     """
@@ -136,15 +135,14 @@ class CdoClientBidView(FieldLimitableSerializerMixin,
     def get_queryset(self):
         client = get_object_or_404(UserProfile.objects.filter(cdo=self.request.user.profile), id=self.request.parser_context.get("kwargs").get("pk"))
         queryset = client.bidlist.all()
-        self.serializer_class.prefetch_model(Bid, queryset)
-        return queryset
+        return self.serializer_class.prefetch_model(Bid, queryset)
 
     def get_object(self):
         queryset = self.get_queryset()
         return get_object_or_404(queryset, id=self.request.parser_context.get("kwargs").get("bid_id"))
 
 
-class CdoClientWaiverView(FieldLimitableSerializerMixin, mixins.ListModelMixin, GenericViewSet):
+class CdoClientWaiverView(FieldLimitableSerializerMixin, StreamingListModelMixin, GenericViewSet):
     """
     list:
     Lists all of the specified client's waivers
@@ -157,5 +155,4 @@ class CdoClientWaiverView(FieldLimitableSerializerMixin, mixins.ListModelMixin,
     def get_queryset(self):
         client = get_object_or_404(UserProfile.objects.filter(cdo=self.request.user.profile), id=self.request.parser_context.get("kwargs").get("pk"))
         queryset = client.waivers.all()
-        self.serializer_class.prefetch_model(Waiver, queryset)
-        return queryset
+        return self.serializer_class.prefetch_model(Waiver, queryset)
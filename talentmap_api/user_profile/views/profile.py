@@ -5,7 +5,7 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
-from talentmap_api.common.mixins import ActionDependentSerializerMixin, FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import ActionDependentSerializerMixin, FieldLimitableSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.position.models import Assignment
 from talentmap_api.user_profile.models import UserProfile
@@ -58,7 +58,7 @@ class UserPublicProfileView(FieldLimitableSerializerMixin,
 
 class UserAssignmentHistoryView(FieldLimitableSerializerMixin,
                                 GenericViewSet,
-                                mixins.ListModelMixin):
+                                StreamingListModelMixin):
     '''
     list:
     Lists all of the user's assignments
@@ -3,7 +3,7 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
-from talentmap_api.common.mixins import FieldLimitableSerializerMixin
+from talentmap_api.common.mixins import FieldLimitableSerializerMixin, StreamingListModelMixin
 
 from talentmap_api.user_profile.models import SavedSearch
 from talentmap_api.user_profile.serializers import SavedSearchSerializer
@@ -12,7 +12,7 @@ from talentmap_api.user_profile.serializers import SavedSearchSerializer
 class SavedSearchView(FieldLimitableSerializerMixin,
                       GenericViewSet,
                       mixins.CreateModelMixin,
-                      mixins.ListModelMixin,
+                      StreamingListModelMixin,
                       mixins.RetrieveModelMixin,
                       mixins.UpdateModelMixin,
                       mixins.DestroyModelMixin):